@@ -11,6 +11,7 @@ logger = logging.getLogger("main")
 
 # 라우트 import
 from routes import auth, users, search, trend
+from services.prewarm_scheduler import prewarm_scheduler
 
 # 환경변수 로드
 load_dotenv()
@@ -48,6 +49,16 @@ app.include_router(users.router, prefix="/api", tags=["사용자"])
 app.include_router(search.router)
 app.include_router(trend.router)
 
+# 인기 검색어 미리 검색 스케줄러 (PREWARM_ENABLED=true일 때만)
+@app.on_event("startup")
+async def start_prewarm_scheduler():
+    if os.getenv("PREWARM_ENABLED", "false").lower() == "true":
+        prewarm_scheduler.start(search.start_prewarm_search)
+
+@app.on_event("shutdown")
+async def stop_prewarm_scheduler():
+    prewarm_scheduler.stop()
+
 # 루트 엔드포인트
 @app.get("/")
 def read_root():
@@ -0,0 +1,5 @@
+-- search_process 테이블에 skip_reason 컬럼 추가 마이그레이션
+ALTER TABLE search_process ADD COLUMN IF NOT EXISTS skip_reason TEXT;
+
+-- 변경 내용 확인
+COMMENT ON COLUMN search_process.skip_reason IS '검색 프로세스를 실행하지 않고 건너뛴 사유 (cancelled 등)';
@@ -0,0 +1,11 @@
+-- 지역 파라미터별로 검색 결과에 등장한 동(dong_id)을 기록하는 테이블 생성 마이그레이션
+CREATE TABLE IF NOT EXISTS region_coverage (
+    place_id INTEGER NOT NULL REFERENCES place_list(id),
+    dong_id INTEGER NOT NULL,
+    hits INTEGER DEFAULT 1,
+    last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (place_id, dong_id)
+);
+
+-- 변경 내용 확인
+COMMENT ON TABLE region_coverage IS '지역 검색 결과에 등장한 동 관측 기록 (커버리지 계획용)';
@@ -0,0 +1,13 @@
+-- search_results 테이블에 내용 해시(fingerprint)와 마지막 관측 시각(last_seen_at) 컬럼 추가 마이그레이션
+ALTER TABLE search_results ADD COLUMN IF NOT EXISTS fingerprint VARCHAR(40);
+ALTER TABLE search_results ADD COLUMN IF NOT EXISTS last_seen_at TIMESTAMP;
+
+-- 기존 행은 updated_at(없으면 created_at)을 마지막 관측 시각으로 사용
+UPDATE search_results SET last_seen_at = COALESCE(updated_at, created_at) WHERE last_seen_at IS NULL;
+
+-- link로 기존 항목을 일괄 조회하므로 인덱스 추가
+CREATE INDEX IF NOT EXISTS idx_search_results_link ON search_results (link);
+
+-- 변경 내용 확인
+COMMENT ON COLUMN search_results.fingerprint IS '제목/가격/상태/내용/썸네일/끌어올림 시각 해시 (변경 없는 재수집 시 업데이트 생략)';
+COMMENT ON COLUMN search_results.last_seen_at IS '검색 결과에 마지막으로 등장한 시각';
@@ -0,0 +1,33 @@
+-- 검색어 사전(search_queries)과 검색어-상품 관계(query_items) 테이블 생성 마이그레이션
+-- 상품은 search_results에 한 번만 저장하고, 여러 검색어가 같은 상품을 공유합니다.
+CREATE TABLE IF NOT EXISTS search_queries (
+    id SERIAL PRIMARY KEY,
+    query TEXT NOT NULL UNIQUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS query_items (
+    query_id INTEGER NOT NULL REFERENCES search_queries(id),
+    item_id UUID NOT NULL REFERENCES search_results(id) ON DELETE CASCADE,
+    first_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (query_id, item_id)
+);
+
+-- 상품 삭제 시 관계 정리를 위한 인덱스
+CREATE INDEX IF NOT EXISTS idx_query_items_item_id ON query_items (item_id);
+
+-- 기존 search_results.query 값으로 관계 채우기
+INSERT INTO search_queries (query)
+SELECT DISTINCT LOWER(TRIM(query)) FROM search_results
+ON CONFLICT (query) DO NOTHING;
+
+INSERT INTO query_items (query_id, item_id, first_seen_at, last_seen_at)
+SELECT q.id, r.id, r.created_at, COALESCE(r.last_seen_at, r.updated_at, r.created_at)
+FROM search_results r
+JOIN search_queries q ON q.query = LOWER(TRIM(r.query))
+ON CONFLICT (query_id, item_id) DO NOTHING;
+
+-- 변경 내용 확인
+COMMENT ON TABLE search_queries IS '정규화된 검색어 사전';
+COMMENT ON TABLE query_items IS '검색어별 검색된 상품 (search_results.query는 처음 검색된 검색어로만 유지)';
@@ -0,0 +1,40 @@
+-- search_results.dong_id를 정수형으로 변경하고 지역 필터용 컬럼(sido/sigungu1/sigungu2/dong)을 추가하는 마이그레이션
+ALTER TABLE search_results
+    ALTER COLUMN dong_id TYPE INTEGER
+    USING CASE WHEN dong_id::TEXT ~ '^[0-9]+$' THEN dong_id::TEXT::INTEGER END;
+
+ALTER TABLE search_results ADD COLUMN IF NOT EXISTS sido TEXT;
+ALTER TABLE search_results ADD COLUMN IF NOT EXISTS sigungu1 TEXT;
+ALTER TABLE search_results ADD COLUMN IF NOT EXISTS sigungu2 TEXT;
+ALTER TABLE search_results ADD COLUMN IF NOT EXISTS dong TEXT;
+
+-- place_list.place_title_original을 띄어쓰기로 분리하여 채움 (db_service._get_location_info와 같은 규칙)
+-- 4단어: 시도 시군구 구 동 / 3단어: 시도 시군구 동
+UPDATE search_results r
+SET sido = split_part(p.place_title_original, ' ', 1),
+    sigungu1 = NULLIF(split_part(p.place_title_original, ' ', 2), ''),
+    sigungu2 = CASE WHEN array_length(string_to_array(p.place_title_original, ' '), 1) >= 4
+                    THEN split_part(p.place_title_original, ' ', 3) END,
+    dong = CASE WHEN array_length(string_to_array(p.place_title_original, ' '), 1) >= 4
+                THEN split_part(p.place_title_original, ' ', 4)
+                WHEN array_length(string_to_array(p.place_title_original, ' '), 1) = 3
+                THEN split_part(p.place_title_original, ' ', 3) END
+FROM place_list p
+WHERE p.dong_id = r.dong_id
+  AND p.place_title_original <> '';
+
+-- 검색어별 지역 필터를 인덱스 범위 조회로 처리하기 위해 query_items에도 시도/시군구 복사
+ALTER TABLE query_items ADD COLUMN IF NOT EXISTS sido TEXT;
+ALTER TABLE query_items ADD COLUMN IF NOT EXISTS sigungu1 TEXT;
+
+UPDATE query_items qi
+SET sido = r.sido,
+    sigungu1 = r.sigungu1
+FROM search_results r
+WHERE r.id = qi.item_id;
+
+CREATE INDEX IF NOT EXISTS idx_query_items_query_region ON query_items (query_id, sido, sigungu1);
+
+-- 변경 내용 확인
+COMMENT ON COLUMN search_results.dong_id IS '당근마켓 지역 ID (정수)';
+COMMENT ON COLUMN query_items.sido IS '상품 지역의 시/도 (search_results.sido 복사, 지역 필터 인덱스용)';
@@ -0,0 +1,22 @@
+-- 자주 호출되는 조회 경로용 인덱스 추가 마이그레이션
+-- (services/db_service.py 모델의 __table_args__와 같은 인덱스, 여러 번 실행해도 안전)
+-- 실행 후 scripts/explain_hot_paths.py로 인덱스 사용 여부를 확인합니다.
+
+-- get_recent_searches: 사용자별 쿼리 그룹의 최신 검색
+CREATE INDEX IF NOT EXISTS idx_search_requests_user_query_created ON search_requests (user_id, query, created_at);
+-- get_search_results(이전 검색 수), get_latest_search_time 등 쿼리별 최신 검색 조회
+CREATE INDEX IF NOT EXISTS idx_search_requests_query_created ON search_requests (query, created_at);
+
+-- get_search_process_status: 검색 요청별 전체/완료/건너뜀 수
+CREATE INDEX IF NOT EXISTS idx_search_process_request_completed ON search_process (search_request_id, is_completed);
+-- get_fresh_regions: 지역별 최근 성공 검색
+CREATE INDEX IF NOT EXISTS idx_search_process_place_end_time ON search_process (place_id, end_time);
+
+-- _get_location_info: dong_id로 지역 정보 조회
+CREATE INDEX IF NOT EXISTS idx_place_list_dong_id ON place_list (dong_id);
+
+ANALYZE search_requests;
+ANALYZE search_results;
+ANALYZE search_process;
+ANALYZE query_items;
+ANALYZE place_list;
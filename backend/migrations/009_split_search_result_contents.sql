@@ -0,0 +1,40 @@
+-- search_results.content(상품 전체 설명)를 별도 테이블로 분리하고 목록용 snippet 컬럼을 추가하는 마이그레이션
+CREATE TABLE IF NOT EXISTS search_result_contents (
+    item_id UUID PRIMARY KEY REFERENCES search_results(id) ON DELETE CASCADE,
+    content TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 짧은 설명도 압축되도록 TOAST 기준을 낮추고, 가능하면 lz4 압축 사용 (PostgreSQL 14 이상)
+ALTER TABLE search_result_contents SET (toast_tuple_target = 128);
+DO $$
+BEGIN
+    IF current_setting('server_version_num')::INTEGER >= 140000 THEN
+        EXECUTE 'ALTER TABLE search_result_contents ALTER COLUMN content SET COMPRESSION lz4';
+    END IF;
+EXCEPTION WHEN OTHERS THEN
+    RAISE NOTICE 'lz4 압축을 사용할 수 없어 기본 압축(pglz)을 사용합니다: %', SQLERRM;
+END $$;
+
+ALTER TABLE search_results ADD COLUMN IF NOT EXISTS snippet TEXT;
+
+-- 기존 내용 이동 (snippet은 db_service.make_snippet과 같이 공백 정리 후 앞 100자)
+INSERT INTO search_result_contents (item_id, content, updated_at)
+SELECT id, content, COALESCE(updated_at, created_at)
+FROM search_results
+WHERE content IS NOT NULL
+ON CONFLICT (item_id) DO NOTHING;
+
+UPDATE search_results
+SET snippet = CASE
+        WHEN char_length(regexp_replace(btrim(content), '\s+', ' ', 'g')) <= 100
+        THEN regexp_replace(btrim(content), '\s+', ' ', 'g')
+        ELSE left(regexp_replace(btrim(content), '\s+', ' ', 'g'), 100) || '…'
+    END
+WHERE content IS NOT NULL;
+
+ALTER TABLE search_results DROP COLUMN IF EXISTS content;
+
+-- 변경 내용 확인
+COMMENT ON TABLE search_result_contents IS '상품 전체 설명 (목록 조회와 분리, 압축 저장)';
+COMMENT ON COLUMN search_results.snippet IS '상품 설명 앞부분 (목록 카드용)';
@@ -0,0 +1,37 @@
+-- query_items에 정렬/가격 범위 컬럼(price, created_at_origin, boosted_at)을 복사하고
+-- 검색어별 정렬 인덱스를 추가하는 마이그레이션 (여러 번 실행해도 안전)
+-- get_search_results의 min_price/max_price 필터와 price_asc/price_desc/boosted_at_desc/created_at_desc 정렬이
+-- (query_id, ...) 인덱스 범위 조회로 처리되어 조건에 맞는 행만 읽습니다.
+ALTER TABLE query_items ADD COLUMN IF NOT EXISTS price DOUBLE PRECISION;
+ALTER TABLE query_items ADD COLUMN IF NOT EXISTS created_at_origin TIMESTAMP;
+ALTER TABLE query_items ADD COLUMN IF NOT EXISTS boosted_at TIMESTAMP;
+
+UPDATE query_items qi
+SET price = r.price,
+    created_at_origin = r.created_at_origin,
+    boosted_at = r.boosted_at
+FROM search_results r
+WHERE r.id = qi.item_id;
+
+-- 방향 없이 만들었던 이전 정렬 인덱스 제거 (ORDER BY와 방향이 달라 Sort 노드가 생김)
+DROP INDEX IF EXISTS idx_query_items_query_price;
+DROP INDEX IF EXISTS idx_query_items_query_created;
+DROP INDEX IF EXISTS idx_query_items_query_boosted;
+
+-- 각 인덱스의 방향/NULLS 순서는 get_search_results의 ORDER BY와 같아야 정렬 없이 페이지를 읽음
+-- item_id를 INCLUDE하여 정렬된 페이지의 상품 ID를 인덱스만으로 얻음
+CREATE INDEX IF NOT EXISTS idx_query_items_query_price_asc ON query_items (query_id, price ASC, created_at_origin DESC) INCLUDE (item_id);
+CREATE INDEX IF NOT EXISTS idx_query_items_query_price_desc ON query_items (query_id, price DESC NULLS LAST, created_at_origin DESC) INCLUDE (item_id);
+CREATE INDEX IF NOT EXISTS idx_query_items_query_created ON query_items (query_id, created_at_origin DESC) INCLUDE (item_id);
+CREATE INDEX IF NOT EXISTS idx_query_items_query_boosted ON query_items (query_id, boosted_at DESC NULLS LAST, created_at_origin DESC) INCLUDE (item_id);
+
+-- 정렬/지역 필터가 모두 query_items 인덱스로 옮겨져 쓰이지 않는 search_results 인덱스 제거 (저장 시 쓰기 비용만 듦)
+DROP INDEX IF EXISTS idx_search_results_created_at_origin;
+DROP INDEX IF EXISTS idx_search_results_price;
+DROP INDEX IF EXISTS idx_search_results_region;
+
+ANALYZE query_items;
+
+-- 변경 내용 확인
+COMMENT ON COLUMN query_items.price IS '상품 가격 (search_results.price 복사, 검색어별 가격 정렬/범위 인덱스용)';
+COMMENT ON COLUMN query_items.boosted_at IS '끌어올림 시각 (search_results.boosted_at 복사, 끌어올림순 정렬 인덱스용)';
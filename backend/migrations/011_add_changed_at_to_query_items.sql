@@ -0,0 +1,16 @@
+-- query_items에 변경 피드용 changed_at 컬럼을 추가하는 마이그레이션 (여러 번 실행해도 안전)
+-- changed_at은 검색어 결과에 처음 추가될 때와 상품의 가격/상태가 바뀔 때 기록되며,
+-- /api/search/results/{id}/changes?since= 는 (query_id, changed_at, item_id) 인덱스 범위만 읽습니다.
+-- first_seen_at(처음 검색된 시각)은 query_items 생성 시부터 추가 시 한 번만 기록됩니다.
+ALTER TABLE query_items ADD COLUMN IF NOT EXISTS changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+
+UPDATE query_items
+SET changed_at = first_seen_at
+WHERE changed_at IS NULL OR changed_at > first_seen_at;
+
+CREATE INDEX IF NOT EXISTS idx_query_items_query_changed ON query_items (query_id, changed_at, item_id);
+
+ANALYZE query_items;
+
+-- 변경 내용 확인
+COMMENT ON COLUMN query_items.changed_at IS '검색어 결과에 추가되었거나 가격/상태가 바뀐 시각 (변경 피드 커서)';
@@ -0,0 +1,26 @@
+-- 검색어별 최신 크롤링 검색 포인터(query_latest_results) 테이블 생성 마이그레이션 (여러 번 실행해도 안전)
+-- /api/search/existing은 이 테이블을 한 번 읽어 미리 계산된 첫 페이지를 반환합니다.
+-- first_page가 NULL이면(결과 변경 후) 다음 조회 또는 검색 완료 시 다시 계산됩니다.
+CREATE TABLE IF NOT EXISTS query_latest_results (
+    query_id INTEGER PRIMARY KEY REFERENCES search_queries(id),
+    search_request_id UUID NOT NULL REFERENCES search_requests(id),
+    first_page JSONB,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 기존 크롤링 검색 요청으로 포인터 채우기 (정규화된 검색어별 가장 최근 요청, 첫 페이지는 조회 시 계산)
+INSERT INTO search_queries (query)
+SELECT DISTINCT LOWER(TRIM(query)) FROM search_requests WHERE is_crawled
+ON CONFLICT (query) DO NOTHING;
+
+INSERT INTO query_latest_results (query_id, search_request_id, first_page, version, updated_at)
+SELECT DISTINCT ON (q.id) q.id, r.id, NULL, 0, CURRENT_TIMESTAMP
+FROM search_requests r
+JOIN search_queries q ON q.query = LOWER(TRIM(r.query))
+WHERE r.is_crawled
+ORDER BY q.id, r.created_at DESC
+ON CONFLICT (query_id) DO NOTHING;
+
+-- 변경 내용 확인
+COMMENT ON TABLE query_latest_results IS '검색어별 가장 최근 크롤링 검색 요청과 미리 계산한 첫 페이지 (/existing 조회용)';
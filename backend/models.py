@@ -33,11 +33,16 @@ class UserList(BaseModel):
 class SearchRequest(BaseModel):
     query: str
     location: Optional[str] = "전국"
+    max_seconds: Optional[float] = Field(None, gt=0)  # 크롤링 시간 예산 (초), 소진되면 남은 지역은 건너뜀
+    max_unique_items: Optional[int] = Field(None, gt=0)  # 수집할 고유 상품 수 예산
+    crawl_mode: Optional[Literal["full", "coverage", "drilldown"]] = "full"  # full: 모든 지역, coverage: 동 커버리지 기준 최소 지역만, drilldown: 시군구 대표 지역부터 포화 시 동 단위로
 
 # 검색 결과 필터링 및 페이징 모델
 class SearchFilter(BaseModel):
-    sort_by: Optional[Literal["created_at_desc", "price_asc"]] = "created_at_desc"  # 최신순, 가격낮은순
+    sort_by: Optional[Literal["created_at_desc", "price_asc", "price_desc", "boosted_at_desc"]] = "created_at_desc"  # 최신순, 가격낮은순, 가격높은순, 끌어올림순
     only_available: Optional[bool] = False  # 거래 가능한 상품만
+    min_price: Optional[float] = Field(None, ge=0)  # 최소 가격
+    max_price: Optional[float] = Field(None, ge=0)  # 최대 가격
     page: Optional[int] = 1
     page_size: Optional[int] = 20
     query: Optional[str] = None  # 쿼리는 선택 사항(특정 검색 ID로 조회 시)
@@ -53,6 +58,7 @@ class SearchResultItem(BaseModel):
     link: str
     location: Optional[str] = None
     content: Optional[str] = None
+    snippet: Optional[str] = None  # 내용 앞부분 (목록 카드용)
     thumbnail: Optional[str] = None
     created_at_origin: Optional[str] = None
     boosted_at: Optional[str] = None
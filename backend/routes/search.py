@@ -1,16 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Header, BackgroundTasks, Query
-from typing import Optional, Dict, List
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import Optional, Dict, List, Tuple, Literal
 import logging
-import uuid
 import asyncio
 import aiohttp
 import time
-import random  # 무작위 셔플을 위해 추가
+import os
+import itertools
+import json
 from asyncio import gather
 
 from models import SearchRequest, SearchResponse, SearchResultItem, User
-from services.daangn_scraper import DaangnScraper
-from services.db_service import DBService
+from services.daangn_scraper import DaangnScraper, HedgeBudget
+from services.db_service import DBService, item_dedup_key, uuid7, CHANGES_PAGE_LIMIT
+from services.crawl_scheduler import crawl_scheduler, MAX_CONCURRENT_REQUESTS, CrawlCancelledError
+from services.region_prioritizer import region_prioritizer
+from services.coverage_planner import coverage_planner
+from services.drilldown_planner import DrillDownPlan, get_saturation_threshold
+from services.prewarm_scheduler import prewarm_scheduler, PREWARM_LOCATION
+from services.result_cache import result_cache
+from services.columnar_store import columnar_store
+from services import price_stats
 from auth_utils import verify_token
 
 # 로깅 설정
@@ -32,18 +43,114 @@ daangn_scraper = None
 # 처리 중인 모든 백그라운드 태스크 추적
 running_tasks = set()
 
-# 최대 동시 비동기 요청 수를 20개로 제한하는 전역 세마포어
-MAX_CONCURRENT_REQUESTS = 20
-request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
-
 # 현재 진행 중인 검색 쿼리 추적 (query_text: search_request_id)
 active_searches = {}
 # 진행 중인 검색 쿼리를 위한 락
 active_searches_lock = asyncio.Lock()
 
-async def perform_area_search(scraper: DaangnScraper, search_request_id: str, query: str, place_param: Dict):
-    """백그라운드에서 특정 지역의 검색을 수행합니다"""
-    # 세마포어 획득 (함수가 호출되는 시점에 세마포어가 이미 획득되어 있음)
+# 클라이언트가 상태/결과를 조회하지 않은 채 이 시간(분)이 지나면 검색을 자동 취소 (0이면 비활성화)
+SEARCH_AUTO_CANCEL_MINUTES = float(os.getenv("SEARCH_AUTO_CANCEL_MINUTES", "0"))
+# 자동 취소 여부를 확인하는 간격(초)
+AUTO_CANCEL_CHECK_INTERVAL = 30
+
+# search_process.skip_reason 값
+SKIP_REASON_CANCELLED = "cancelled"
+SKIP_REASON_IDLE_TIMEOUT = "idle_timeout"
+SKIP_REASON_NEGATIVE_CACHE = "negative_cache"
+SKIP_REASON_COVERAGE = "coverage_redundant"
+SKIP_REASON_DRILLDOWN = "drilldown_unsaturated"
+SKIP_REASON_FRESH = "fresh_cache"
+
+# 같은 쿼리로 이 시간(초) 안에 검색에 성공한 지역은 다시 크롤링하지 않고 저장된 결과를 사용 (0이면 비활성화)
+REGION_RESULT_TTL_SECONDS = float(os.getenv("REGION_RESULT_TTL_SECONDS", "600"))
+
+# 첫 응답을 위해 동시에 검색할 상위 지역 수와 응답 마감 시간(초)
+FIRST_PAGE_FANOUT = int(os.getenv("FIRST_PAGE_FANOUT", "3"))
+FIRST_PAGE_DEADLINE_SECONDS = float(os.getenv("FIRST_PAGE_DEADLINE_SECONDS", "2.0"))
+# 검색 하나에서 첫 페이지 조회에 사용할 수 있는 헤지 요청 수 (0이면 헤지 비활성화)
+SEARCH_HEDGE_BUDGET = int(os.getenv("SEARCH_HEDGE_BUDGET", "2"))
+
+# 스트리밍 검색 응답에서 진행 상황 프레임을 보내는 간격(초)
+STREAM_PROGRESS_INTERVAL = float(os.getenv("STREAM_PROGRESS_INTERVAL", "2.0"))
+
+# 스트리밍 응답 구독자 (search_request_id: 이벤트를 받을 asyncio.Queue 집합)
+search_listeners: Dict[str, set] = {}
+
+def publish_search_event(search_request_id: str, event: Dict):
+    """검색의 스트리밍 구독자들에게 이벤트를 전달합니다"""
+    for listener in search_listeners.get(search_request_id, ()):
+        listener.put_nowait(event)
+
+def subscribe_search_events(search_request_id: str, listener: asyncio.Queue):
+    search_listeners.setdefault(search_request_id, set()).add(listener)
+
+def unsubscribe_search_events(search_request_id: str, listener: asyncio.Queue):
+    listeners = search_listeners.get(search_request_id)
+    if listeners is not None:
+        listeners.discard(listener)
+        if not listeners:
+            del search_listeners[search_request_id]
+
+# fields 프로젝션에서도 항상 포함하는 필드 (응답 모델의 필수 필드)
+REQUIRED_RESULT_FIELDS = {"title", "link"}
+
+def parse_fields(fields: Optional[str]) -> Optional[set]:
+    """fields 쿼리 파라미터(쉼표 구분)를 필드 이름 집합으로 변환합니다 (지정하지 않으면 None = 전체)"""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(SearchResultItem.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"알 수 없는 필드: {', '.join(sorted(unknown))}"
+        )
+    return requested | REQUIRED_RESULT_FIELDS
+
+def validate_price_range(min_price: Optional[float], max_price: Optional[float]):
+    """가격 범위 파라미터 확인 (최소 가격이 최대 가격보다 크면 400)"""
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_price는 max_price보다 클 수 없습니다"
+        )
+
+def to_search_result_item(item: Dict, fields: Optional[set] = None) -> SearchResultItem:
+    """검색 결과 딕셔너리를 응답 모델로 변환합니다 (fields가 주어지면 나머지 필드는 비움)"""
+    if fields:
+        return SearchResultItem(**{name: item[name] for name in fields if item.get(name) is not None})
+    return SearchResultItem(
+        title=item["title"],
+        price=item["price"],
+        link=item["link"],
+        location=item["location"],
+        content=item.get("content", ""),
+        snippet=item.get("snippet"),
+        thumbnail=item.get("thumbnail", ""),
+        created_at_origin=item.get("created_at_origin", ""),
+        boosted_at=item.get("boosted_at", ""),
+        nickname=item.get("nickname", ""),
+        status=item.get("status", ""),
+        category_id=item.get("category_id"),
+        is_new=item.get("is_new", False),
+        dong_id=item.get("dong_id"),
+        place_title_original=item.get("place_title_original"),
+        sido=item.get("sido"),
+        sigungu1=item.get("sigungu1"),
+        sigungu2=item.get("sigungu2"),
+        dong=item.get("dong")
+    )
+
+def is_search_finished(status: Dict) -> bool:
+    """모든 검색 프로세스가 완료되었거나 건너뛰어졌는지 확인합니다"""
+    return status["total"] > 0 and status["completed"] + status.get("skipped", 0) >= status["total"]
+
+async def perform_area_search(scraper: DaangnScraper, search_request_id: str, query: str, place_param: Dict, hedge_budget: Optional[HedgeBudget] = None) -> Optional[List[Dict]]:
+    """백그라운드에서 특정 지역의 검색을 수행하고 수집된 결과를 반환합니다 (실패 시 None)
+
+    hedge_budget이 주어지면 느린 응답에 대해 다른 프록시로 헤지 요청을 보냅니다.
+    """
+    # 스케줄러 워커 슬롯 (함수가 호출되는 시점에 이미 슬롯이 할당되어 있음)
     process = None
     try:
         # 검색 프로세스 생성 (start_time 없이)
@@ -57,7 +164,7 @@ async def perform_area_search(scraper: DaangnScraper, search_request_id: str, qu
         
         if not process:
             logger.error(f"검색 프로세스 생성 실패: {place_param['param']}")
-            return
+            return None
         
         process_id = process["id"]
         
@@ -75,17 +182,23 @@ async def perform_area_search(scraper: DaangnScraper, search_request_id: str, qu
                 await db_service.mark_search_process_started(process_id, scraper.proxy)
                 
                 # 검색 시도
-                search_results = await scraper.search(query)
+                if hedge_budget is not None:
+                    search_results = await scraper.search_hedged(query, hedge_budget)
+                else:
+                    search_results = await scraper.search(query)
                 
                 # 검색 성공적으로 완료된 경우
                 logger.info(f"지역 '{place_param['param']}' 검색 결과: {len(search_results)}개 항목")
                 
-                # 결과 저장
-                await db_service.save_search_results(
-                    search_request_id=search_request_id,
-                    results=search_results,
-                    query=query
-                )
+                # 같은 검색의 다른 지역 응답에서 이미 받은 항목(링크+내용 동일)은 제외하고 저장
+                new_results = crawl_scheduler.filter_new_items(search_request_id, search_results, key=item_dedup_key)
+                if new_results:
+                    await db_service.save_search_results(
+                        search_request_id=search_request_id,
+                        results=new_results,
+                        query=query
+                    )
+                logger.info(f"지역 '{place_param['param']}' 저장 대상: {len(search_results)}개 중 새 항목 {len(new_results)}개")
                 
                 # 검색 프로세스 완료 상태 업데이트 (성공)
                 await db_service.update_search_process(
@@ -94,9 +207,11 @@ async def perform_area_search(scraper: DaangnScraper, search_request_id: str, qu
                     items_count=len(search_results),
                     proxy_info=scraper.proxy
                 )
+                region_prioritizer.record_result(query, place_param["id"], len(search_results))
+                await coverage_planner.observe(place_param["id"], search_results)
                 
                 logger.info(f"지역 '{place_param['param']}' 검색 완료 (성공)")
-                return  # 성공하면 종료
+                return search_results  # 성공하면 종료
                 
             except Exception as search_error:
                 # 검색 시도 실패
@@ -129,6 +244,18 @@ async def perform_area_search(scraper: DaangnScraper, search_request_id: str, qu
                 proxy_info=scraper.proxy
             )
             
+    except asyncio.CancelledError:
+        # 검색 취소: 진행 중이던 지역을 취소됨으로 기록한 뒤 취소를 전파
+        logger.info(f"지역 '{place_param['param']}' 검색이 취소되었습니다.")
+        if process and "id" in process:
+            await db_service.update_search_process(
+                process_id=process["id"],
+                is_completed=False,
+                items_count=0,
+                skip_reason=SKIP_REASON_CANCELLED,
+                proxy_info=scraper.proxy if scraper and hasattr(scraper, 'proxy') else None
+            )
+        raise
     except Exception as e:
         error_msg = str(e)
         logger.error(f"지역 검색 전체 처리 중 오류 발생: {error_msg}")
@@ -146,6 +273,8 @@ async def perform_area_search(scraper: DaangnScraper, search_request_id: str, qu
                 logger.info(f"지역 '{place_param['param']}' 검색 실패로 기록됨 (전체 처리 오류)")
             except Exception as update_error:
                 logger.error(f"실패한 프로세스 상태 업데이트 중 오류: {str(update_error)}")
+    
+    return None
 
 @router.post("/", response_model=List[SearchResultItem])
 async def search_products(
@@ -154,6 +283,115 @@ async def search_products(
     user_data: Optional[Dict] = Depends(verify_token)
 ):
     """상품 검색 API - 당근마켓에서 상품을 검색합니다"""
+    search_request_id, initial_results = await start_search(search_request, user_data)
+    return [to_search_result_item(item) for item in initial_results]
+
+@router.post("/stream")
+async def search_products_stream(
+    search_request: SearchRequest,
+    user_data: Optional[Dict] = Depends(verify_token)
+):
+    """상품 검색 스트리밍 API - 지역 검색이 끝날 때마다 중복 제거된 결과를 NDJSON으로 전송합니다
+
+    각 줄은 다음 중 하나의 JSON 객체입니다.
+    - {"type": "search", "search_id": ...}: 검색 ID
+    - {"type": "items", "region": ..., "items": [...]}: 새로 발견된 SearchResultItem 묶음
+    - {"type": "progress", ...}: 진행 상황 (STREAM_PROGRESS_INTERVAL마다)
+    - {"type": "done", ...}: 검색 종료 (마지막 프레임)
+    """
+    listener = asyncio.Queue()
+    search_request_id, initial_results = await start_search(search_request, user_data, listener=listener)
+    
+    async def stream_events():
+        seen_links = set()
+        
+        def items_frame(items: List[Dict], region: Optional[str] = None) -> Optional[str]:
+            new_items = []
+            for item in items:
+                if item["link"] not in seen_links:
+                    seen_links.add(item["link"])
+                    new_items.append(to_search_result_item(item).model_dump())
+            if not new_items:
+                return None
+            return json.dumps({"type": "items", "region": region, "items": new_items}, ensure_ascii=False) + "\n"
+        
+        async def progress_frame(frame_type: str) -> str:
+            status = await db_service.get_search_process_status(search_request_id)
+            frame = {
+                "type": frame_type,
+                "search_id": search_request_id,
+                "total_processes": status["total"],
+                "completed_processes": status["completed"],
+                "skipped_processes": status.get("skipped", 0),
+                "completion_percentage": status["percentage"],
+                "total_items": len(seen_links)
+            }
+            return json.dumps(frame, ensure_ascii=False) + "\n"
+        
+        try:
+            yield json.dumps({"type": "search", "search_id": search_request_id}) + "\n"
+            
+            frame = items_frame(initial_results)
+            if frame:
+                yield frame
+            
+            next_progress_at = time.monotonic() + STREAM_PROGRESS_INTERVAL
+            while True:
+                try:
+                    event = await asyncio.wait_for(listener.get(), timeout=max(0, next_progress_at - time.monotonic()))
+                except asyncio.TimeoutError:
+                    event = None
+                
+                if time.monotonic() >= next_progress_at:
+                    # 스트림을 읽는 클라이언트가 있으므로 자동 취소되지 않도록 조회 시각 갱신
+                    crawl_scheduler.touch(search_request_id)
+                    # 스케줄러에서 이미 해제된 검색이면 (완료 이벤트를 놓친 경우) 종료
+                    if event is None and not crawl_scheduler.get_stats(search_request_id):
+                        break
+                    yield await progress_frame("progress")
+                    next_progress_at = time.monotonic() + STREAM_PROGRESS_INTERVAL
+                
+                if event is None:
+                    continue
+                if event["type"] == "done":
+                    break
+                if event["type"] == "items":
+                    frame = items_frame(event["items"], event.get("region"))
+                    if frame:
+                        yield frame
+            
+            yield await progress_frame("done")
+        finally:
+            unsubscribe_search_events(search_request_id, listener)
+    
+    # 첫 프레임 전에 클라이언트가 끊으면 제너레이터의 finally가 실행되지 않으므로 응답 종료 후에도 구독 해제
+    return StreamingResponse(
+        stream_events(),
+        media_type="application/x-ndjson",
+        headers={"X-Search-ID": search_request_id},
+        background=BackgroundTask(unsubscribe_search_events, search_request_id, listener)
+    )
+
+async def start_prewarm_search(query: str, max_seconds: float) -> Optional[str]:
+    """미리 검색 스케줄러에서 호출 - 비로그인 레인과 시간 예산으로 검색을 시작하고 검색 ID를 반환합니다"""
+    search_request_id, _ = await start_search(
+        SearchRequest(query=query, max_seconds=max_seconds),
+        None,
+        location=PREWARM_LOCATION
+    )
+    return search_request_id
+
+async def start_search(
+    search_request: SearchRequest,
+    user_data: Optional[Dict],
+    listener: Optional[asyncio.Queue] = None,
+    location: str = "multiple"
+) -> Tuple[str, List[Dict]]:
+    """검색을 시작(또는 진행 중인 같은 쿼리의 검색에 합류)하고 검색 ID와 첫 페이지 결과를 반환합니다
+
+    listener가 주어지면 지역 검색이 끝날 때마다 결과 이벤트를 받도록 구독합니다.
+    location은 search_requests에 기록되는 값입니다 (미리 검색은 PREWARM_LOCATION).
+    """
     query = search_request.query.strip().lower()  # 쿼리 정규화 (소문자 변환, 공백 제거)
     logger.info(f"검색 요청 수신: {query}")
     
@@ -162,6 +400,9 @@ async def search_products(
         if query in active_searches:
             existing_search_id = active_searches[query]
             logger.info(f"이미 진행 중인 검색 감지: 쿼리='{query}', 검색 ID={existing_search_id}")
+            crawl_scheduler.touch(existing_search_id)
+            if listener is not None:
+                subscribe_search_events(existing_search_id, listener)
             
             # 이미 진행 중인 검색의 상태 확인
             status = await db_service.get_search_process_status(existing_search_id)
@@ -177,33 +418,7 @@ async def search_products(
             
             logger.info(f"이미 진행 중인 검색 결과 반환: {len(results['items'])}개 항목, 진행률 {status['percentage']}%")
             
-            # 결과 변환 및 반환
-            response_items = [
-                SearchResultItem(
-                    title=item["title"],
-                    price=item["price"],
-                    link=item["link"],
-                    location=item["location"],
-                    content=item.get("content", ""),
-                    thumbnail=item.get("thumbnail", ""),
-                    created_at_origin=item.get("created_at_origin", ""),
-                    boosted_at=item.get("boosted_at", ""),
-                    nickname=item.get("nickname", ""),
-                    status=item.get("status", ""),
-                    category_id=item.get("category_id"),
-                    is_new=item.get("is_new", False),
-                    dong_id=item.get("dong_id"),
-                    place_title_original=item.get("place_title_original"),
-                    sido=item.get("sido"),
-                    sigungu1=item.get("sigungu1"),
-                    sigungu2=item.get("sigungu2"),
-                    dong=item.get("dong")
-                ) for item in results['items']
-            ]
-            
-            # search_id를 응답 헤더에 추가 (기존 진행 중인 검색 ID)
-            response_headers = {"X-Search-ID": existing_search_id}
-            return response_items
+            return existing_search_id, results['items']
     
     # 검색 요청 정보 저장
     user_id = user_data.get("id") if user_data else None
@@ -214,17 +429,17 @@ async def search_products(
         search_request_record = await db_service.save_search_request(
             user_id=user_id,
             query=query,
-            location="multiple"  # 여러 지역 검색을 의미
+            location=location  # 여러 지역 검색을 의미 (미리 검색은 PREWARM_LOCATION)
         )
         
         if search_request_record and "id" in search_request_record:
             search_request_id = search_request_record["id"]
             logger.info(f"검색 요청이 DB에 저장되었습니다. ID: {search_request_id}, is_crawled: True")
         else:
-            search_request_id = str(uuid.uuid4())
+            search_request_id = str(uuid7())
             logger.warning(f"검색 요청 저장 실패, 임시 ID 사용: {search_request_id}")
     except Exception as e:
-        search_request_id = str(uuid.uuid4())
+        search_request_id = str(uuid7())
         logger.error(f"DB 검색 요청 저장 실패: {str(e)}")
     
     # 현재 진행 중인 검색으로 등록
@@ -232,11 +447,56 @@ async def search_products(
         active_searches[query] = search_request_id
         logger.info(f"쿼리 '{query}'를 진행 중인 검색으로 등록했습니다. ID: {search_request_id}")
     
+    if listener is not None:
+        subscribe_search_events(search_request_id, listener)
+    
     # place_list 테이블에서 검색할 장소 파라미터 가져오기
     place_params = await db_service.get_place_params()
-    # 무작위로 섞기
-    random.shuffle(place_params)
-    logger.info(f"검색할 지역 파라미터 {len(place_params)}개 로드됨 (무작위 순서로 섞음)")
+    
+    # 최근 TTL 안에 같은 쿼리로 검색된 지역은 크롤링하지 않음 (결과는 쿼리 단위로 search_results에 저장되어 있음)
+    fresh_places = []
+    if REGION_RESULT_TTL_SECONDS > 0:
+        fresh_regions = await db_service.get_fresh_regions(query, REGION_RESULT_TTL_SECONDS)
+        if fresh_regions:
+            fresh_places = [place_param for place_param in place_params if place_param["id"] in fresh_regions]
+            place_params = [place_param for place_param in place_params if place_param["id"] not in fresh_regions]
+            await db_service.record_skipped_processes(
+                search_request_id=search_request_id,
+                query=search_request.query,
+                place_params=fresh_places,
+                skip_reason=SKIP_REASON_FRESH,
+                items_counts={place_id: info["items_count"] for place_id, info in fresh_regions.items()}
+            )
+            logger.info(f"최근 {REGION_RESULT_TTL_SECONDS:.0f}초 내 검색된 {len(fresh_places)}개 지역은 저장된 결과를 사용합니다.")
+    
+    # 과거 결과 수 기준으로 정렬 (결과가 많던 지역 먼저), 최근 결과가 없던 지역은 제외
+    place_params, negative_places = await region_prioritizer.prioritize(query, place_params)
+    logger.info(f"검색할 지역 파라미터 {len(place_params)}개 로드됨 (예상 결과 수 순서로 정렬, 네거티브 캐시 {len(negative_places)}개 제외)")
+    
+    if negative_places:
+        await db_service.record_skipped_processes(
+            search_request_id=search_request_id,
+            query=search_request.query,
+            place_params=negative_places,
+            skip_reason=SKIP_REASON_NEGATIVE_CACHE
+        )
+    
+    # 커버리지 모드: 다른 지역 검색으로 이미 덮이는 지역은 건너뜀
+    if search_request.crawl_mode == "coverage":
+        place_params, redundant_places = await coverage_planner.plan(place_params)
+        if redundant_places:
+            await db_service.record_skipped_processes(
+                search_request_id=search_request_id,
+                query=search_request.query,
+                place_params=redundant_places,
+                skip_reason=SKIP_REASON_COVERAGE
+            )
+    
+    # 드릴다운 모드: 시군구별 대표 지역만 먼저 검색하고, 응답이 포화된 시군구만 동 단위로 내려감
+    drilldown_plan = None
+    if search_request.crawl_mode == "drilldown":
+        drilldown_plan = DrillDownPlan(place_params, await get_saturation_threshold(db_service))
+        place_params = drilldown_plan.representatives
     
     # 프록시 초기화 - 모든 검색에서 공유할 스크래퍼 인스턴스 생성
     try:
@@ -247,188 +507,175 @@ async def search_products(
         logger.error(f"프록시 초기화 실패: {str(e)}")
         # 프록시 없이 진행할지 여부 결정
         # 여기서는 프록시 실패 시 검색을 중단하도록 구현
-        return []
+        publish_search_event(search_request_id, {"type": "done"})
+        return search_request_id, []
     
-    # 초기 결과를 위해 첫 번째 지역 파라미터 사용 (존재하는 경우)
-    initial_results = []
-    first_place = None
-    if place_params:
-        first_place = place_params[0]
-        logger.debug(f"첫 번째 지역 '{first_place['param']}'에서 '{search_request.query}' 검색을 시작합니다.")
-        
-        # 첫 번째 지역에 대한 검색 프로세스 생성 (프록시 정보 추가)
-        try:
-            process = await db_service.create_search_process(
-                search_request_id=search_request_id,
-                place_id=first_place["id"],
-                param=first_place["param"],
-                query=search_request.query,
-                proxy_info=shared_scraper.proxy
-            )
-            
-            if not process or "id" not in process:
-                logger.error(f"첫 번째 지역 검색 프로세스 생성 실패")
-                return []
-                
-            process_id = process["id"]
+    # 스케줄러에 검색 등록 (로그인 사용자는 가중치가 높은 레인 사용)
+    crawl_scheduler.register_search(search_request_id, query, user_id=str(user_id) if user_id is not None else None)
+    
+    # 시간/결과 수 예산이 지정된 경우 예산이 소진되면 더 이상 지역 검색을 시작하지 않음
+    if search_request.max_seconds or search_request.max_unique_items:
+        crawl_scheduler.set_budget(
+            search_request_id,
+            max_seconds=search_request.max_seconds,
+            max_unique_items=search_request.max_unique_items
+        )
+    
+    # 첫 페이지 지역 검색이 느린 프록시에 묶이지 않도록 검색별 헤지 예산 할당
+    hedge_budget = HedgeBudget(SEARCH_HEDGE_BUDGET)
+    
+    def create_place_job(current_index: int, place_param: Dict, first_page: bool = False):
+        """지역 하나를 검색하는 스케줄러 작업을 생성합니다"""
+        async def run_place_search():
+            # 각 장소별로 독립된 스크래퍼 인스턴스 생성
+            place_scraper = DaangnScraper(location=place_param["param"], use_proxy=True)
+            # 스크래퍼 초기화 (공유 스크래퍼의 프록시 서비스 재활용)
+            place_scraper.proxy_service = shared_scraper.proxy_service
             
-            # 공유 스크래퍼의 지역 설정 업데이트
-            shared_scraper.location = first_place["param"]
+            # 인덱스에 따라 순차적으로 프록시 할당 (프록시 개수를 초과하면 순환)
+            proxy_index = current_index % len(place_scraper.proxy_service.all_proxies)
+            place_scraper.proxy_service.current_index = proxy_index
             
-            # 프록시 순환 횟수 추적
-            proxy_rotation_count = 0
-            max_proxy_rotations = len(shared_scraper.proxy_service.all_proxies) * 2  # 모든 프록시 2회 순환까지 시도 (무한 루프 방지)
+            # 해당 인덱스의 프록시 가져오기
+            place_scraper.proxy, place_scraper.proxy_url = place_scraper.proxy_service.get_proxy()
             
-            while proxy_rotation_count < max_proxy_rotations:
-                try:
-                    # 실제 검색 시작 시간 기록
-                    await db_service.mark_search_process_started(process_id, shared_scraper.proxy)
-                    
-                    # 검색 시도
-                    initial_results = await shared_scraper.search(search_request.query)
-                    logger.info(f"첫 번째 지역 검색 결과: {len(initial_results)}개 항목 검색됨")
-                    
-                    # 초기 결과 저장
-                    await db_service.save_search_results(
-                        search_request_id=search_request_id,
-                        results=initial_results,
-                        query=search_request.query
-                    )
-                    
-                    # 첫 번째 지역 검색 프로세스 완료 표시 (성공)
-                    await db_service.update_search_process(
-                        process_id=process_id,
-                        is_completed=True,
-                        items_count=len(initial_results),
-                        proxy_info=shared_scraper.proxy
-                    )
-                    logger.info(f"첫 번째 지역 '{first_place['param']}' 검색 완료 (성공)")
-                    break  # 성공했으므로 while 루프 종료
-                    
-                except Exception as search_error:
-                    # 검색 시도 실패
-                    error_msg = str(search_error)
-                    logger.error(f"첫 번째 지역 '{first_place['param']}' 검색 중 오류 발생 (프록시 #{proxy_rotation_count+1}): {error_msg}")
-                    
-                    # 다음 프록시로 전환 시도
-                    proxy_rotation_count += 1
-                    logger.info(f"다음 프록시로 전환 시도 중... (시도 {proxy_rotation_count}/{max_proxy_rotations})")
-                    
-                    if await shared_scraper.switch_to_next_proxy():
-                        logger.info(f"새 프록시로 전환 성공. 검색 재시도... (프록시 정보: {shared_scraper.proxy.get('provider', '')}/{shared_scraper.proxy.get('country', '')})")
-                        # 루프 계속 (다음 반복에서 재시도)
-                        continue
-                    else:
-                        # 프록시 전환 실패 (더 이상 프록시가 없음)
-                        logger.error(f"다음 프록시로 전환 실패. 남은 사용 가능한 프록시가 없습니다.")
-                        break  # while 루프 종료
-            
-            # 모든 프록시 시도 후에도 실패한 경우
-            if proxy_rotation_count >= max_proxy_rotations or (proxy_rotation_count > 0 and not initial_results):
-                logger.error(f"첫 번째 지역 '{first_place['param']}' 검색 실패: 모든 가능한 프록시 ({proxy_rotation_count}개) 시도 후 실패")
-                
-                # 프로세스를 실패로 표시
-                await db_service.update_search_process(
-                    process_id=process_id,
-                    is_completed=False,
-                    items_count=0,
-                    error_message=f"모든 프록시 시도 후 실패 ({proxy_rotation_count}회 시도)",
-                    proxy_info=shared_scraper.proxy
-                )
-                initial_results = []
+            logger.info(f"지역 '{place_param['param']}'에 프록시 #{proxy_index+1} 할당: {place_scraper.proxy.get('provider', '')}/{place_scraper.proxy.get('country', '')}")
             
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"첫 번째 지역 검색 전체 처리 중 오류 발생: {error_msg}")
+            place_results = await perform_area_search(
+                place_scraper,
+                search_request_id,
+                search_request.query,
+                place_param,
+                hedge_budget=hedge_budget if first_page else None
+            )
             
-            if process and "id" in process:
-                # 오류 발생 시 프로세스 상태 업데이트 (실패로 표시)
-                await db_service.update_search_process(
-                    process_id=process["id"],
-                    is_completed=False,  # 실패로 표시
-                    items_count=0,
-                    error_message=f"처리 오류: {error_msg}",  # 오류 메시지 저장
-                    proxy_info=shared_scraper.proxy if hasattr(shared_scraper, 'proxy') else None
-                )
-                logger.info(f"첫 번째 지역 '{first_place['param']}' 검색 실패로 기록됨 (전체 처리 오류)")
-                
-            # 실패했을 경우 빈 결과 반환하여 사용자에게 알림
-            initial_results = []
+            # 결과 수 예산 확인을 위해 수집된 링크 기록
+            crawl_scheduler.record_items(search_request_id, [item["link"] for item in place_results or []])
+            if place_results:
+                publish_search_event(search_request_id, {"type": "items", "region": place_param["param"], "items": place_results})
+            await expand_drilldown(place_param, place_results)
+            return place_results
+        
+        return run_place_search
+    
+    # 작업 순서대로 프록시를 배정하기 위한 인덱스
+    place_job_counter = itertools.count(0)
+    
+    def submit_place_job(place_param: Dict, first_page: bool = False) -> asyncio.Future:
+        """지역 검색 작업을 이 검색의 스케줄러 큐에 추가합니다"""
+        return crawl_scheduler.submit(
+            search_request_id,
+            create_place_job(next(place_job_counter), place_param, first_page),
+            label=place_param["param"],
+            first_page=first_page,
+            payload=place_param
+        )
+    
+    async def expand_drilldown(place_param: Dict, place_results: Optional[List[Dict]]):
+        """드릴다운 모드에서 대표 지역 응답이 포화되었으면 하위 동 검색을 예약하고, 아니면 건너뜀으로 기록합니다"""
+        if drilldown_plan is None:
+            return
+        
+        items_count = len(place_results) if place_results is not None else None
+        children, pruned = drilldown_plan.expand(place_param["id"], items_count)
+        for child in children:
+            submit_place_job(child)
+        
+        if children:
+            logger.info(f"대표 지역 '{place_param['param']}' 응답 포화({items_count}개) - 하위 동 {len(children)}개 검색 예약")
+        if pruned:
+            await db_service.record_skipped_processes(
+                search_request_id=search_request_id,
+                query=search_request.query,
+                place_params=pruned,
+                skip_reason=SKIP_REASON_DRILLDOWN
+            )
+    
+    # 우선순위 상위 지역들을 첫 페이지 레인에서 동시에 검색하고, 마감 시간까지 도착한 결과만 응답에 포함
+    first_places = place_params[:FIRST_PAGE_FANOUT]
+    first_page_futures = [submit_place_job(place_param, first_page=True) for place_param in first_places]
+    
+    initial_results = []
+    if first_page_futures:
+        logger.debug(f"상위 {len(first_places)}개 지역에서 '{search_request.query}' 첫 페이지 검색 시작 (마감 {FIRST_PAGE_DEADLINE_SECONDS}초)")
+        done, pending = await asyncio.wait(first_page_futures, timeout=FIRST_PAGE_DEADLINE_SECONDS)
+        
+        # 도착한 결과를 링크 기준으로 중복 제거하여 병합 (마감 후에도 나머지 작업은 백그라운드에서 계속 진행)
+        seen_links = set()
+        for future in first_page_futures:
+            if future not in done or future.cancelled() or future.exception() is not None:
+                continue
+            for item in future.result() or []:
+                if item["link"] not in seen_links:
+                    seen_links.add(item["link"])
+                    initial_results.append(item)
+        
+        logger.info(f"첫 페이지: {len(first_places)}개 지역 중 {len(done)}개 마감 전 도착, 고유 항목 {len(initial_results)}개 (미도착 {len(pending)}개는 백그라운드에서 계속)")
+    
+    # 저장된 결과로 대체한 지역이 있으면 해당 쿼리의 저장된 결과를 첫 페이지에 함께 포함
+    if fresh_places:
+        stored_results = await db_service.get_search_results(
+            search_request_id=search_request_id,
+            page=1,
+            page_size=100,
+            sort_by="created_at_desc",
+            only_available=False
+        )
+        seen_links = {item["link"] for item in initial_results}
+        for item in stored_results["items"]:
+            if item["link"] not in seen_links:
+                seen_links.add(item["link"])
+                initial_results.append(item)
     
-    # 각 지역별 검색을 백그라운드에서 병렬로 실행 (첫 번째 지역 제외)
+    # 나머지 지역별 검색을 스케줄러 큐에 넣고 백그라운드에서 완료를 기다림
     async def run_background_tasks():
         try:
-            # 세마포어 사용하여 400개 제한으로 작업 실행
-            logger.info(f"최대 {MAX_CONCURRENT_REQUESTS}개의 동시 요청 제한으로 백그라운드 검색 작업 시작")
+            logger.info(f"최대 {MAX_CONCURRENT_REQUESTS}개의 동시 요청 제한(전체 검색 공유)으로 백그라운드 검색 작업 시작")
             
-            # 모든 지역 파라미터 (첫 번째 제외)
-            remaining_places = place_params[1:]
-            total_places = len(remaining_places)
-            logger.info(f"총 {total_places}개의 지역에 대한 검색 작업을 처리합니다.")
+            # 첫 페이지에서 요청한 지역을 제외한 모든 지역 파라미터
+            remaining_places = place_params[len(first_places):]
+            logger.info(f"총 {len(remaining_places)}개의 지역에 대한 검색 작업을 스케줄러에 등록합니다.")
             
-            # 작업 완료 시 호출되는 콜백 함수
-            async def process_next_places():
-                nonlocal remaining_places
-                
-                # 처리할 지역이 남아있으면 다음 지역 처리
-                if remaining_places:
-                    place_param = remaining_places.pop(0)
-                    current_index = total_places - len(remaining_places)
-                    
-                    # 각 장소별로 독립된 스크래퍼 인스턴스 생성
-                    place_scraper = DaangnScraper(location=place_param["param"], use_proxy=True)
-                    # 스크래퍼 초기화 (공유 스크래퍼의 프록시 서비스 재활용)
-                    place_scraper.proxy_service = shared_scraper.proxy_service
-                    
-                    # 인덱스에 따라 순차적으로 프록시 할당 (프록시 개수를 초과하면 순환)
-                    proxy_index = current_index % len(place_scraper.proxy_service.all_proxies)
-                    place_scraper.proxy_service.current_index = proxy_index
-                    
-                    # 해당 인덱스의 프록시 가져오기
-                    place_scraper.proxy, place_scraper.proxy_url = place_scraper.proxy_service.get_proxy()
-                    
-                    logger.info(f"지역 '{place_param['param']}'에 프록시 #{proxy_index+1} 할당: {place_scraper.proxy.get('provider', '')}/{place_scraper.proxy.get('country', '')}")
-                    
-                    # 세마포어 획득하여 검색 작업 실행
-                    async with request_semaphore:
-                        try:
-                            # 검색 작업 실행
-                            await perform_area_search(
-                                place_scraper,
-                                search_request_id,
-                                search_request.query,
-                                place_param
-                            )
-                        finally:
-                            # 완료 후 다음 작업 예약
-                            asyncio.create_task(process_next_places())
+            for place_param in remaining_places:
+                submit_place_job(place_param)
             
-            # 초기 작업 시작 (최대 400개까지)
-            initial_batch_size = min(MAX_CONCURRENT_REQUESTS, len(remaining_places))
-            initial_tasks = []
+            # 이 검색의 모든 작업이 끝나거나 취소될 때까지 대기
+            await wait_for_search_idle(search_request_id)
             
-            for _ in range(initial_batch_size):
-                if remaining_places:
-                    initial_tasks.append(asyncio.create_task(process_next_places()))
+            # 예산 소진으로 시작하지 않은 지역은 건너뜀으로 기록
+            budget_stats = crawl_scheduler.get_stats(search_request_id)
+            budget_dropped = crawl_scheduler.take_dropped_jobs(search_request_id)
+            if budget_dropped:
+                await db_service.record_skipped_processes(
+                    search_request_id=search_request_id,
+                    query=search_request.query,
+                    place_params=[job.payload for job in budget_dropped if job.payload],
+                    skip_reason=budget_stats.get("budget_reason") or "budget"
+                )
+                logger.info(f"검색 예산 소진으로 {len(budget_dropped)}개 지역을 건너뛰었습니다. (사유: {budget_stats.get('budget_reason')})")
             
-            logger.info(f"초기 {len(initial_tasks)}개 작업을 시작합니다.")
+            cancelled = crawl_scheduler.is_cancelled(search_request_id)
+            if budget_stats.get("items_received"):
+                logger.info(f"검색 ID {search_request_id} 중복 제거: 수신 {budget_stats['items_received']}개 중 중복 {budget_stats['items_duplicated']}개 (비율 {budget_stats['dedup_ratio']:.1%})")
+            crawl_scheduler.unregister_search(search_request_id)
             
-            # 초기 작업 완료 대기
-            if initial_tasks:
-                await asyncio.gather(*initial_tasks)
-                
-            # 남은 작업이 모두 완료될 때까지 대기
-            while len(remaining_places) > 0 or len(asyncio.all_tasks()) - len(asyncio.all_tasks() & {asyncio.current_task()}) > 0:
-                await asyncio.sleep(1)
+            if cancelled:
+                logger.info(f"검색 ID {search_request_id}가 취소되어 완료 확인을 건너뜁니다.")
+                return
                 
-            logger.info("모든 검색 작업이 요청되었습니다. 실제 완료 여부는 DB 상태로 확인합니다.")
+            logger.info("모든 검색 작업이 처리되었습니다. 실제 완료 여부는 DB 상태로 확인합니다.")
             
             # 실제로 모든 검색 프로세스가 완료되었는지 DB에서 확인
             await check_and_mark_search_completed(search_request_id, search_request.query.strip().lower())
             
+            # 다음 /existing 조회가 바로 응답되도록 첫 페이지를 미리 계산
+            await db_service.get_latest_first_page(search_request.query)
+            
         except Exception as e:
             logger.error(f"백그라운드 검색 작업 실행 중 오류 발생: {str(e)}")
         finally:
+            crawl_scheduler.unregister_search(search_request_id)
+            publish_search_event(search_request_id, {"type": "done"})
             # 백그라운드 태스크 자체가 완료되면 running_tasks에서 제거
             if background_task in running_tasks:
                 running_tasks.remove(background_task)
@@ -438,35 +685,53 @@ async def search_products(
     background_task.add_done_callback(lambda t: None)  # 에러 억제
     running_tasks.add(background_task)
     
-    # 응답 형식으로 변환 - 필요한 필드만 포함
-    results = [
-        SearchResultItem(
-            title=item["title"],
-            price=item["price"],
-            link=item["link"],
-            location=item["location"],
-            content=item.get("content", ""),
-            thumbnail=item.get("thumbnail", ""),
-            created_at_origin=item.get("created_at_origin", ""),
-            boosted_at=item.get("boosted_at", ""),
-            nickname=item.get("nickname", ""),
-            status=item.get("status", ""),
-            category_id=item.get("category_id"),
-            is_new=item.get("is_new", False),
-            dong_id=item.get("dong_id"),
-            place_title_original=item.get("place_title_original"),
-            sido=item.get("sido"),
-            sigungu1=item.get("sigungu1"),
-            sigungu2=item.get("sigungu2"),
-            dong=item.get("dong")
-        ) for item in initial_results
-    ]
-    
-    # 응답 헤더에 검색 ID 추가를 위해 응답 객체에 정보 추가
-    response_headers = {"X-Search-ID": search_request_id}
-    
-    logger.debug(f"검색 요청 '{search_request.query}'에 대한 응답을 반환합니다. 나머지 {len(place_params) - 1}개 지역은 백그라운드에서 검색 중")
-    return results
+    logger.debug(f"검색 요청 '{search_request.query}'에 대한 응답을 반환합니다. 나머지 {len(place_params) - len(first_places)}개 지역은 백그라운드에서 검색 중")
+    return search_request_id, initial_results
+
+async def cancel_crawl(search_request_id: str, reason: str = SKIP_REASON_CANCELLED) -> Dict:
+    """진행 중인 크롤링을 취소하고, 실행되지 않은 지역을 search_process에 건너뜀으로 기록합니다"""
+    queue_stats = crawl_scheduler.get_stats(search_request_id)
+    in_flight = queue_stats.get("in_flight", 0)
+    dropped_jobs = crawl_scheduler.cancel_search(search_request_id, reason=reason)
+    
+    # 한 번도 시작되지 않은 지역은 프로세스 레코드가 없으므로 일괄 기록
+    dropped_places = [job.payload for job in dropped_jobs if job.payload]
+    recorded = await db_service.record_skipped_processes(
+        search_request_id=search_request_id,
+        query=queue_stats.get("query", ""),
+        place_params=dropped_places,
+        skip_reason=reason
+    )
+    
+    # 진행 중인 검색 목록에서 제거 (같은 쿼리로 새 검색을 시작할 수 있도록)
+    async with active_searches_lock:
+        for active_query, active_id in list(active_searches.items()):
+            if active_id == search_request_id:
+                del active_searches[active_query]
+                logger.info(f"취소된 검색의 쿼리 '{active_query}'를 활성 목록에서 제거합니다. ID: {search_request_id}")
+    
+    return {
+        "search_id": search_request_id,
+        "reason": reason,
+        "cancelled_regions": recorded,
+        "interrupted_regions": in_flight
+    }
+
+async def wait_for_search_idle(search_request_id: str):
+    """검색 큐의 작업이 모두 끝날 때까지 기다리고, 클라이언트 조회가 끊긴 검색은 자동 취소합니다"""
+    if SEARCH_AUTO_CANCEL_MINUTES <= 0:
+        await crawl_scheduler.wait_idle(search_request_id)
+        return
+    
+    while True:
+        try:
+            await asyncio.wait_for(crawl_scheduler.wait_idle(search_request_id), timeout=AUTO_CANCEL_CHECK_INTERVAL)
+            return
+        except asyncio.TimeoutError:
+            idle_seconds = crawl_scheduler.idle_seconds(search_request_id)
+            if idle_seconds >= SEARCH_AUTO_CANCEL_MINUTES * 60 and not crawl_scheduler.is_cancelled(search_request_id):
+                logger.warning(f"검색 ID {search_request_id}를 {idle_seconds:.0f}초 동안 조회한 클라이언트가 없어 자동 취소합니다.")
+                await cancel_crawl(search_request_id, reason=SKIP_REASON_IDLE_TIMEOUT)
 
 # 검색 완료 여부를 확인하고 완료된 경우 active_searches에서 제거하는 함수
 async def check_and_mark_search_completed(search_request_id: str, query: str):
@@ -476,7 +741,7 @@ async def check_and_mark_search_completed(search_request_id: str, query: str):
         status = await db_service.get_search_process_status(search_request_id)
         
         # 완료 여부 확인 (모든 프로세스가 완료된 경우)
-        if status["total"] > 0 and status["completed"] == status["total"]:
+        if is_search_finished(status):
             async with active_searches_lock:
                 if query in active_searches and active_searches[query] == search_request_id:
                     del active_searches[query]
@@ -504,7 +769,7 @@ async def check_and_mark_search_completed(search_request_id: str, query: str):
                 logger.info(f"검색 ID {search_request_id} 진행 상태: {status['completed']}/{status['total']} 완료 ({completion_percentage:.2f}%)")
                 
                 # 모든 프로세스가 완료된 경우
-                if status["completed"] == status["total"]:
+                if is_search_finished(status):
                     async with active_searches_lock:
                         if query in active_searches and active_searches[query] == search_request_id:
                             del active_searches[query]
@@ -548,6 +813,7 @@ async def get_search_status(
 ):
     """검색 진행 상태 API - 특정 검색 요청의 진행 상태를 반환합니다"""
     logger.info(f"검색 상태 요청: {search_request_id}")
+    crawl_scheduler.touch(search_request_id)
     
     # 검색 프로세스 상태 조회
     status = await db_service.get_search_process_status(search_request_id)
@@ -568,8 +834,8 @@ async def get_search_status(
     place_params = await db_service.get_place_params()
     place_params_count = len(place_params)
     
-    # 완료율 계산 수정: place_params_count 기준으로 계산
-    completion_percentage = (status["completed"] / place_params_count * 100) if place_params_count > 0 else 0
+    # 완료율 계산 수정: place_params_count 기준으로 계산 (건너뛴 지역도 처리된 것으로 간주)
+    completion_percentage = ((status["completed"] + status.get("skipped", 0)) / place_params_count * 100) if place_params_count > 0 else 0
     
     # 최신 결과 반환
     response = {
@@ -579,13 +845,90 @@ async def get_search_status(
         "failed_processes": len(error_processes),
         "completion_percentage": round(completion_percentage, 2),  # 수정된 완료율
         "total_items_found": results["total"],  # 전체 아이템 수를 가져옴
-        "is_completed": status["total"] > 0 and status["completed"] == status["total"],
+        "skipped_processes": status.get("skipped", 0),  # 취소 등으로 건너뛴 지역 수
+        "is_completed": is_search_finished(status),
         "error_processes": error_processes,  # 오류 발생 프로세스 정보 추가
-        "place_params_count": place_params_count  # 실제 place_params의 전체 개수 추가
+        "place_params_count": place_params_count,  # 실제 place_params의 전체 개수 추가
+        "scheduler": crawl_scheduler.get_stats(search_request_id)  # 스케줄러 대기열 깊이, 시작까지 걸린 시간
     }
     
     return response
 
+@router.post("/cancel/{search_request_id}", response_model=Dict)
+async def cancel_search(
+    search_request_id: str,
+    user_data: Optional[Dict] = Depends(verify_token)
+):
+    """검색 취소 API - 진행 중인 크롤링을 중단하고 점유 중인 동시 요청 슬롯을 즉시 반환합니다 (검색을 시작한 사용자 또는 관리자만)"""
+    logger.info(f"검색 취소 요청: {search_request_id}")
+    
+    user_id = user_data.get("id") if user_data else None
+    if not user_id:
+        logger.warning(f"인증되지 않은 사용자가 검색 {search_request_id} 취소를 요청했습니다.")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="이 기능을 사용하려면 로그인이 필요합니다."
+        )
+    
+    queue = crawl_scheduler.queues.get(search_request_id)
+    if queue is None or crawl_scheduler.is_cancelled(search_request_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"진행 중인 검색 ID {search_request_id}를 찾을 수 없습니다."
+        )
+    
+    if queue.user_id != str(user_id) and not user_data.get("is_admin"):
+        logger.warning(f"사용자 {user_id}가 다른 사용자의 검색 {search_request_id} 취소를 시도했습니다.")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="검색을 시작한 사용자 또는 관리자만 취소할 수 있습니다."
+        )
+    
+    return await cancel_crawl(search_request_id, reason=SKIP_REASON_CANCELLED)
+
+@router.get("/scheduler", response_model=Dict)
+async def get_scheduler_stats(
+    user_data: Optional[Dict] = Depends(verify_token)
+):
+    """크롤링 스케줄러 상태 API - 활성 검색별 대기열 깊이와 시작까지 걸린 시간을 반환합니다 (관리자 전용, 검색 ID와 검색어 포함)"""
+    if not user_data or not user_data.get("is_admin"):
+        logger.warning(f"관리자가 아닌 사용자가 스케줄러 상태를 요청했습니다: {user_data.get('id') if user_data else '익명 사용자'}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN if user_data else status.HTTP_401_UNAUTHORIZED,
+            detail="관리자만 스케줄러 상태를 조회할 수 있습니다."
+        )
+    
+    return crawl_scheduler.get_stats()
+
+@router.get("/cache", response_model=Dict)
+async def get_result_cache_stats():
+    """결과 페이지 캐시와 열 저장소 상태를 반환합니다"""
+    return {
+        **result_cache.get_stats(),
+        "columnar": columnar_store.get_stats()
+    }
+
+@router.get("/prewarm", response_model=Dict)
+async def get_prewarm_stats():
+    """인기 검색어 미리 검색 스케줄러 상태를 반환합니다"""
+    return prewarm_scheduler.get_stats()
+
+@router.get("/coverage", response_model=Dict)
+async def get_coverage_plan(
+    refresh: bool = False,
+    user_data: Optional[Dict] = Depends(verify_token)
+):
+    """커버리지 계획 API - 관측된 지역 수와 전체 동을 덮는 데 필요한 지역 수를 반환합니다 (즉시 재계산(refresh)은 관리자 전용)"""
+    if refresh and (not user_data or not user_data.get("is_admin")):
+        logger.warning(f"관리자가 아닌 사용자가 커버리지 재계산을 요청했습니다: {user_data.get('id') if user_data else '익명 사용자'}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN if user_data else status.HTTP_401_UNAUTHORIZED,
+            detail="관리자만 커버리지 계획을 즉시 재계산할 수 있습니다."
+        )
+    
+    await coverage_planner.refresh(force=refresh)
+    return coverage_planner.get_stats()
+
 @router.get("/recent", response_model=List[Dict])
 async def get_recent_searches(
     limit: int = 10,
@@ -626,6 +969,136 @@ async def get_recent_searches(
         logger.error(f"DB 검색 이력 조회 실패: {str(e)}")
         return []
 
+async def get_cached_query(search_request_id: str) -> Optional[str]:
+    """결과 캐시 키로 쓸 검색 요청의 쿼리 (한 번 조회한 요청 ID는 메모리에서 찾음)"""
+    query = result_cache.query_for(search_request_id)
+    if query is None:
+        query = await db_service.get_search_request_query(search_request_id)
+        if query is not None:
+            result_cache.remember_query(search_request_id, query)
+    return query
+
+@router.get("/results/{search_request_id}/facets", response_model=Dict)
+async def get_region_facets(
+    search_request_id: str,
+    only_available: bool = False,
+    category_id: Optional[List[int]] = Query(None),
+    sido: Optional[str] = None,
+    sigungu1: Optional[str] = None,
+    sigungu2: Optional[str] = None,
+    dong: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    user_data: Optional[Dict] = Depends(verify_token)
+):
+    """지역별 상품 수 API - 현재 필터 기준 시도/시군구/동별 개수를 반환합니다
+
+    시도 목록은 지역 필터 없이, 시군구 목록은 선택한 시도 안에서, 동 목록은 선택한 시군구 안에서 셉니다.
+    """
+    validate_price_range(min_price, max_price)
+    query = await get_cached_query(search_request_id)
+    cache_key = (
+        "facets", search_request_id, only_available,
+        tuple(sorted(category_id)) if category_id else None,
+        sido, sigungu1, sigungu2, dong, min_price, max_price
+    )
+    facets = result_cache.get(query, cache_key) if query is not None else None
+    
+    if facets is None:
+        facets = await db_service.get_region_facets(
+            search_request_id=search_request_id,
+            only_available=only_available,
+            category_id=category_id,
+            sido=sido,
+            sigungu1=sigungu1,
+            sigungu2=sigungu2,
+            dong=dong,
+            min_price=min_price,
+            max_price=max_price
+        )
+        if not facets:
+            raise HTTPException(status_code=404, detail="검색 결과를 찾을 수 없습니다")
+        if query is not None:
+            result_cache.put(query, cache_key, facets)
+    
+    return {"request_id": search_request_id, **facets}
+
+@router.get("/results/{search_request_id}/price-stats", response_model=Dict)
+async def get_price_stats(
+    search_request_id: str,
+    only_available: bool = False,
+    category_id: Optional[List[int]] = Query(None),
+    sido: Optional[str] = None,
+    sigungu1: Optional[str] = None,
+    sigungu2: Optional[str] = None,
+    dong: Optional[str] = None,
+    user_data: Optional[Dict] = Depends(verify_token)
+):
+    """시세 통계 API - 검색 결과 가격의 개수/최소/최대/평균/중앙값/백분위/히스토그램을 반환합니다
+
+    가격이 없거나 0원인 항목과 이상치는 제외합니다 (제외된 개수는 free_count, outlier_count).
+    """
+    if not price_stats.is_available():
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="시세 통계를 사용할 수 없습니다 (numpy 필요)")
+    
+    query = await get_cached_query(search_request_id)
+    cache_key = (
+        "price_stats", search_request_id, only_available,
+        tuple(sorted(category_id)) if category_id else None,
+        sido, sigungu1, sigungu2, dong
+    )
+    stats = result_cache.get(query, cache_key) if query is not None else None
+    
+    if stats is None:
+        stats = await db_service.get_price_stats(
+            search_request_id=search_request_id,
+            only_available=only_available,
+            category_id=category_id,
+            sido=sido,
+            sigungu1=sigungu1,
+            sigungu2=sigungu2,
+            dong=dong
+        )
+        if not stats:
+            raise HTTPException(status_code=404, detail="검색 결과를 찾을 수 없습니다")
+        if query is not None:
+            result_cache.put(query, cache_key, stats)
+    
+    return {"request_id": search_request_id, **stats}
+
+@router.get("/results/{search_request_id}/changes", response_model=Dict)
+async def get_search_result_changes(
+    search_request_id: str,
+    since: Optional[str] = None,
+    limit: int = Query(CHANGES_PAGE_LIMIT, ge=1, le=1000),
+    user_data: Optional[Dict] = Depends(verify_token)
+):
+    """변경 피드 API - 커서 이후 추가되었거나 가격/상태가 바뀐 항목만 반환합니다
+
+    since에는 이전 응답의 next_cursor(또는 ISO 시각, 시간대가 없으면 KST)를 넘기며,
+    has_more가 true면 next_cursor로 이어서 요청합니다. 각 항목의 change는 added 또는 changed입니다.
+    """
+    crawl_scheduler.touch(search_request_id)
+    try:
+        changes = await db_service.get_search_result_changes(search_request_id, since=since, limit=limit)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="since 형식이 올바르지 않습니다"
+        )
+    if not changes:
+        raise HTTPException(status_code=404, detail="검색 결과를 찾을 수 없습니다")
+    
+    return {
+        "request_id": search_request_id,
+        "items": [
+            {**to_search_result_item(item).model_dump(), "change": item["change"]}
+            for item in changes["items"]
+        ],
+        "next_cursor": changes["next_cursor"],
+        "has_more": changes["has_more"]
+    }
+
 @router.get("/results/{search_request_id}", response_model=SearchResponse)
 async def get_search_results(
     search_request_id: str,
@@ -638,10 +1111,23 @@ async def get_search_results(
     sigungu1: Optional[str] = None, 
     sigungu2: Optional[str] = None,
     dong: Optional[str] = None,
+    fields: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
     user_data: Optional[Dict] = Depends(verify_token)
 ):
-    """검색 결과 조회 API - 특정 검색 요청의 결과를 반환합니다 (페이징, 정렬, 필터 지원)"""
+    """검색 결과 조회 API - 특정 검색 요청의 결과를 반환합니다 (페이징, 정렬, 필터 지원)
+
+    sort_by: created_at_desc(기본), price_asc, price_desc, boosted_at_desc
+    min_price/max_price로 가격 범위를 지정하면 가격이 없는 상품은 제외됩니다.
+
+    fields(쉼표 구분, 예: title,price,thumbnail,snippet)를 지정하면 해당 필드만 채워 반환하며,
+    content가 없으면 상품 전체 설명을 읽지 않습니다.
+    """
+    selected_fields = parse_fields(fields)
+    validate_price_range(min_price, max_price)
     try:
+        crawl_scheduler.touch(search_request_id)
         logger.debug(f"검색 요청 ID {search_request_id}의 결과를 조회합니다. 페이지: {page}, 정렬: {sort_by}, 거래가능만: {only_available}, 카테고리: {category_id}, 지역필터: 시도={sido}, 시군구1={sigungu1}, 시군구2={sigungu2}, 동={dong}")
         
         # 페이지 번호와 사이즈 검증
@@ -651,23 +1137,42 @@ async def get_search_results(
             page_size = 20
             
         # 정렬 방식 검증
-        valid_sort_options = ["created_at_desc", "price_asc"]
+        valid_sort_options = ["created_at_desc", "price_asc", "price_desc", "boosted_at_desc"]
         if sort_by not in valid_sort_options:
             sort_by = "created_at_desc"
         
-        # DB에서 필터링된 결과 가져오기
-        result = await db_service.get_search_results(
-            search_request_id=search_request_id,
-            page=page,
-            page_size=page_size,
-            sort_by=sort_by,
-            only_available=only_available,
-            category_id=category_id,
-            sido=sido,
-            sigungu1=sigungu1,
-            sigungu2=sigungu2,
-            dong=dong
+        include_content = selected_fields is None or "content" in selected_fields
+        
+        # 결과 페이지 캐시 확인 (쿼리 버전이 그대로면 DB 조회 생략)
+        query = await get_cached_query(search_request_id)
+        
+        cache_key = (
+            search_request_id, page, page_size, sort_by, only_available,
+            tuple(sorted(category_id)) if category_id else None,
+            sido, sigungu1, sigungu2, dong, include_content, min_price, max_price
         )
+        result = result_cache.get(query, cache_key) if query is not None else None
+        
+        if result is None:
+            # DB에서 필터링된 결과 가져오기
+            result = await db_service.get_search_results(
+                search_request_id=search_request_id,
+                page=page,
+                page_size=page_size,
+                sort_by=sort_by,
+                only_available=only_available,
+                category_id=category_id,
+                sido=sido,
+                sigungu1=sigungu1,
+                sigungu2=sigungu2,
+                dong=dong,
+                include_content=include_content,
+                min_price=min_price,
+                max_price=max_price
+            )
+            # 조회 실패(빈 응답에 페이징 정보 없음)는 캐시하지 않음
+            if query is not None and "page" in result:
+                result_cache.put(query, cache_key, result)
         
         # 카테고리별 아이템 개수를 별도 필드로 추가
         category_counts = {}
@@ -679,26 +1184,7 @@ async def get_search_results(
         response = {
             "request_id": search_request_id,
             "results": [
-                SearchResultItem(
-                    title=item["title"],
-                    price=item["price"],
-                    link=item["link"],
-                    location=item["location"],
-                    content=item.get("content", ""),
-                    thumbnail=item.get("thumbnail", ""),
-                    created_at_origin=item.get("created_at_origin", ""),
-                    boosted_at=item.get("boosted_at", ""),
-                    nickname=item.get("nickname", ""),
-                    status=item.get("status", ""),
-                    category_id=item.get("category_id"),
-                    is_new=item.get("is_new", False),
-                    dong_id=item.get("dong_id"),
-                    place_title_original=item.get("place_title_original"),
-                    sido=item.get("sido"),
-                    sigungu1=item.get("sigungu1"),
-                    sigungu2=item.get("sigungu2"),
-                    dong=item.get("dong")
-                ) for item in result["items"]
+                to_search_result_item(item, selected_fields) for item in result["items"]
             ],
             "pagination": {
                 "current_page": result["page"],
@@ -738,160 +1224,32 @@ async def get_search_results(
 @router.get("/existing", response_model=List[SearchResultItem])
 async def get_existing_search_results(
     query: str,
+    fields: Optional[str] = None,
     user_data: Optional[Dict] = Depends(verify_token)
 ):
-    """기존 검색 결과 API - 쿼리에 맞는 기존 검색 결과가 있으면 즉시 반환합니다"""
+    """기존 검색 결과 API - 쿼리에 맞는 기존 검색 결과가 있으면 즉시 반환합니다
+
+    fields(쉼표 구분)를 지정하면 해당 필드만 채워 반환합니다 (/results와 동일).
+    """
+    selected_fields = parse_fields(fields)
     logger.info(f"기존 검색 결과 요청: {query}")
     logger.info(f"사용자 인증 정보: {user_data}")
     
     try:
-        # 사용자 ID 가져오기
-        user_id = user_data.get("id") if user_data else None
-        
-        # 로그인 여부와 무관하게 계속 진행 (테스트를 위해 인증 검사 제거)
-        # if not user_id:
-        #     logger.info("로그인하지 않은 사용자의 기존 검색 결과 요청입니다.")
-        #     return []
-        
-        logger.info(f"query='{query}' 검색 결과 처리 시작")
-        
         # 최근 검색어 클릭 시 자동으로 새 검색 요청 생성하지 않음
         # 프론트엔드에서 별도로 요청할 때만 새 검색 생성
         
-        # 방법 1: 사용자의 최근 검색에서 찾기 (로그인한 경우만)
-        if user_id:
-            logger.info(f"사용자({user_id})의 최근 검색 이력에서 '{query}' 검색 시도")
-            recent_searches = await db_service.get_recent_searches(user_id=user_id, limit=5)
-            matching_searches = [s for s in recent_searches if s["query"].lower() == query.lower()]
-            
-            if matching_searches:
-                # 사용자의 검색 이력에서 찾은 경우
-                latest_search = matching_searches[0]
-                search_id = latest_search["id"]
-                logger.info(f"사용자 검색 이력에서 일치하는 ID 찾음: {search_id}")
-                
-                results = await db_service.get_search_results(
-                    search_request_id=search_id,
-                    page=1,
-                    page_size=100,
-                    sort_by="created_at_desc",
-                    only_available=False
-                )
-                
-                if results['items']:
-                    logger.info(f"사용자 자신의 검색 이력에서 {len(results['items'])}개 결과를 찾았습니다.")
-                    logger.debug(f"첫 번째 결과 샘플: {results['items'][0] if results['items'] else '없음'}")
-                    # 결과 변환 및 반환
-                    response_items = [
-                        SearchResultItem(
-                            title=item["title"],
-                            price=item["price"],
-                            link=item["link"],
-                            location=item["location"],
-                            content=item.get("content", ""),
-                            thumbnail=item.get("thumbnail", ""),
-                            created_at_origin=item.get("created_at_origin", ""),
-                            boosted_at=item.get("boosted_at", ""),
-                            nickname=item.get("nickname", ""),
-                            status=item.get("status", ""),
-                            category_id=item.get("category_id"),
-                            is_new=item.get("is_new", False),
-                            dong_id=item.get("dong_id"),
-                            place_title_original=item.get("place_title_original"),
-                            sido=item.get("sido"),
-                            sigungu1=item.get("sigungu1"),
-                            sigungu2=item.get("sigungu2"),
-                            dong=item.get("dong")
-                        ) for item in results['items']
-                    ]
-                    logger.info(f"방법 1 성공: 사용자 이력에서 {len(response_items)}개 결과 반환")
-                    return response_items
-                else:
-                    logger.info(f"사용자 이력에서 검색 ID는 찾았으나 결과 항목이 없음")
-        
-        # 방법 2: DB에 직접 쿼리로 검색 결과 찾기
-        logger.info(f"DB에서 직접 검색 결과 조회 시도: '{query}'")
-        direct_results = await db_service.get_search_results_by_query(query)
+        # 검색어별 최신 크롤링 결과 첫 페이지 (누가 검색했는지와 무관하게 한 번의 조회)
+        items = await db_service.get_latest_first_page(query)
+        if not items:
+            logger.info(f"쿼리 '{query}'에 대한 기존 검색 결과가 없습니다")
+            return []
         
-        if direct_results and len(direct_results) > 0:
-            logger.info(f"DB에서 직접 쿼리로 {len(direct_results)}개 결과를 찾았습니다.")
-            logger.debug(f"첫 번째 결과 샘플: {direct_results[0] if direct_results else '없음'}")
-            
-            # 결과 변환 및 반환
-            response_items = [
-                SearchResultItem(
-                    title=item["title"],
-                    price=item["price"],
-                    link=item["link"],
-                    location=item["location"],
-                    content=item.get("content", ""),
-                    thumbnail=item.get("thumbnail", ""),
-                    created_at_origin=item.get("created_at_origin", ""),
-                    boosted_at=item.get("boosted_at", ""),
-                    nickname=item.get("nickname", ""),
-                    status=item.get("status", ""),
-                    category_id=item.get("category_id"),
-                    is_new=item.get("is_new", False),
-                    dong_id=item.get("dong_id"),
-                    place_title_original=item.get("place_title_original"),
-                    sido=item.get("sido"),
-                    sigungu1=item.get("sigungu1"),
-                    sigungu2=item.get("sigungu2"),
-                    dong=item.get("dong")
-                ) for item in direct_results
-            ]
-            logger.info(f"방법 2 성공: DB에서 직접 쿼리로 {len(response_items)}개 결과 반환")
-            return response_items
-            
-        # 방법 3: 전체 검색 요청에서 동일한 쿼리 찾기 (이전 방법)
-        logger.info(f"다른 사용자의 검색 요청에서 '{query}' 검색 시도")
-        latest_request = await db_service.get_latest_search_request_by_query(query)
-        
-        if latest_request:
-            search_id = latest_request["id"]
-            logger.info(f"다른 사용자의 검색 이력에서 일치하는 ID 찾음: {search_id}")
-            
-            # 검색 결과 직접 조회
-            results = await db_service.get_search_results(
-                search_request_id=search_id,
-                page=1,
-                page_size=100,
-                sort_by="created_at_desc",
-                only_available=False
-            )
-            
-            if results['items']:
-                logger.info(f"다른 사용자의 검색 이력에서 {len(results['items'])}개 결과를 찾았습니다.")
-                logger.debug(f"첫 번째 결과 샘플: {results['items'][0] if results['items'] else '없음'}")
-                # 결과 변환 및 반환
-                response_items = [
-                    SearchResultItem(
-                        title=item["title"],
-                        price=item["price"],
-                        link=item["link"],
-                        location=item["location"],
-                        content=item.get("content", ""),
-                        thumbnail=item.get("thumbnail", ""),
-                        created_at_origin=item.get("created_at_origin", ""),
-                        boosted_at=item.get("boosted_at", ""),
-                        nickname=item.get("nickname", ""),
-                        status=item.get("status", ""),
-                        category_id=item.get("category_id"),
-                        is_new=item.get("is_new", False),
-                        dong_id=item.get("dong_id"),
-                        place_title_original=item.get("place_title_original"),
-                        sido=item.get("sido"),
-                        sigungu1=item.get("sigungu1"),
-                        sigungu2=item.get("sigungu2"),
-                        dong=item.get("dong")
-                    ) for item in results['items']
-                ]
-                logger.info(f"방법 3 성공: 다른 사용자 이력에서 {len(response_items)}개 결과 반환")
-                return response_items
-        
-        # 검색 결과가 없는 경우
-        logger.info(f"쿼리 '{query}'에 대한 기존 검색 결과가 없습니다 (모든 방법 실패)")
-        return []
+        response_items = [
+            to_search_result_item(item, selected_fields) for item in items
+        ]
+        logger.info(f"쿼리 '{query}'의 기존 검색 결과 {len(response_items)}개 반환")
+        return response_items
     except Exception as e:
         logger.error(f"기존 검색 결과 조회 중 오류 발생: {str(e)}")
         # 스택 트레이스도 로깅
@@ -952,7 +1310,7 @@ async def check_active_search(
             # 검색이 이미 완료되었는지 확인
             if search_id:
                 status = await db_service.get_search_process_status(search_id)
-                if status["total"] > 0 and status["completed"] == status["total"]:
+                if is_search_finished(status):
                     # 검색이 완료된 경우 active_searches에서 제거
                     logger.info(f"쿼리 '{normalized_query}'의 검색이 완료되었으므로 활성 목록에서 제거합니다. (검색 ID: {search_id})")
                     del active_searches[normalized_query]
@@ -969,11 +1327,14 @@ async def check_active_search(
 @router.get("/", response_model=List[SearchResultItem])
 async def search_products_get(
     q: str,
+    max_seconds: Optional[float] = Query(None, gt=0),
+    max_unique_items: Optional[int] = Query(None, gt=0),
+    crawl_mode: Literal["full", "coverage", "drilldown"] = "full",
     user_data: Optional[Dict] = Depends(verify_token)
 ):
     """URL 파라미터로 상품 검색 API - 당근마켓에서 상품을 검색합니다 (GET 요청용)"""
     # POST 엔드포인트와 동일한 로직을 사용하기 위해 검색 요청 객체 생성
-    search_request = SearchRequest(query=q)
+    search_request = SearchRequest(query=q, max_seconds=max_seconds, max_unique_items=max_unique_items, crawl_mode=crawl_mode)
     
     # 백그라운드 태스크를 위한 가짜 객체 (사용되지 않음)
     class DummyBackgroundTasks:
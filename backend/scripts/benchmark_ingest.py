@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+검색 결과 저장(save_search_results) 벤치마크
+
+같은 항목을 여러 번 재수집하는 상황을 재현하여, 라운드마다 소요 시간과
+search_results 테이블의 UPDATE 행 수, 생성된 WAL 크기를 출력합니다.
+첫 라운드는 신규 저장, 이후 라운드는 CHANGE_RATIO 비율의 항목만 내용이 바뀝니다.
+
+사용법: python scripts/benchmark_ingest.py [항목 수] [라운드 수] [변경 비율]
+"""
+import asyncio
+import os
+import sys
+import time
+import uuid
+import random
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.db_service import DBService, QueryItem, QueryLatestResult, SearchQuery, SearchResult, SessionLocal
+
+# 환경 변수 로드
+load_dotenv()
+
+BENCH_QUERY = "__benchmark_ingest__"
+
+
+def make_items(count: int, change_ratio: float, round_no: int):
+    """벤치마크용 검색 결과 항목 생성 (change_ratio 비율만 가격/상태가 라운드마다 바뀜)"""
+    items = []
+    for i in range(count):
+        changed = round_no > 0 and random.random() < change_ratio
+        items.append({
+            "title": f"벤치마크 상품 {i}",
+            "link": f"https://www.daangn.com/kr/buy-sell/benchmark-{i}",
+            "price": 10000 + i + (round_no if changed else 0),
+            "thumbnail": f"https://example.com/thumb/{i}.jpg",
+            "location": "벤치마크동",
+            "dong_id": "1",
+            "status": "Ongoing",
+            "content": f"벤치마크용 상품 설명 {i}",
+            "nickname": "bench",
+            "nickname_id": "0",
+            "category": None,
+            "created_at_origin": "2024-01-01T00:00:00+09:00",
+            "boosted_at": "",
+        })
+    return items
+
+
+def table_stats():
+    """search_results UPDATE 누적 행 수와 현재 WAL 위치"""
+    session = SessionLocal()
+    try:
+        n_tup_upd = session.execute(text(
+            "SELECT n_tup_upd FROM pg_stat_user_tables WHERE relname = 'search_results'"
+        )).scalar() or 0
+        wal_lsn = session.execute(text("SELECT pg_current_wal_lsn()")).scalar()
+        return n_tup_upd, wal_lsn
+    finally:
+        session.close()
+
+
+def wal_bytes(start_lsn, end_lsn) -> int:
+    session = SessionLocal()
+    try:
+        return int(session.execute(
+            text("SELECT pg_wal_lsn_diff(:end_lsn, :start_lsn)"),
+            {"end_lsn": end_lsn, "start_lsn": start_lsn}
+        ).scalar() or 0)
+    finally:
+        session.close()
+
+
+def cleanup():
+    session = SessionLocal()
+    try:
+        # 관계 행 -> 상품 -> 검색어 사전 순으로 삭제 (query_items/query_latest_results가 search_queries를 참조)
+        query_ids = session.query(SearchQuery.id).filter(SearchQuery.query == DBService.normalize_query(BENCH_QUERY))
+        session.query(QueryItem).filter(QueryItem.query_id.in_(query_ids.scalar_subquery())).delete(synchronize_session=False)
+        session.query(QueryLatestResult).filter(QueryLatestResult.query_id.in_(query_ids.scalar_subquery())).delete(synchronize_session=False)
+        session.query(SearchResult).filter(SearchResult.query == BENCH_QUERY).delete(synchronize_session=False)
+        session.query(SearchQuery).filter(SearchQuery.query == DBService.normalize_query(BENCH_QUERY)).delete(synchronize_session=False)
+        session.commit()
+    finally:
+        session.close()
+
+
+async def run_benchmark(count: int = 1000, rounds: int = 5, change_ratio: float = 0.05):
+    db_service = DBService()
+    search_request_id = str(uuid.uuid4())
+
+    print(f"항목 {count}개, {rounds}라운드, 변경 비율 {change_ratio:.0%}")
+    print(f"{'라운드':>6} {'소요(초)':>10} {'UPDATE 행':>10} {'WAL(KB)':>10}")
+
+    cleanup()
+    try:
+        for round_no in range(rounds):
+            items = make_items(count, change_ratio, round_no)
+            # pg_stat 통계는 비동기로 반영되므로 라운드 사이에 잠시 대기
+            time.sleep(0.5)
+            start_upd, start_lsn = table_stats()
+
+            started = time.time()
+            await db_service.save_search_results(search_request_id, items, BENCH_QUERY)
+            elapsed = time.time() - started
+
+            time.sleep(0.5)
+            end_upd, end_lsn = table_stats()
+            print(f"{round_no:>6} {elapsed:>10.3f} {end_upd - start_upd:>10} {wal_bytes(start_lsn, end_lsn) / 1024:>10.1f}")
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    change_ratio = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    asyncio.run(run_benchmark(count, rounds, change_ratio))
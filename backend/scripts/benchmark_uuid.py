@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+기본 키 UUID 생성 방식 벤치마크 (uuid4 vs uuid7)
+
+임시 테이블 두 개에 같은 수의 행을 배치 단위로 삽입하고, 삽입 처리량과
+기본 키 인덱스 크기를 비교합니다. 임시 테이블은 세션 종료 시 삭제됩니다.
+
+사용법: python scripts/benchmark_uuid.py [행 수] [배치 크기]
+"""
+import os
+import sys
+import time
+import uuid
+
+from dotenv import load_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.db_service import engine, uuid7
+
+# 환경 변수 로드
+load_dotenv()
+
+GENERATORS = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
+
+def run_benchmark(rows: int = 200000, batch_size: int = 1000):
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        print(f"행 {rows}개, 배치 {batch_size}개")
+        print(f"{'방식':>6} {'소요(초)':>10} {'행/초':>10} {'PK 인덱스(MB)':>14} {'테이블(MB)':>12}")
+
+        for name, generate in GENERATORS.items():
+            table = f"bench_{name}"
+            cursor.execute(f"CREATE TEMP TABLE {table} (id UUID PRIMARY KEY, payload TEXT)")
+            connection.commit()
+
+            started = time.time()
+            for offset in range(0, rows, batch_size):
+                batch = [(str(generate()), f"row {offset + i}") for i in range(min(batch_size, rows - offset))]
+                cursor.executemany(f"INSERT INTO {table} (id, payload) VALUES (%s, %s)", batch)
+                connection.commit()
+            elapsed = time.time() - started
+
+            cursor.execute(f"SELECT pg_relation_size('{table}_pkey'), pg_relation_size('{table}')")
+            index_size, table_size = cursor.fetchone()
+            print(f"{name:>6} {elapsed:>10.2f} {rows / elapsed:>10.0f} {index_size / 1024 / 1024:>14.2f} {table_size / 1024 / 1024:>12.2f}")
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    run_benchmark(rows, batch_size)
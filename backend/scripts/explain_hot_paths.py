@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+조회 경로 인덱스 사용 확인 스크립트 (EXPLAIN 회귀 검사)
+
+합성 데이터를 DB에 넣은 뒤 get_search_results, get_search_process_status,
+get_recent_searches를 실제로 호출하고, 이때 실행된 SELECT 문을 EXPLAIN 하여
+핫 테이블(search_results, search_process, search_requests, query_items)에
+Seq Scan이 있거나, 정렬 페이지 경로에서 query_items 스캔 위에 Sort 노드가 있으면
+(정렬 인덱스의 방향이 ORDER BY와 맞지 않음) 실패로 보고합니다. 합성 데이터는 마지막에 삭제됩니다.
+
+사용법: python scripts/explain_hot_paths.py [상품 수] [쿼리 수]
+"""
+import asyncio
+import os
+import re
+import sys
+import uuid
+
+from dotenv import load_dotenv
+from sqlalchemy import event, text
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.db_service import DBService, SessionLocal, engine
+
+# 환경 변수 로드
+load_dotenv()
+
+SEED_PREFIX = "__explain__"
+HOT_TABLES = ("search_results", "search_process", "search_requests", "query_items")
+SEQ_SCAN_PATTERN = re.compile(r"Seq Scan on (%s)\b" % "|".join(HOT_TABLES))
+SORT_NODE_PATTERN = re.compile(r"^(\s*)(?:->\s*)?(?:Incremental )?Sort\b")
+# query_items 정렬 인덱스만으로 순서대로 읽어야 하는 경로 (지역 필터 경로는 지역 인덱스 + 정렬이 더 싸서 제외)
+ORDERED_PATHS = (
+    "get_search_results",
+    "get_search_results(price_desc, budget)",
+    "get_search_results(boosted_at_desc)",
+    "get_search_result_changes",
+)
+
+
+def seed(user_id: str, items: int, queries: int, requests_per_query: int = 20, processes_per_request: int = 50):
+    """합성 검색 요청/프로세스/결과 데이터 생성"""
+    session = SessionLocal()
+    params = {"prefix": SEED_PREFIX, "uid": user_id, "items": items, "queries": queries,
+              "rpq": requests_per_query, "ppr": processes_per_request}
+    try:
+        session.execute(text(
+            "INSERT INTO users (id, username, password, created_at) "
+            "VALUES (:uid, :prefix || :uid, 'x', NOW())"
+        ), params)
+        session.execute(text(
+            "INSERT INTO search_queries (query, created_at) "
+            "SELECT :prefix || g, NOW() FROM generate_series(1, :queries) g"
+        ), params)
+        session.execute(text("""
+            INSERT INTO search_results (id, query, title, link, price, status, created_at_origin, created_at,
+                                        dong_id, sido, sigungu1)
+            SELECT md5(:prefix || g)::uuid, :prefix || (g % :queries + 1), '상품 ' || g,
+                   'https://bench/' || :prefix || g, (g * 37) % 1000000, 'Ongoing',
+                   NOW() - (g || ' minutes')::interval, NOW(), g % 5000,
+                   (ARRAY['서울특별시', '경기도', '부산광역시'])[g % 3 + 1], '시군구' || (g % 25)
+            FROM generate_series(1, :items) g
+        """), params)
+        session.execute(text("""
+            INSERT INTO query_items (query_id, item_id, first_seen_at, last_seen_at, sido, sigungu1,
+                                     price, created_at_origin, boosted_at)
+            SELECT q.id, r.id, NOW(), NOW(), r.sido, r.sigungu1, r.price, r.created_at_origin, r.boosted_at
+            FROM search_results r JOIN search_queries q ON q.query = r.query
+            WHERE r.link LIKE 'https://bench/' || :prefix || '%'
+        """), params)
+        session.execute(text("""
+            INSERT INTO search_requests (id, user_id, query, location, created_at, is_crawled)
+            SELECT md5(:prefix || 'request' || g)::uuid, :uid, :prefix || (g % :queries + 1), 'multiple',
+                   NOW() - (g || ' minutes')::interval, TRUE
+            FROM generate_series(1, :queries * :rpq) g
+        """), params)
+        session.execute(text("""
+            INSERT INTO search_process (search_request_id, query, param, is_completed, items_count, created_at, updated_at)
+            SELECT r.id, r.query, 'param-' || g, g % 2 = 0, g % 30, NOW(), NOW()
+            FROM search_requests r CROSS JOIN generate_series(1, :ppr) g
+            WHERE r.user_id = :uid
+        """), params)
+        session.commit()
+
+        for table in HOT_TABLES:
+            session.execute(text(f"ANALYZE {table}"))
+        session.commit()
+
+        return str(session.execute(text(
+            "SELECT id FROM search_requests WHERE query = :prefix || '1' ORDER BY created_at DESC LIMIT 1"
+        ), params).scalar())
+    finally:
+        session.close()
+
+
+def cleanup(user_id: str):
+    session = SessionLocal()
+    params = {"prefix": SEED_PREFIX, "uid": user_id}
+    try:
+        session.execute(text(
+            "DELETE FROM search_process WHERE search_request_id IN (SELECT id FROM search_requests WHERE user_id = :uid)"
+        ), params)
+        session.execute(text("DELETE FROM search_requests WHERE user_id = :uid"), params)
+        session.execute(text("DELETE FROM search_results WHERE link LIKE 'https://bench/' || :prefix || '%'"), params)
+        session.execute(text(
+            "DELETE FROM query_items WHERE query_id IN (SELECT id FROM search_queries WHERE query LIKE :prefix || '%')"
+        ), params)
+        session.execute(text("DELETE FROM search_queries WHERE query LIKE :prefix || '%'"), params)
+        session.execute(text("DELETE FROM users WHERE id = :uid"), params)
+        session.commit()
+    finally:
+        session.close()
+
+
+def sorts_above_query_items(plan: str) -> int:
+    """query_items 스캔을 하위 노드로 가진 Sort 노드 수"""
+    lines = plan.split("\n")
+    count = 0
+    for index, line in enumerate(lines):
+        match = SORT_NODE_PATTERN.match(line)
+        if not match:
+            continue
+        depth = len(match.group(1))
+        for child in lines[index + 1:]:
+            if child.strip().startswith("->") and len(child) - len(child.lstrip()) <= depth:
+                break
+            if " on query_items" in child:
+                count += 1
+                break
+    return count
+
+
+def explain(statement: str, parameters) -> str:
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("EXPLAIN " + statement, parameters)
+        return "\n".join(row[0] for row in cursor.fetchall())
+    finally:
+        connection.close()
+
+
+async def capture_statements(search_request_id: str, user_id: str):
+    """핫 경로 함수를 호출하면서 실행된 SELECT 문을 수집합니다"""
+    db_service = DBService()
+    captured = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and any(table in statement for table in HOT_TABLES):
+            captured.append((current_path, statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        current_path = "get_search_results"
+        await db_service.get_search_results(search_request_id, page=1, page_size=20)
+        current_path = "get_search_results(price_asc, region)"
+        await db_service.get_search_results(search_request_id, page=2, page_size=20, sort_by="price_asc",
+                                            sido="서울특별시", sigungu1="시군구3")
+        current_path = "get_search_results(price_desc, budget)"
+        await db_service.get_search_results(search_request_id, page=1, page_size=20, sort_by="price_desc",
+                                            min_price=100000, max_price=200000)
+        current_path = "get_search_results(boosted_at_desc)"
+        await db_service.get_search_results(search_request_id, page=1, page_size=20, sort_by="boosted_at_desc")
+        current_path = "get_search_result_changes"
+        await db_service.get_search_result_changes(search_request_id, since="2000-01-01T00:00:00Z", limit=50)
+        current_path = "get_search_process_status"
+        await db_service.get_search_process_status(search_request_id)
+        current_path = "get_recent_searches"
+        await db_service.get_recent_searches(user_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return captured
+
+
+def main(items: int = 50000, queries: int = 20) -> int:
+    user_id = str(uuid.uuid4())
+    print(f"합성 데이터 생성: 상품 {items}개, 쿼리 {queries}개")
+    try:
+        search_request_id = seed(user_id, items, queries)
+        captured = asyncio.run(capture_statements(search_request_id, user_id))
+
+        failures = 0
+        for path, statement, parameters in captured:
+            plan = explain(statement, parameters)
+            seq_scans = sorted(set(SEQ_SCAN_PATTERN.findall(plan)))
+            sorts = sorts_above_query_items(plan) if path in ORDERED_PATHS else 0
+            failed = bool(seq_scans or sorts)
+            status = "FAIL" if failed else "OK"
+            failures += failed
+            first_line = " ".join(statement.split())[:100]
+            print(f"[{status}] {path}: {first_line}...")
+            if seq_scans:
+                print(f"       Seq Scan: {', '.join(seq_scans)}")
+            if sorts:
+                print(f"       query_items 스캔 위 Sort 노드: {sorts}개")
+            if failed:
+                print("       " + plan.replace("\n", "\n       "))
+
+        print(f"\n총 {len(captured)}개 문장 중 {failures}개에서 핫 테이블 Seq Scan 또는 query_items 정렬 발견")
+        return 1 if failures else 0
+    finally:
+        cleanup(user_id)
+
+
+if __name__ == "__main__":
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    sys.exit(main(items, queries))
@@ -0,0 +1,268 @@
+import os
+import time
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 인기 쿼리의 결과를 메모리 열 저장소로 조회할지 여부 (NumPy 필요)
+COLUMNAR_STORE_ENABLED = os.getenv("COLUMNAR_STORE_ENABLED", "false").lower() == "true"
+# 메모리에 유지할 최대 쿼리 수
+COLUMNAR_MAX_QUERIES = int(os.getenv("COLUMNAR_MAX_QUERIES", "32"))
+# 스냅샷을 DB에서 다시 읽어오는 주기(초) - 다른 프로세스에서 저장된 변경 반영
+COLUMNAR_SNAPSHOT_TTL = float(os.getenv("COLUMNAR_SNAPSHOT_TTL", "600"))
+
+# 열 저장소 행 형식: (id, price, created_at_origin, boosted_at, category_id, is_ongoing, dong_id, sido, sigungu1, sigungu2, dong)
+ColumnarRow = Tuple
+REGION_COLUMNS = ("sido", "sigungu1", "sigungu2", "dong")
+
+# created_at_origin이 없는 행은 최신순 정렬에서 맨 앞 (PostgreSQL DESC의 NULLS FIRST와 동일)
+_NULL_CREATED = 2 ** 62
+# boosted_at이 없는 행은 끌어올림순 정렬에서 맨 뒤 (DESC NULLS LAST)
+_NULL_BOOSTED = -(2 ** 62)
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _to_seconds(value: Optional[datetime], null_value: int = _NULL_CREATED) -> int:
+    # DB에서 읽은 값은 UTC 기준(시간대 없음), 저장 직후의 값은 시간대 포함이므로 UTC로 맞춰 비교
+    if value is None:
+        return null_value
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return int((value - _EPOCH).total_seconds())
+
+
+class ColumnarSnapshot:
+    """검색어 하나의 결과를 열 단위 NumPy 배열로 보관합니다
+
+    필터/정렬/페이징/개수는 배열 연산으로 계산하고, 반환할 페이지의 행 ID만 돌려줍니다.
+    지역 문자열은 쿼리별 사전(codes)의 정수 코드로 저장합니다.
+    """
+
+    def __init__(self, rows: Iterable[ColumnarRow] = ()):
+        self.ids: List = []
+        self.index: Dict = {}  # 행 ID -> 배열 위치
+        self.codes: Dict[Optional[str], int] = {None: 0}
+        self.size = 0
+        self.loaded_at = time.time()
+        self._allocate(1024)
+        self.upsert(rows)
+
+    def _allocate(self, capacity: int):
+        def grow(old, dtype, fill):
+            new = np.full(capacity, fill, dtype=dtype)
+            if old is not None:
+                new[:self.size] = old[:self.size]
+            return new
+
+        self.price = grow(getattr(self, "price", None), np.float64, np.nan)
+        self.created = grow(getattr(self, "created", None), np.int64, _NULL_CREATED)
+        self.boosted = grow(getattr(self, "boosted", None), np.int64, _NULL_BOOSTED)
+        self.category = grow(getattr(self, "category", None), np.int32, -1)
+        self.ongoing = grow(getattr(self, "ongoing", None), np.bool_, False)
+        self.dong_id = grow(getattr(self, "dong_id", None), np.int64, -1)
+        self.regions = {
+            column: grow(getattr(self, "regions", {}).get(column), np.int32, 0)
+            for column in REGION_COLUMNS
+        }
+        self.capacity = capacity
+
+    def _code(self, value: Optional[str]) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.codes)
+        return code
+
+    def upsert(self, rows: Iterable[ColumnarRow]):
+        """행을 추가하거나 같은 ID의 기존 행을 덮어씁니다"""
+        for row_id, price, created_at_origin, boosted_at, category_id, is_ongoing, dong_id, *regions in rows:
+            position = self.index.get(row_id)
+            if position is None:
+                if self.size == self.capacity:
+                    self._allocate(self.capacity * 2)
+                position = self.size
+                self.index[row_id] = position
+                self.ids.append(row_id)
+                self.size += 1
+
+            self.price[position] = np.nan if price is None else price
+            self.created[position] = _to_seconds(created_at_origin)
+            self.boosted[position] = _to_seconds(boosted_at, _NULL_BOOSTED)
+            self.category[position] = -1 if category_id is None else category_id
+            self.ongoing[position] = bool(is_ongoing)
+            self.dong_id[position] = -1 if dong_id is None else dong_id
+            for column, value in zip(REGION_COLUMNS, regions):
+                self.regions[column][position] = self._code(value)
+
+    def _mask(self,
+              only_available: bool = False,
+              category_ids: Optional[List[int]] = None,
+              min_price: Optional[float] = None,
+              max_price: Optional[float] = None,
+              **region_filters: Optional[str]):
+        """필터를 만족하는 행의 불리언 마스크 (없는 지역 값이면 None)"""
+        n = self.size
+        mask = np.ones(n, dtype=np.bool_)
+        if only_available:
+            mask &= self.ongoing[:n]
+        if category_ids:
+            mask &= np.isin(self.category[:n], category_ids)
+        # NaN(가격 없음)은 비교 결과가 False이므로 가격 범위를 지정하면 제외됨 (SQL과 동일)
+        if min_price is not None:
+            mask &= self.price[:n] >= min_price
+        if max_price is not None:
+            mask &= self.price[:n] <= max_price
+        for column, value in region_filters.items():
+            if value:
+                code = self.codes.get(value)
+                if code is None:
+                    return None
+                mask &= self.regions[column][:n] == code
+        return mask
+
+    def select(self,
+               sort_by: str = "created_at_desc",
+               offset: int = 0,
+               limit: int = 20,
+               only_available: bool = False,
+               category_ids: Optional[List[int]] = None,
+               min_price: Optional[float] = None,
+               max_price: Optional[float] = None,
+               **region_filters: Optional[str]) -> Tuple[int, List]:
+        """필터를 적용한 전체 개수와 요청한 페이지의 행 ID 목록을 반환합니다"""
+        mask = self._mask(only_available, category_ids, min_price, max_price, **region_filters)
+        if mask is None:
+            return 0, []
+
+        rows = np.flatnonzero(mask)
+        total = len(rows)
+        if offset >= total:
+            return total, []
+
+        newest_first = -self.created[rows]
+        if sort_by == "price_asc":
+            # lexsort는 마지막 키가 1차 정렬 기준 (가격 오름차순, NaN은 뒤, 같으면 최신순)
+            order = np.lexsort((newest_first, self.price[rows]))
+        elif sort_by == "price_desc":
+            # 가격 내림차순 (NaN은 부호를 바꿔도 뒤에 남음)
+            order = np.lexsort((newest_first, -self.price[rows]))
+        elif sort_by == "boosted_at_desc":
+            order = np.lexsort((newest_first, -self.boosted[rows]))
+        else:
+            order = np.argsort(newest_first, kind="stable")
+
+        page_rows = rows[order[offset:offset + limit]]
+        return total, [self.ids[position] for position in page_rows]
+
+    def region_counts(self, only_available: bool = False,
+                      category_ids: Optional[List[int]] = None,
+                      min_price: Optional[float] = None,
+                      max_price: Optional[float] = None) -> List[Tuple[Tuple[Optional[str], ...], int]]:
+        """(sido, sigungu1, sigungu2, dong) 조합별 개수를 반환합니다 (지역 외 필터만 적용)"""
+        mask = self._mask(only_available, category_ids, min_price, max_price)
+        if not mask.any():
+            return []
+
+        keys = np.stack([self.regions[column][:self.size][mask] for column in REGION_COLUMNS], axis=1)
+        groups, counts = np.unique(keys, axis=0, return_counts=True)
+        names = {code: value for value, code in self.codes.items()}
+        return [
+            (tuple(names[int(code)] for code in group), int(count))
+            for group, count in zip(groups, counts)
+        ]
+
+    def prices(self,
+               only_available: bool = False,
+               category_ids: Optional[List[int]] = None,
+               **region_filters: Optional[str]):
+        """필터를 만족하는 행의 가격 배열 (가격 없는 행 제외)"""
+        mask = self._mask(only_available, category_ids, **region_filters)
+        if mask is None:
+            return np.empty(0, dtype=np.float64)
+        prices = self.price[:self.size][mask]
+        return prices[~np.isnan(prices)]
+
+    def category_counts(self) -> Dict[int, int]:
+        """필터와 무관한 카테고리별 전체 개수"""
+        categories = self.category[:self.size]
+        values, counts = np.unique(categories[categories >= 0], return_counts=True)
+        return {int(value): int(count) for value, count in zip(values, counts)}
+
+    def nbytes(self) -> int:
+        arrays = [self.price, self.created, self.boosted, self.category, self.ongoing, self.dong_id, *self.regions.values()]
+        return sum(array.nbytes for array in arrays)
+
+
+class ColumnarStore:
+    """쿼리 ID별 열 스냅샷 LRU (프로세스 내)
+
+    스냅샷은 첫 조회 시 DB에서 만들어지고, 이후 저장(ingest)된 행은 upsert로 반영됩니다.
+    """
+
+    def __init__(self, max_queries: int = COLUMNAR_MAX_QUERIES, ttl: float = COLUMNAR_SNAPSHOT_TTL):
+        self.max_queries = max_queries
+        self.ttl = ttl
+        self.snapshots: "OrderedDict[int, ColumnarSnapshot]" = OrderedDict()
+        self.hits = 0
+        self.loads = 0
+        if COLUMNAR_STORE_ENABLED and np is None:
+            logger.warning("COLUMNAR_STORE_ENABLED가 설정되었지만 numpy가 없어 열 저장소를 사용하지 않습니다.")
+
+    @property
+    def enabled(self) -> bool:
+        return COLUMNAR_STORE_ENABLED and np is not None and self.max_queries > 0
+
+    def get(self, query_id: int) -> Optional[ColumnarSnapshot]:
+        snapshot = self.snapshots.get(query_id)
+        if snapshot is None:
+            return None
+        if time.time() - snapshot.loaded_at > self.ttl:
+            del self.snapshots[query_id]
+            return None
+        self.snapshots.move_to_end(query_id)
+        self.hits += 1
+        return snapshot
+
+    def has(self, query_id: int) -> bool:
+        """스냅샷이 메모리에 있는지 확인합니다 (LRU 순서/조회 수/만료를 건드리지 않음)"""
+        return query_id in self.snapshots
+
+    def load(self, query_id: int, rows: Iterable[ColumnarRow]) -> ColumnarSnapshot:
+        """DB에서 읽은 행으로 스냅샷을 만들어 등록합니다"""
+        snapshot = ColumnarSnapshot(rows)
+        self.snapshots[query_id] = snapshot
+        self.snapshots.move_to_end(query_id)
+        while len(self.snapshots) > self.max_queries:
+            self.snapshots.popitem(last=False)
+        self.loads += 1
+        logger.info(f"쿼리 ID {query_id} 열 스냅샷 생성: {snapshot.size}개 행, {snapshot.nbytes() // 1024}KB")
+        return snapshot
+
+    def upsert(self, query_id: int, rows: List[ColumnarRow]):
+        """저장된 행을 이미 메모리에 있는 스냅샷에만 반영합니다"""
+        snapshot = self.snapshots.get(query_id)
+        if snapshot is not None and rows:
+            snapshot.upsert(rows)
+
+    def get_stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "queries": len(self.snapshots),
+            "max_queries": self.max_queries,
+            "rows": sum(snapshot.size for snapshot in self.snapshots.values()),
+            "bytes": sum(snapshot.nbytes() for snapshot in self.snapshots.values()),
+            "hits": self.hits,
+            "loads": self.loads,
+        }
+
+
+# 전역 열 저장소
+columnar_store = ColumnarStore()
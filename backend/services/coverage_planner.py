@@ -0,0 +1,111 @@
+import os
+import heapq
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from services.db_service import DBService
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 커버 집합을 다시 계산하는 주기(초)
+COVERAGE_REFRESH_INTERVAL = int(os.getenv("COVERAGE_REFRESH_INTERVAL", "3600"))
+# 커버리지 계산에 사용할 관측 기간(일)
+COVERAGE_WINDOW_DAYS = int(os.getenv("COVERAGE_WINDOW_DAYS", "30"))
+
+
+def greedy_set_cover(coverage: Dict[int, set]) -> List[int]:
+    """관측된 모든 동을 덮는 지역 집합을 탐욕적으로 계산합니다 (lazy greedy)
+
+    매 단계에서 아직 덮이지 않은 동을 가장 많이 덮는 지역을 고릅니다.
+    이득은 단계가 진행될수록 줄어들기만 하므로, 힙에 저장된 이전 이득을 상한으로 사용해
+    실제로 맨 위에 올라온 지역만 다시 계산합니다.
+    """
+    uncovered = set()
+    for dong_ids in coverage.values():
+        uncovered |= dong_ids
+
+    heap = [(-len(dong_ids), place_id) for place_id, dong_ids in coverage.items() if dong_ids]
+    heapq.heapify(heap)
+
+    selected = []
+    while uncovered and heap:
+        _, place_id = heapq.heappop(heap)
+        gain = coverage[place_id] & uncovered
+        if not gain:
+            continue
+
+        # 다시 계산한 이득이 다음 후보의 (상한) 이득보다 작으면 힙에 되돌려 놓음
+        if heap and len(gain) < -heap[0][0]:
+            heapq.heappush(heap, (-len(gain), place_id))
+            continue
+
+        selected.append(place_id)
+        uncovered -= gain
+
+    return selected
+
+
+class CoveragePlanner:
+    """관측된 지역-동 겹침을 바탕으로 전체 동을 덮는 최소에 가까운 지역 집합을 계획합니다"""
+
+    def __init__(self, db_service: Optional[DBService] = None):
+        self.db_service = db_service or DBService()
+        self.cover_ids: set = set()
+        self.observed_ids: set = set()
+        self.dong_count = 0
+        self.refreshed_at = 0.0
+
+    async def observe(self, place_id: int, results: List[Dict]):
+        """지역 검색 결과의 동 ID를 커버리지 관측으로 기록합니다"""
+        await self.db_service.record_region_coverage(place_id, [item.get("dong_id") for item in results])
+
+    async def refresh(self, force: bool = False):
+        """커버 집합이 오래되었으면 다시 계산합니다"""
+        if not force and self.refreshed_at and time.monotonic() - self.refreshed_at < COVERAGE_REFRESH_INTERVAL:
+            return
+
+        coverage = await self.db_service.get_region_coverage(window_days=COVERAGE_WINDOW_DAYS)
+        started = time.monotonic()
+        cover = greedy_set_cover(coverage)
+
+        self.cover_ids = set(cover)
+        self.observed_ids = set(coverage.keys())
+        self.dong_count = len(set().union(*coverage.values())) if coverage else 0
+        self.refreshed_at = time.monotonic()
+
+        logger.info(
+            f"커버리지 계획 갱신: 관측 지역 {len(self.observed_ids)}개 중 {len(self.cover_ids)}개로 "
+            f"동 {self.dong_count}개 커버 ({time.monotonic() - started:.2f}초)"
+        )
+
+    async def plan(self, place_params: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """검색할 지역과 커버리지상 중복이라 건너뛸 지역을 나눕니다 (입력 순서 유지)
+
+        아직 관측 기록이 없는 지역은 어떤 동을 덮는지 모르므로 항상 검색합니다.
+        """
+        await self.refresh()
+
+        selected = []
+        redundant = []
+        for place in place_params:
+            if place["id"] in self.cover_ids or place["id"] not in self.observed_ids:
+                selected.append(place)
+            else:
+                redundant.append(place)
+
+        logger.info(f"커버리지 모드: {len(place_params)}개 지역 중 {len(selected)}개 검색, {len(redundant)}개 중복으로 건너뜀")
+        return selected, redundant
+
+    def get_stats(self) -> Dict:
+        return {
+            "observed_regions": len(self.observed_ids),
+            "cover_regions": len(self.cover_ids),
+            "covered_dongs": self.dong_count,
+            "refreshed_seconds_ago": round(time.monotonic() - self.refreshed_at, 1) if self.refreshed_at else None,
+        }
+
+
+# 전역 커버리지 계획기
+coverage_planner = CoveragePlanner()
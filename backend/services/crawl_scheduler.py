@@ -0,0 +1,416 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from services.seen_set import SeenSet
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 레인 정의 (숫자가 작을수록 우선 처리)
+LANE_FIRST_PAGE = "first_page"  # 새 쿼리의 첫 페이지 (최우선)
+LANE_LOGGED_IN = "logged_in"    # 로그인 사용자 검색
+LANE_ANONYMOUS = "anonymous"    # 비로그인 사용자 검색
+
+# 레인별 가중치 (공정 큐잉에서 같은 시간 동안 받는 처리량 비율)
+DEFAULT_LANE_WEIGHTS = {
+    LANE_LOGGED_IN: 2.0,
+    LANE_ANONYMOUS: 1.0,
+}
+
+
+# 검색 하나에서 중복 확인 키가 이 수를 넘으면 블룸 필터로 전환 (0이면 항상 정확한 set 사용)
+DEDUP_BLOOM_AFTER = int(os.getenv("CRAWL_DEDUP_BLOOM_AFTER", "0"))
+
+# 예산 소진 사유 (search_process.skip_reason 값으로도 사용)
+BUDGET_TIME = "budget_time"
+BUDGET_ITEMS = "budget_items"
+
+
+class CrawlCancelledError(Exception):
+    """검색이 취소되어 작업이 실행되지 않았거나 중단된 경우 발생"""
+    pass
+
+
+class CrawlBudgetExceededError(CrawlCancelledError):
+    """검색의 시간/결과 수 예산이 소진되어 작업이 실행되지 않은 경우 발생"""
+    pass
+
+
+class CrawlJob:
+    """스케줄러 큐에 들어가는 단일 지역 검색 작업"""
+
+    def __init__(self, search_id: str, factory: Callable[[], Awaitable], label: str = "", first_page: bool = False, payload: Any = None):
+        self.search_id = search_id
+        self.factory = factory
+        self.label = label
+        self.first_page = first_page
+        self.payload = payload  # 취소 시 기록을 위해 보관하는 작업 정보 (예: place_param)
+        self.enqueued_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        # 결과를 기다리지 않는 호출자가 있어도 경고가 남지 않도록 예외를 소비
+        self.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+
+class SearchQueue:
+    """검색 요청 하나에 대한 작업 큐와 통계"""
+
+    def __init__(self, search_id: str, query: str, lane: str, weight: float, user_id: Optional[str] = None):
+        self.search_id = search_id
+        self.query = query
+        self.user_id = user_id  # 검색을 시작한 사용자 (비로그인/미리 검색은 None, 취소 권한 확인용)
+        self.lane = lane
+        self.weight = weight
+        self.jobs = deque()
+        self.first_page_jobs = deque()
+        self.virtual_time = 0.0
+        self.in_flight = 0
+        self.dispatched = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.registered_at = time.monotonic()
+        self.first_started_at: Optional[float] = None
+        self.last_accessed_at = self.registered_at  # 클라이언트가 마지막으로 상태/결과를 조회한 시각
+        self.cancelled = False
+        self.cancel_reason: Optional[str] = None
+        self.running_tasks = set()
+        # 예산 (None이면 제한 없음)
+        self.max_seconds: Optional[float] = None
+        self.max_unique_items: Optional[int] = None
+        self.budget_reason: Optional[str] = None
+        self.budget_timer: Optional[asyncio.TimerHandle] = None
+        self.seen_links = set()
+        # 지역 응답 간 중복 항목 제거 (DB 저장 전)
+        self.seen_items = SeenSet(bloom_after=DEDUP_BLOOM_AFTER)
+        self.items_received = 0
+        self.items_duplicated = 0
+        self.dropped_jobs: List["CrawlJob"] = []  # 예산 소진으로 실행하지 않은 작업
+        self.idle_event = asyncio.Event()
+        self.idle_event.set()
+
+    @property
+    def depth(self) -> int:
+        return len(self.jobs) + len(self.first_page_jobs)
+
+    def refresh_idle(self):
+        """대기 작업과 실행 중인 작업이 모두 없으면 idle 이벤트를 설정합니다"""
+        if self.depth == 0 and self.in_flight == 0:
+            self.idle_event.set()
+        else:
+            self.idle_event.clear()
+
+    def to_stats(self) -> Dict:
+        time_to_start = None
+        if self.first_started_at is not None:
+            time_to_start = round(self.first_started_at - self.registered_at, 3)
+        avg_wait = round(self.total_wait / self.dispatched, 3) if self.dispatched else None
+        return {
+            "search_id": self.search_id,
+            "query": self.query,
+            "lane": self.lane,
+            "weight": self.weight,
+            "queue_depth": self.depth,
+            "in_flight": self.in_flight,
+            "dispatched": self.dispatched,
+            "completed": self.completed,
+            "time_to_start": time_to_start,
+            "avg_wait": avg_wait,
+            "idle_seconds": round(time.monotonic() - self.last_accessed_at, 3),
+            "cancelled": self.cancelled,
+            "cancel_reason": self.cancel_reason,
+            "unique_items": len(self.seen_links),
+            "max_seconds": self.max_seconds,
+            "max_unique_items": self.max_unique_items,
+            "budget_reason": self.budget_reason,
+            "budget_skipped": len(self.dropped_jobs),
+            "items_received": self.items_received,
+            "items_duplicated": self.items_duplicated,
+            "dedup_ratio": round(self.items_duplicated / self.items_received, 4) if self.items_received else None,
+            "dedup_bloom": self.seen_items.is_bloom,
+        }
+
+
+class CrawlScheduler:
+    """모든 검색이 공유하는 지역 검색 스케줄러
+
+    검색마다 별도의 큐를 두고, 활성 검색 사이에서는 가중치 공정 큐잉(WFQ)으로
+    다음 작업을 고릅니다. 새 쿼리의 첫 페이지 작업은 다른 모든 작업보다 먼저 처리됩니다.
+    """
+
+    def __init__(self, max_concurrency: int = 20, lane_weights: Optional[Dict[str, float]] = None):
+        self.max_concurrency = max_concurrency
+        self.lane_weights = dict(DEFAULT_LANE_WEIGHTS)
+        if lane_weights:
+            self.lane_weights.update(lane_weights)
+        self.queues: Dict[str, SearchQueue] = {}
+        self._virtual_clock = 0.0
+        self._wakeup = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+
+    def register_search(self, search_id: str, query: str, user_id: Optional[str] = None) -> SearchQueue:
+        """검색 요청을 스케줄러에 등록합니다 (이미 등록된 경우 기존 큐 반환)"""
+        queue = self.queues.get(search_id)
+        if queue:
+            return queue
+
+        lane = LANE_LOGGED_IN if user_id is not None else LANE_ANONYMOUS
+        queue = SearchQueue(search_id, query, lane, self.lane_weights.get(lane, 1.0), user_id=user_id)
+        queue.virtual_time = self._virtual_clock
+        self.queues[search_id] = queue
+        logger.info(f"스케줄러에 검색 등록: ID={search_id}, 쿼리='{query}', 레인={lane}")
+        return queue
+
+    def unregister_search(self, search_id: str):
+        """검색 요청의 큐를 제거합니다 (대기 중인 작업이 없는 경우에만 호출)"""
+        queue = self.queues.pop(search_id, None)
+        if queue:
+            if queue.budget_timer:
+                queue.budget_timer.cancel()
+            logger.info(f"스케줄러에서 검색 제거: ID={search_id}, 통계={queue.to_stats()}")
+
+    def submit(self, search_id: str, factory: Callable[[], Awaitable], label: str = "", first_page: bool = False, payload: Any = None) -> asyncio.Future:
+        """작업을 검색 큐에 추가하고 작업 결과를 받을 Future를 반환합니다"""
+        queue = self.queues.get(search_id)
+        if queue is None:
+            queue = self.register_search(search_id, query="")
+
+        job = CrawlJob(search_id, factory, label=label, first_page=first_page, payload=payload)
+
+        # 취소된 검색에는 더 이상 작업을 추가하지 않음
+        if queue.cancelled:
+            job.future.set_exception(CrawlCancelledError(f"취소된 검색입니다: {search_id}"))
+            return job.future
+
+        # 예산이 이미 소진된 검색의 작업은 실행하지 않고 건너뜀 목록에 추가
+        if queue.budget_reason:
+            self._drop_for_budget(queue, [job])
+            return job.future
+
+        # 비어 있던 큐가 다시 활성화되면 현재 가상 시간부터 경쟁 (쉬던 동안의 몫을 몰아서 쓰지 않도록)
+        if queue.depth == 0:
+            queue.virtual_time = max(queue.virtual_time, self._virtual_clock)
+
+        if first_page:
+            queue.first_page_jobs.append(job)
+        else:
+            queue.jobs.append(job)
+        queue.refresh_idle()
+
+        self._ensure_workers()
+        self._wakeup.set()
+        return job.future
+
+    def set_budget(self, search_id: str, max_seconds: Optional[float] = None, max_unique_items: Optional[int] = None):
+        """검색의 시간(초)/고유 결과 수 예산을 설정합니다
+
+        예산이 소진되면 더 이상 새 작업을 시작하지 않고 남은 작업을 건너뜀 목록으로 옮깁니다.
+        이미 실행 중인 작업은 끝까지 진행됩니다.
+        """
+        queue = self.queues.get(search_id)
+        if not queue:
+            return
+
+        queue.max_seconds = max_seconds
+        queue.max_unique_items = max_unique_items
+        if max_seconds:
+            # 시간 예산은 검색 등록 시점부터 계산
+            remaining = max(0.0, queue.registered_at + max_seconds - time.monotonic())
+            queue.budget_timer = asyncio.get_running_loop().call_later(
+                remaining, self.enforce_budget, search_id
+            )
+        logger.info(f"검색 예산 설정: ID={search_id}, 최대 시간={max_seconds}초, 최대 결과 수={max_unique_items}")
+        self.enforce_budget(search_id)
+
+    def record_items(self, search_id: str, links: List[str]):
+        """검색에서 수집된 결과 링크를 기록하고 결과 수 예산을 확인합니다"""
+        queue = self.queues.get(search_id)
+        if not queue:
+            return
+        queue.seen_links.update(link for link in links if link)
+        self.enforce_budget(search_id)
+
+    def filter_new_items(self, search_id: str, items: List[Dict], key: Callable[[Dict], str]) -> List[Dict]:
+        """같은 검색에서 이미 받은 항목(key 기준)을 제외한 새 항목만 반환하고 중복 비율을 기록합니다"""
+        queue = self.queues.get(search_id)
+        if not queue:
+            return items
+
+        new_items = [item for item in items if queue.seen_items.add(key(item))]
+        queue.items_received += len(items)
+        queue.items_duplicated += len(items) - len(new_items)
+        return new_items
+
+    def enforce_budget(self, search_id: str) -> Optional[str]:
+        """예산 소진 여부를 확인하고, 소진되었으면 대기 작업을 모두 건너뜀 목록으로 옮깁니다"""
+        queue = self.queues.get(search_id)
+        if not queue or queue.cancelled:
+            return None
+
+        if not queue.budget_reason:
+            if queue.max_seconds and time.monotonic() - queue.registered_at >= queue.max_seconds:
+                queue.budget_reason = BUDGET_TIME
+            elif queue.max_unique_items and len(queue.seen_links) >= queue.max_unique_items:
+                queue.budget_reason = BUDGET_ITEMS
+            else:
+                return None
+            logger.info(f"검색 예산 소진: ID={search_id}, 사유={queue.budget_reason}, 고유 결과 {len(queue.seen_links)}개")
+
+        pending = list(queue.first_page_jobs) + list(queue.jobs)
+        queue.first_page_jobs.clear()
+        queue.jobs.clear()
+        self._drop_for_budget(queue, pending)
+        return queue.budget_reason
+
+    def take_dropped_jobs(self, search_id: str) -> List[CrawlJob]:
+        """예산 소진으로 실행하지 않은 작업 목록을 꺼내 반환합니다"""
+        queue = self.queues.get(search_id)
+        if not queue:
+            return []
+        dropped = queue.dropped_jobs
+        queue.dropped_jobs = []
+        return dropped
+
+    def _drop_for_budget(self, queue: SearchQueue, jobs: List[CrawlJob]):
+        for job in jobs:
+            if not job.future.done():
+                job.future.set_exception(CrawlBudgetExceededError(f"검색 예산 소진: {queue.budget_reason}"))
+        queue.dropped_jobs.extend(jobs)
+        queue.refresh_idle()
+
+    def touch(self, search_id: str):
+        """클라이언트가 검색 상태나 결과를 조회했음을 기록합니다 (자동 취소 판단용)"""
+        queue = self.queues.get(search_id)
+        if queue:
+            queue.last_accessed_at = time.monotonic()
+
+    def idle_seconds(self, search_id: str) -> float:
+        """클라이언트가 마지막으로 조회한 뒤 지난 시간(초)을 반환합니다"""
+        queue = self.queues.get(search_id)
+        if not queue:
+            return 0.0
+        return time.monotonic() - queue.last_accessed_at
+
+    def cancel_search(self, search_id: str, reason: str = "cancelled") -> List[CrawlJob]:
+        """검색의 대기 작업을 버리고 실행 중인 작업을 취소합니다
+
+        버려진(한 번도 시작되지 않은) 작업 목록을 반환하므로 호출자가 취소 기록을 남길 수 있습니다.
+        실행 중인 작업은 CancelledError를 받아 스스로 정리하며, 워커 슬롯은 즉시 다른 검색에 돌아갑니다.
+        """
+        queue = self.queues.get(search_id)
+        if not queue or queue.cancelled:
+            return []
+
+        queue.cancelled = True
+        queue.cancel_reason = reason
+
+        dropped = list(queue.first_page_jobs) + list(queue.jobs)
+        queue.first_page_jobs.clear()
+        queue.jobs.clear()
+        for job in dropped:
+            if not job.future.done():
+                job.future.set_exception(CrawlCancelledError(f"검색이 취소되었습니다: {reason}"))
+
+        for task in list(queue.running_tasks):
+            task.cancel()
+
+        queue.refresh_idle()
+        logger.info(f"검색 취소: ID={search_id}, 사유={reason}, 대기 작업 {len(dropped)}개 제거, 실행 중 작업 {len(queue.running_tasks)}개 중단")
+        return dropped
+
+    def is_cancelled(self, search_id: str) -> bool:
+        queue = self.queues.get(search_id)
+        return bool(queue and queue.cancelled)
+
+    async def wait_idle(self, search_id: str):
+        """검색 큐의 모든 작업이 끝날 때까지 기다립니다"""
+        queue = self.queues.get(search_id)
+        if queue:
+            await queue.idle_event.wait()
+
+    def get_stats(self, search_id: Optional[str] = None) -> Dict:
+        """스케줄러 상태를 반환합니다 (search_id 지정 시 해당 검색만)"""
+        if search_id is not None:
+            queue = self.queues.get(search_id)
+            return queue.to_stats() if queue else {}
+
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": sum(q.in_flight for q in self.queues.values()),
+            "queue_depth": sum(q.depth for q in self.queues.values()),
+            "searches": [q.to_stats() for q in self.queues.values()],
+        }
+
+    def _ensure_workers(self):
+        """워커 태스크를 필요한 만큼 생성합니다 (최초 작업 제출 시점에 시작)"""
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.max_concurrency:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    def _pick_next(self) -> Optional[CrawlJob]:
+        """다음에 실행할 작업을 고릅니다"""
+        # 1) 첫 페이지 레인: 먼저 들어온 순서대로
+        first_page_queues = [q for q in self.queues.values() if q.first_page_jobs]
+        if first_page_queues:
+            queue = min(first_page_queues, key=lambda q: q.first_page_jobs[0].enqueued_at)
+            return queue.first_page_jobs.popleft()
+
+        # 2) 일반 작업: 가상 시간이 가장 작은 검색부터 (가중치가 클수록 가상 시간이 천천히 증가)
+        backlogged = [q for q in self.queues.values() if q.jobs]
+        if not backlogged:
+            return None
+
+        queue = min(backlogged, key=lambda q: q.virtual_time)
+        self._virtual_clock = queue.virtual_time
+        queue.virtual_time += 1.0 / queue.weight
+        return queue.jobs.popleft()
+
+    async def _worker(self):
+        """큐에서 작업을 하나씩 꺼내 실행하는 워커"""
+        while True:
+            job = self._pick_next()
+            if job is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            queue = self.queues.get(job.search_id)
+            job.started_at = time.monotonic()
+            if queue:
+                queue.in_flight += 1
+                queue.dispatched += 1
+                queue.total_wait += job.started_at - job.enqueued_at
+                if queue.first_started_at is None:
+                    queue.first_started_at = job.started_at
+
+            # 작업은 별도 태스크로 실행하여 검색 취소 시 개별적으로 중단할 수 있도록 함
+            task = asyncio.create_task(job.factory())
+            if queue:
+                queue.running_tasks.add(task)
+
+            try:
+                # asyncio.wait는 워커가 취소되어도 작업 태스크를 함께 취소하지 않음
+                await asyncio.wait({task})
+                if task.cancelled():
+                    if not job.future.done():
+                        job.future.set_exception(CrawlCancelledError(f"실행 중 취소됨: {job.label}"))
+                elif task.exception() is not None:
+                    logger.error(f"스케줄러 작업 실행 중 오류 발생 ({job.label}): {str(task.exception())}")
+                    if not job.future.done():
+                        job.future.set_exception(task.exception())
+                elif not job.future.done():
+                    job.future.set_result(task.result())
+            finally:
+                if queue:
+                    queue.running_tasks.discard(task)
+                    queue.in_flight -= 1
+                    queue.completed += 1
+                    queue.refresh_idle()
+
+
+# 최대 동시 비동기 요청 수를 20개로 제한하는 전역 스케줄러
+MAX_CONCURRENT_REQUESTS = 20
+crawl_scheduler = CrawlScheduler(max_concurrency=MAX_CONCURRENT_REQUESTS)
@@ -5,10 +5,78 @@ from datetime import datetime
 from typing import List, Dict, Optional, Tuple, Any
 import logging
 import asyncio
+import os
+import time
+from collections import deque
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+# 지연 시간 통계가 부족할 때 사용할 헤지 대기 시간(초)
+HEDGE_DEFAULT_DELAY = float(os.getenv("HEDGE_DEFAULT_DELAY", "1.5"))
+# p90 계산에 필요한 최소 표본 수
+HEDGE_MIN_SAMPLES = 10
+# 연속 실패가 이 횟수 이상인 프록시는 헤지 대상에서 제외
+PROXY_UNHEALTHY_FAILURES = 3
+
+
+class ProxyHealth:
+    """모든 검색이 공유하는 프록시별 응답 시간과 연속 실패 횟수 기록"""
+
+    def __init__(self, max_samples: int = 200):
+        self.latencies = deque(maxlen=max_samples)  # 프록시 풀 전체의 최근 성공 응답 시간
+        self.proxy_latencies: Dict[str, deque] = {}
+        self.failures: Dict[str, int] = {}
+
+    @staticmethod
+    def key(proxy: Dict) -> str:
+        return f"{proxy.get('provider', '')}:{proxy.get('port', '')}"
+
+    def record_success(self, proxy: Dict, latency: float):
+        key = self.key(proxy)
+        self.latencies.append(latency)
+        self.proxy_latencies.setdefault(key, deque(maxlen=20)).append(latency)
+        self.failures[key] = 0
+
+    def record_failure(self, proxy: Dict):
+        key = self.key(proxy)
+        self.failures[key] = self.failures.get(key, 0) + 1
+
+    def is_healthy(self, proxy: Dict) -> bool:
+        return self.failures.get(self.key(proxy), 0) < PROXY_UNHEALTHY_FAILURES
+
+    def median_latency(self, proxy: Dict) -> float:
+        samples = sorted(self.proxy_latencies.get(self.key(proxy), []))
+        if not samples:
+            return HEDGE_DEFAULT_DELAY
+        return samples[len(samples) // 2]
+
+    def p90_latency(self) -> float:
+        """프록시 풀의 최근 응답 시간 p90 (표본이 부족하면 기본값)"""
+        if len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        samples = sorted(self.latencies)
+        return samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+
+
+# 전역 프록시 상태 기록
+proxy_health = ProxyHealth()
+
+
+class HedgeBudget:
+    """검색 하나에서 보낼 수 있는 헤지(중복) 요청 수 제한"""
+
+    def __init__(self, max_hedges: int):
+        self.max_hedges = max_hedges
+        self.used = 0
+
+    def try_acquire(self) -> bool:
+        if self.used >= self.max_hedges:
+            return False
+        self.used += 1
+        return True
+
+
 class ProxyProvider:
     """프록시 제공 업체 기본 클래스"""
     
@@ -128,8 +196,22 @@ class ProxyService:
             return {}, ""
         
         # 현재 인덱스의 프록시 가져오기
-        proxy = self.all_proxies[self.current_index]
+        return self.format_proxy(self.all_proxies[self.current_index])
+    
+    def get_healthy_proxy(self, exclude: Optional[Dict] = None) -> Tuple[Dict, str]:
+        """제외할 프록시가 아닌 건강한 프록시 중 응답이 가장 빠른 프록시와 URL을 반환합니다"""
+        exclude_key = proxy_health.key(exclude) if exclude else None
+        candidates = [
+            p for p in self.all_proxies
+            if proxy_health.key(p) != exclude_key and proxy_health.is_healthy(p)
+        ]
+        if not candidates:
+            return {}, ""
         
+        return self.format_proxy(min(candidates, key=proxy_health.median_latency))
+    
+    def format_proxy(self, proxy: Dict) -> Tuple[Dict, str]:
+        """프록시와 해당 제공자 형식의 URL을 반환합니다"""
         # 해당 프록시의 제공자 찾기
         provider_name = proxy.get("provider", "")
         provider = next((p for p in self.providers if p.name == provider_name), None)
@@ -244,20 +326,74 @@ class DaangnScraper:
         if not self.proxy or not self.proxy_url:
             logger.error("프록시가 설정되지 않았습니다. 크롤링을 중단합니다.")
             return []
+        
+        return await self._fetch(query, self.proxy, self.proxy_url)
+    
+    async def search_hedged(self, query: str, hedge_budget: Optional[HedgeBudget] = None) -> List[Dict]:
+        """헤지 요청을 사용해 검색합니다
+
+        현재 프록시의 응답이 프록시 풀의 p90 응답 시간 안에 오지 않으면, 다른 건강한 프록시로
+        같은 요청을 한 번 더 보내고 먼저 성공한 응답을 사용합니다 (늦은 요청은 취소).
+        헤지 요청 수는 검색별 hedge_budget으로 제한됩니다.
+        """
+        if not self.proxy or not self.proxy_url:
+            logger.error("프록시가 설정되지 않았습니다. 크롤링을 중단합니다.")
+            return []
+        
+        primary = asyncio.create_task(self._fetch(query, self.proxy, self.proxy_url))
+        tasks = {primary}
+        try:
+            hedge_delay = proxy_health.p90_latency()
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if done:
+                return primary.result()
+            
+            if hedge_budget is None or not hedge_budget.try_acquire():
+                return await primary
+            
+            hedge_proxy, hedge_proxy_url = self.proxy_service.get_healthy_proxy(exclude=self.proxy)
+            if not hedge_proxy or not hedge_proxy_url:
+                return await primary
+            
+            logger.info(f"헤지 요청 전송: {hedge_delay:.2f}초 내 응답 없음, 프록시 {hedge_proxy.get('provider', '')}:{hedge_proxy.get('port', '')}로 중복 요청 (사용 {hedge_budget.used}/{hedge_budget.max_hedges})")
+            hedge = asyncio.create_task(self._fetch(query, hedge_proxy, hedge_proxy_url))
+            tasks.add(hedge)
             
+            # 먼저 성공한 응답을 사용하고, 둘 다 실패하면 마지막 오류를 전달
+            last_error = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            # 호출자가 실제로 사용된 프록시를 기록할 수 있도록 교체
+                            self.proxy, self.proxy_url = hedge_proxy, hedge_proxy_url
+                            logger.info("헤지 요청이 먼저 응답했습니다.")
+                        return task.result()
+                    last_error = task.exception()
+            raise last_error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _fetch(self, query: str, proxy: Dict, proxy_url: str) -> List[Dict]:
+        """지정한 프록시로 검색 페이지를 가져와 결과를 파싱하고, 프록시 응답 시간을 기록합니다"""
         url = f"{self.BASE_URL}?in={self.location}&search={query}"
         logger.info(f"검색 URL: {url}")
         
+        started = time.monotonic()
         try:
             async with aiohttp.ClientSession() as session:
                 kwargs = {
                     "headers": self.headers,
                     "timeout": aiohttp.ClientTimeout(total=10),
                     "allow_redirects": False,  # 리다이렉트 비활성화
-                    "proxy": self.proxy_url  # 항상 프록시 사용
+                    "proxy": proxy_url  # 항상 프록시 사용
                 }
                 
-                logger.info(f"프록시를 사용하여 크롤링합니다: {self.proxy.get('provider', '')} / {self.proxy.get('country', '')} / {self.proxy.get('real_ip', '알 수 없음')}")
+                logger.info(f"프록시를 사용하여 크롤링합니다: {proxy.get('provider', '')} / {proxy.get('country', '')} / {proxy.get('real_ip', '알 수 없음')}")
                 
                 async with session.get(url, **kwargs) as response:
                     # 429 Too Many Requests 에러 발생 시 명시적으로 예외 발생
@@ -285,6 +421,7 @@ class DaangnScraper:
                     
                     # 응답 텍스트 가져오기
                     text = await response.text('utf-8')
+                    proxy_health.record_success(proxy, time.monotonic() - started)
                     
                     # 디버깅을 위해 HTML 저장
                     with open("last_search_response.html", "w", encoding="utf-8") as f:
@@ -304,15 +441,22 @@ class DaangnScraper:
         except aiohttp.ClientProxyConnectionError as e:
             # 프록시 오류는 명시적으로 잡아서 처리
             logger.error(f"프록시 연결 오류 발생: {e}")
+            proxy_health.record_failure(proxy)
             raise Exception(f"프록시 연결 오류: {str(e)}")
         except aiohttp.ClientResponseError as e:
             # HTTP 응답 오류를 명확히 전달
             logger.error(f"HTTP 응답 오류 발생: {e.status}, message='{e.message}', url={e.request_info.url}")
+            proxy_health.record_failure(proxy)
             raise
         except aiohttp.ClientConnectionError as e:
             # 연결 오류도 명시적으로 처리
             logger.error(f"연결 오류 발생 (프록시 관련 문제일 수 있음): {e}")
+            proxy_health.record_failure(proxy)
             raise Exception(f"연결 오류: {str(e)}")
+        except asyncio.TimeoutError:
+            logger.error(f"검색 요청 시간 초과: {url}")
+            proxy_health.record_failure(proxy)
+            raise
         except Exception as e:
             logger.error(f"검색 중 오류 발생: {str(e)}")
             raise
@@ -1,14 +1,20 @@
 import os
+import time
+import hashlib
 import logging
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timedelta
 import pytz
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Text, Float, DateTime, Table, MetaData, Boolean, func, and_, text
+from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Text, Float, DateTime, Table, MetaData, Boolean, Index, func, and_, text, tuple_
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import UUID, JSONB, insert as pg_insert
 import uuid
 
+from services.result_cache import result_cache
+from services.columnar_store import columnar_store
+from services.price_stats import summarize_prices
+
 # 로깅 설정 (중앙화된 설정을 사용하도록 변경)
 logger = logging.getLogger(__name__)
 
@@ -46,6 +52,110 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base 클래스 생성
 Base = declarative_base()
 
+_uuid7_last_ms = 0
+_uuid7_counter = 0
+
+def uuid7() -> uuid.UUID:
+    """시간 순서 UUID (UUIDv7, RFC 9562) 생성
+
+    앞 48비트는 Unix 밀리초 타임스탬프이므로 새 행이 기본 키 B-tree의 끝에 추가됩니다.
+    같은 밀리초 안에서는 12비트 카운터로 생성 순서를 유지합니다. 기존 UUID 컬럼과 호환됩니다.
+    """
+    global _uuid7_last_ms, _uuid7_counter
+    now_ms = time.time_ns() // 1_000_000
+    if now_ms <= _uuid7_last_ms:
+        # 같은 밀리초(또는 시계가 뒤로 간 경우): 카운터 증가, 넘치면 다음 밀리초로
+        _uuid7_counter += 1
+        if _uuid7_counter > 0xFFF:
+            _uuid7_last_ms += 1
+            _uuid7_counter = 0
+        now_ms = _uuid7_last_ms
+    else:
+        _uuid7_last_ms = now_ms
+        _uuid7_counter = int.from_bytes(os.urandom(2), "big") & 0x7FF  # 카운터 시작값은 절반 범위 안의 임의 값
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (now_ms & ((1 << 48) - 1)) << 80 | 0x7 << 76 | _uuid7_counter << 64 | 0b10 << 62 | rand_b
+    return uuid.UUID(int=value)
+
+# /existing에서 반환하는 첫 페이지 크기 (query_latest_results에 미리 계산해 둠)
+EXISTING_PAGE_SIZE = 100
+
+# 변경 피드 한 번에 반환할 최대 항목 수
+CHANGES_PAGE_LIMIT = int(os.getenv("CHANGES_PAGE_LIMIT", "200"))
+
+# 목록 카드에 보여줄 내용 앞부분 길이
+SNIPPET_LENGTH = 100
+
+def make_snippet(content: Optional[str]) -> Optional[str]:
+    """상품 설명의 앞부분 (줄바꿈/연속 공백은 하나의 공백으로)"""
+    if not content:
+        return content
+    snippet = " ".join(content.split())
+    return snippet if len(snippet) <= SNIPPET_LENGTH else snippet[:SNIPPET_LENGTH] + "…"
+
+# 당근마켓 카테고리 아이콘 URL -> 카테고리 ID
+CATEGORY_URL_TO_ID = {
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/2c0811ac0c0f491039082d246cd41de636d58cd6e54368a0b012c386645d7c66.png": 1,  # 디지털기기
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/ff36d0fb3a3214a9cc86c79a84262e0d9e11b6d7289ed9aa75e40d0129764fac.png": 172,  # 생활가전
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/088e41c5973184228a2e4a50961ceb6fc366bb3eb11b1ee7c7cd66bcdf9c5529.png": 8,  # 가구/인테리어
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/22a78937b8a8ccd0003ff7bb7c247b3863a5046f93a36b5341913ff2935efa43.png": 7,  # 생활/주방
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/1975d6ba1725dfbe053daa450cec51757a39943104d57fbdd3fc5c7d8ae07605.png": 4,  # 유아동
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/987b21e9e02255cb310e4736b16e056d0bfc90c397e423e599b544bad203601e.png": 173,  # 유아도서
+    "https://dnvefa72aowie.cloudfront.net/origin/brand/202402/b99fb12bcc754a08e5a6f359861bafd80d38678a0c58521abdf314949f9c5e58.png": 5,  # 여성의류
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/23f6b89ba63da7cf8135e1063bde3811fb6499dc073585eea161b3727a42535e.png": 31,  # 여성잡화
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/38dd757c99863d1748f16292142cabfae9621622cc751faff49a79ed60c1c5e7.png": 14,  # 남성패션/잡화
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/1efa73a4e3b45610292223f44c42cbe3c7d93395a23f1134426a58d5639c179b.png": 6,  # 뷰티/미용
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/6379c3ba41f03dc6e27796c5f106c8b20b57d79ddb3ba52440084fcd4d10d8dd.png": 3,  # 스포츠/레저
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/074da39b1114588ebc61447883f5f0059dd4abc16127f4250f559360f40eb0e2.png": 2,  # 취미/게임/음반
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/0ce93f6b19d61169b955dae5422aa9f842933d8ccf35dc4c53cea8656a293e40.png": 9,  # 도서
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/631cb98e2c7cf46f1f2520f97b0ec2d30ce426c4c158ea3673f84e0aca088181.png": 304,  # 티켓/교환권
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/243b21522a5ff57863942f0ed84a04b3cc72f30ca9edda818f31238fc94066ee.png": 305,  # 가공식품
+    "https://dnvefa72aowie.cloudfront.net/origin/brand/202407/c22153f3cca52c69efb2b4c15e8e644ea7118b2f8c07d378ec8b75489c31cf46.png": 483,  # 건강기능식품
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/763d2fb8809deb0a5ebd4ef2694ecb2d8b08f501ab185f7167d87a74a33aee10.png": 16,  # 반려동물용품
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/248610f466d99a9a7cafa1c75a818a73bf850e05c7f7c205cbc60c7b7b16f876.png": 139,  # 식물
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/407b005b01de954b59aff9e21f729b3c30e3ae249acfb643401f235598dea8e3.png": 13,  # 기타 중고물품
+    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/6a729d83f311aa3e8ffa12c9757cfda323591a0018ce2d25da6bf604615e33c2.png": 32,  # 삽니다
+}
+
+def _columnar_row(result) -> tuple:
+    """SearchResult(또는 같은 컬럼을 가진 행)를 열 저장소 행으로 변환"""
+    return (
+        result.id,
+        result.price,
+        result.created_at_origin,
+        result.boosted_at,
+        CATEGORY_URL_TO_ID.get(result.category),
+        result.status == "Ongoing",
+        result.dong_id,
+        result.sido,
+        result.sigungu1,
+        result.sigungu2,
+        result.dong,
+    )
+
+# dong_id별 지역 정보 캐시 (place_list는 거의 바뀌지 않으므로 프로세스 내에서 재사용)
+_location_info_cache: Dict[int, Dict[str, Optional[str]]] = {}
+
+# 변경 없는 재수집 항목의 last_seen_at을 다시 기록하는 최소 간격
+LAST_SEEN_RESOLUTION = timedelta(minutes=int(os.getenv("LAST_SEEN_RESOLUTION_MINUTES", "60")))
+
+def compute_fingerprint(item: Dict) -> str:
+    """검색 결과 항목의 내용 해시 (제목, 가격, 상태, 내용, 썸네일, 끌어올림 시각)"""
+    fields = [
+        item.get("title"),
+        item.get("price"),
+        item.get("status"),
+        item.get("content"),
+        item.get("thumbnail"),
+        item.get("boosted_at"),
+    ]
+    payload = "\x1f".join("" if value is None else str(value) for value in fields)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def item_dedup_key(item: Dict) -> str:
+    """검색 중 중복 항목 확인용 키 (링크 + 내용 해시)"""
+    return f"{item['link']}\x1f{compute_fingerprint(item)}"
+
 # 테이블 생성 함수
 def create_tables():
     try:
@@ -68,7 +178,7 @@ def get_db():
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     username = Column(String, unique=True, nullable=False)
     password = Column(String, nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(KST))
@@ -78,26 +188,36 @@ class User(Base):
 class SearchRequest(Base):
     __tablename__ = "search_requests"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     query = Column(String, nullable=False)
     location = Column(String, nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(KST))
     is_crawled = Column(Boolean, default=True)  # 실제 크롤링 수행 여부
+    
+    __table_args__ = (
+        Index("idx_search_requests_user_query_created", "user_id", "query", "created_at"),
+        Index("idx_search_requests_query_created", "query", "created_at"),
+    )
 
 class SearchResult(Base):
     __tablename__ = "search_results"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     query = Column(String, nullable=False)
     title = Column(Text, nullable=False)
     link = Column(Text, nullable=False)
     thumbnail = Column(Text, nullable=True)
     location = Column(Text, nullable=True)
-    dong_id = Column(String, nullable=True)
+    dong_id = Column(Integer, nullable=True)
+    # 지역 필터용 비정규화 컬럼 (저장 시 place_list에서 채움)
+    sido = Column(Text, nullable=True)
+    sigungu1 = Column(Text, nullable=True)
+    sigungu2 = Column(Text, nullable=True)
+    dong = Column(Text, nullable=True)
     price = Column(Float, nullable=True)
     status = Column(Text, nullable=True)
-    content = Column(Text, nullable=True)
+    snippet = Column(Text, nullable=True)  # 목록 카드용 내용 앞부분 (전체 내용은 search_result_contents)
     nickname = Column(Text, nullable=True)
     nickname_id = Column(Text, nullable=True)
     category = Column(Text, nullable=True)
@@ -105,6 +225,70 @@ class SearchResult(Base):
     boosted_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(KST))
     updated_at = Column(DateTime, nullable=True)
+    fingerprint = Column(String(40), nullable=True)  # 내용 해시 (변경 없는 재수집 시 업데이트 생략)
+    last_seen_at = Column(DateTime, nullable=True)  # 검색 결과에 마지막으로 등장한 시각
+    
+    __table_args__ = (
+        Index("idx_search_results_link", "link"),
+    )
+
+class SearchQuery(Base):
+    __tablename__ = "search_queries"
+    
+    # 정규화된 검색어 사전 (소문자, 앞뒤 공백 제거)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    query = Column(String, unique=True, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(KST))
+
+class QueryItem(Base):
+    __tablename__ = "query_items"
+    
+    # 검색어별로 검색된 상품 (상품은 search_results에 한 번만 저장되고 여러 검색어가 공유)
+    query_id = Column(Integer, ForeignKey("search_queries.id"), primary_key=True)
+    item_id = Column(UUID(as_uuid=True), ForeignKey("search_results.id", ondelete="CASCADE"), primary_key=True)
+    first_seen_at = Column(DateTime, default=lambda: datetime.now(KST))  # 이 검색어로 처음 검색된 시각
+    last_seen_at = Column(DateTime, default=lambda: datetime.now(KST))   # 이 검색어로 마지막으로 검색된 시각
+    # 검색어 + 지역 필터를 (query_id, sido, sigungu1) 인덱스 범위 조회로 처리하기 위한 비정규화 컬럼
+    sido = Column(Text, nullable=True)
+    sigungu1 = Column(Text, nullable=True)
+    # 검색어별 정렬/가격 범위 조회를 인덱스 범위 조회로 처리하기 위한 비정규화 컬럼 (search_results 값 복사)
+    price = Column(Float, nullable=True)
+    created_at_origin = Column(DateTime, nullable=True)
+    boosted_at = Column(DateTime, nullable=True)
+    # 이 검색어 결과에 추가되었거나 가격/상태가 바뀐 시각 (변경 피드 커서)
+    changed_at = Column(DateTime, default=lambda: datetime.now(KST))
+    
+    __table_args__ = (
+        Index("idx_query_items_item_id", "item_id"),
+        Index("idx_query_items_query_region", "query_id", "sido", "sigungu1"),
+        # 정렬 인덱스는 get_search_results의 ORDER BY와 방향/NULLS 순서가 같아야 정렬 없이 페이지를 읽음
+        Index("idx_query_items_query_price_asc", query_id, price.asc(), created_at_origin.desc(),
+              postgresql_include=["item_id"]),
+        Index("idx_query_items_query_price_desc", query_id, price.desc().nullslast(), created_at_origin.desc(),
+              postgresql_include=["item_id"]),
+        Index("idx_query_items_query_created", query_id, created_at_origin.desc(), postgresql_include=["item_id"]),
+        Index("idx_query_items_query_boosted", query_id, boosted_at.desc().nullslast(), created_at_origin.desc(),
+              postgresql_include=["item_id"]),
+        Index("idx_query_items_query_changed", "query_id", "changed_at", "item_id"),
+    )
+
+class QueryLatestResult(Base):
+    __tablename__ = "query_latest_results"
+    
+    # 정규화된 검색어별 가장 최근 크롤링 검색 요청과, 그 첫 페이지(/existing 응답)
+    query_id = Column(Integer, ForeignKey("search_queries.id"), primary_key=True)
+    search_request_id = Column(UUID(as_uuid=True), ForeignKey("search_requests.id"), nullable=False)
+    first_page = Column(JSONB, nullable=True)  # 결과가 바뀌면 NULL로 비우고 다음 조회 때 다시 계산
+    version = Column(Integer, nullable=False, default=0)  # 비울 때마다 증가 (계산 중 바뀐 페이지를 저장하지 않도록)
+    updated_at = Column(DateTime, default=lambda: datetime.now(KST))
+
+class SearchResultContent(Base):
+    __tablename__ = "search_result_contents"
+    
+    # 상품 전체 설명 (목록 조회 시 읽지 않도록 분리, TOAST 압축 저장)
+    item_id = Column(UUID(as_uuid=True), ForeignKey("search_results.id", ondelete="CASCADE"), primary_key=True)
+    content = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=lambda: datetime.now(KST))
 
 class PlaceList(Base):
     __tablename__ = "place_list"
@@ -120,6 +304,10 @@ class PlaceList(Base):
     from_area = Column(Text, nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(KST))
     updated_at = Column(DateTime, default=lambda: datetime.now(KST))
+    
+    __table_args__ = (
+        Index("idx_place_list_dong_id", "dong_id"),
+    )
 
 class SearchProcess(Base):
     __tablename__ = "search_process"
@@ -134,11 +322,26 @@ class SearchProcess(Base):
     end_time = Column(DateTime, nullable=True)
     items_count = Column(Integer, default=0)
     error_message = Column(Text, nullable=True)  # 오류 메시지 저장 필드
+    skip_reason = Column(Text, nullable=True)  # 실행하지 않고 건너뛴 사유 (취소, 예산 초과 등)
     proxy_provider = Column(Text, nullable=True)  # 프록시 제공자 정보
     proxy_ip = Column(Text, nullable=True)       # 프록시 IP 주소
     proxy_country = Column(Text, nullable=True)  # 프록시 국가 코드
     created_at = Column(DateTime, default=lambda: datetime.now(KST))
     updated_at = Column(DateTime, default=lambda: datetime.now(KST))
+    
+    __table_args__ = (
+        Index("idx_search_process_request_completed", "search_request_id", "is_completed"),
+        Index("idx_search_process_place_end_time", "place_id", "end_time"),
+    )
+
+class RegionCoverage(Base):
+    __tablename__ = "region_coverage"
+    
+    # 지역 파라미터(place_id)로 검색했을 때 결과에 등장한 동(dong_id) 관측 기록
+    place_id = Column(Integer, ForeignKey("place_list.id"), primary_key=True)
+    dong_id = Column(Integer, primary_key=True)
+    hits = Column(Integer, default=1)
+    last_seen_at = Column(DateTime, default=lambda: datetime.now(KST))
 
 class DBService:
     """PostgreSQL을 통해 검색 결과를 저장하고 관리하는 서비스"""
@@ -159,6 +362,42 @@ class DBService:
             self.session.close()
             self.session = None
     
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return (query or "").strip().lower()
+    
+    def _get_query_id(self, session, query: str, create: bool = False) -> Optional[int]:
+        """검색어 사전에서 정규화된 검색어의 ID를 조회합니다 (create=True면 없을 때 추가)"""
+        normalized = self.normalize_query(query)
+        if create:
+            session.execute(
+                pg_insert(SearchQuery)
+                .values(query=normalized, created_at=datetime.now(KST))
+                .on_conflict_do_nothing(index_elements=["query"])
+            )
+        return session.query(SearchQuery.id).filter(SearchQuery.query == normalized).scalar()
+    
+    def _point_latest_result(self, session, query: str, search_request_id):
+        """검색어의 최신 크롤링 검색 요청을 기록하고 미리 계산한 첫 페이지를 비웁니다"""
+        query_id = self._get_query_id(session, query, create=True)
+        current_time = datetime.now(KST)
+        pointer = pg_insert(QueryLatestResult).values(
+            query_id=query_id,
+            search_request_id=search_request_id,
+            first_page=None,
+            version=0,
+            updated_at=current_time
+        )
+        session.execute(pointer.on_conflict_do_update(
+            index_elements=["query_id"],
+            set_={
+                "search_request_id": pointer.excluded.search_request_id,
+                "first_page": None,
+                "version": QueryLatestResult.version + 1,
+                "updated_at": pointer.excluded.updated_at
+            }
+        ))
+    
     async def save_search_request(self, user_id: Optional[str], query: str, location: Optional[str], is_crawled: bool = True) -> Dict:
         """검색 요청 정보를 저장합니다"""
         try:
@@ -182,8 +421,16 @@ class DBService:
             )
             
             session.add(search_request)
+            
+            # 실제 크롤링 검색이면 검색어별 최신 검색 포인터를 이 요청으로 옮김 (첫 페이지는 다시 계산)
+            if is_crawled:
+                session.flush()
+                self._point_latest_result(session, query, search_request.id)
+            
             session.commit()
             session.refresh(search_request)
+            # 같은 쿼리의 이전 검색 수(새 상품 표시 기준)가 바뀌므로 결과 페이지 캐시 무효화
+            result_cache.bump(query)
             
             # 결과 반환을 위해 딕셔너리로 변환
             result = {
@@ -207,7 +454,12 @@ class DBService:
             self.close_session()
     
     async def save_search_results(self, search_request_id: str, results: List[Dict], query: str) -> List[Dict]:
-        """검색 결과를 저장합니다. 동일한 link 값이 있으면 업데이트합니다."""
+        """검색 결과를 저장합니다. 동일한 link 값이 있으면 내용이 바뀐 경우에만 업데이트합니다.
+
+        내용(fingerprint)이 그대로인 항목은 컬럼을 다시 쓰지 않고, last_seen_at만
+        LAST_SEEN_RESOLUTION 간격으로 갱신합니다. 검색어와 상품의 관계는 query_items에
+        기록하므로 여러 검색어에 걸친 상품도 한 행을 공유합니다. 새로 저장되거나 변경된 항목만 반환합니다.
+        """
         try:
             if not results:
                 logger.warning("저장할 검색 결과가 없습니다.")
@@ -223,6 +475,22 @@ class DBService:
                 logger.error(f"잘못된 검색 요청 ID 형식: {search_request_id}")
                 return []
             
+            # 동일한 link를 가진 기존 항목을 한 번에 조회
+            links = list({item["link"] for item in results})
+            existing_by_link = {
+                result.link: result
+                for result in session.query(SearchResult).filter(SearchResult.link.in_(links)).all()
+            }
+            
+            current_time = datetime.now(KST)
+            # 시간대 포함 시각은 DB(timestamp)에 UTC 기준으로 저장되므로 비교도 UTC 기준으로
+            last_seen_cutoff = (current_time - LAST_SEEN_RESOLUTION).astimezone(pytz.UTC).replace(tzinfo=None)
+            unchanged_ids = []
+            changed_ids = []
+            price_status_changed_ids = []  # 변경 피드에 다시 노출할 항목 (가격/상태 변경)
+            unchanged_count = 0
+            contents = {}  # 새로 저장되거나 변경된 항목의 전체 내용 (item_id -> content)
+            
             # 각 결과 저장
             for item in results:
                 try:
@@ -232,68 +500,202 @@ class DBService:
                     
                     # 위치 정보 처리
                     location = item.get("location", "")
-                    dong_id = item.get("dong_id", "")
+                    dong_id = self._parse_dong_id(item.get("dong_id"))
+                    location_info = self._get_location_info(dong_id) if dong_id is not None else {}
+                    fingerprint = compute_fingerprint(item)
                     
-                    # 동일한 link를 가진 기존 항목 검색
-                    existing_result = session.query(SearchResult).filter(
-                        SearchResult.link == item["link"]
-                    ).first()
+                    existing_result = existing_by_link.get(item["link"])
                     
-                    if existing_result:
+                    if existing_result and existing_result.fingerprint == fingerprint:
+                        # 내용 변경 없음 - last_seen_at만 (일정 간격으로) 갱신
+                        unchanged_count += 1
+                        last_seen_at = existing_result.last_seen_at
+                        if last_seen_at is None or last_seen_at.replace(tzinfo=None) < last_seen_cutoff:
+                            unchanged_ids.append(existing_result.id)
+                    elif existing_result:
                         # 기존 데이터 업데이트
+                        price = self._parse_price(item.get("price"))
+                        if existing_result.price != price or existing_result.status != item.get("status"):
+                            price_status_changed_ids.append(existing_result.id)
                         existing_result.title = item["title"]
-                        existing_result.price = self._parse_price(item.get("price"))
+                        existing_result.price = price
                         existing_result.thumbnail = item.get("thumbnail")
                         existing_result.location = location
                         existing_result.dong_id = dong_id  # 지역 ID 추가
+                        existing_result.sido = location_info.get("sido")
+                        existing_result.sigungu1 = location_info.get("sigungu1")
+                        existing_result.sigungu2 = location_info.get("sigungu2")
+                        existing_result.dong = location_info.get("dong")
                         existing_result.status = item.get("status")
-                        existing_result.content = item.get("content")
+                        existing_result.snippet = make_snippet(item.get("content"))
                         existing_result.nickname = item.get("nickname")
                         existing_result.nickname_id = item.get("nickname_id")
                         existing_result.category = item.get("category")
-                        existing_result.query = query  # 검색어 설정
                         if created_at_origin:
                             existing_result.created_at_origin = created_at_origin
                         if boosted_at:
                             existing_result.boosted_at = boosted_at
-                        existing_result.updated_at = datetime.now(KST)
+                        existing_result.fingerprint = fingerprint
+                        existing_result.updated_at = current_time
+                        existing_result.last_seen_at = current_time
+                        
+                        contents[existing_result.id] = item.get("content")
+                        changed_ids.append(existing_result.id)
                         
                         # 결과 저장
                         result_dict = self._search_result_to_dict(existing_result)
+                        result_dict["content"] = item.get("content")
                         saved_results.append(result_dict)
                     else:
                         # 새 항목 생성
                         new_result = SearchResult(
-                            query=query,  # 검색어 설정
+                            query=query,  # 처음 검색된 검색어 (검색어별 소속은 query_items)
                             title=item["title"],
                             link=item["link"],
                             price=self._parse_price(item.get("price")),
                             thumbnail=item.get("thumbnail"),
                             location=location,
                             dong_id=dong_id,  # 지역 ID 추가
+                            sido=location_info.get("sido"),
+                            sigungu1=location_info.get("sigungu1"),
+                            sigungu2=location_info.get("sigungu2"),
+                            dong=location_info.get("dong"),
                             status=item.get("status"),
-                            content=item.get("content"),
+                            snippet=make_snippet(item.get("content")),
                             nickname=item.get("nickname"),
                             nickname_id=item.get("nickname_id"),
                             category=item.get("category"),
                             created_at_origin=created_at_origin,
                             boosted_at=boosted_at,
-                            created_at=datetime.now(KST)
+                            fingerprint=fingerprint,
+                            created_at=current_time,
+                            last_seen_at=current_time
                         )
                         
                         session.add(new_result)
                         session.flush()  # ID 생성을 위해 flush
+                        existing_by_link[item["link"]] = new_result
+                        contents[new_result.id] = item.get("content")
                         
                         # 결과 저장
                         result_dict = self._search_result_to_dict(new_result)
+                        result_dict["content"] = item.get("content")
                         saved_results.append(result_dict)
                 except Exception as e:
                     logger.warning(f"항목 저장 중 오류 발생: {str(e)}")
                     continue
             
+            # 전체 내용은 별도 테이블에 저장
+            if contents:
+                content_rows = pg_insert(SearchResultContent).values([
+                    {"item_id": item_id, "content": content, "updated_at": current_time}
+                    for item_id, content in contents.items()
+                ])
+                session.execute(content_rows.on_conflict_do_update(
+                    index_elements=["item_id"],
+                    set_={"content": content_rows.excluded.content, "updated_at": content_rows.excluded.updated_at}
+                ))
+            
+            # 변경된 상품은 모든 검색어의 관계 행에 복사해 둔 정렬/지역 컬럼도 갱신
+            affected_queries = {}  # 변경된 상품을 포함한 검색어 (query_id -> 정규화된 검색어)
+            if changed_ids:
+                session.flush()
+                affected_queries = dict(
+                    session.query(SearchQuery.id, SearchQuery.query).join(
+                        QueryItem, QueryItem.query_id == SearchQuery.id
+                    ).filter(
+                        QueryItem.item_id.in_(changed_ids)
+                    ).distinct().all()
+                )
+                session.execute(
+                    QueryItem.__table__.update().where(
+                        QueryItem.item_id == SearchResult.id,
+                        SearchResult.id.in_(changed_ids)
+                    ).values(
+                        price=SearchResult.price,
+                        created_at_origin=SearchResult.created_at_origin,
+                        boosted_at=SearchResult.boosted_at,
+                        sido=SearchResult.sido,
+                        sigungu1=SearchResult.sigungu1
+                    )
+                )
+            
+            # 변경된 상품을 포함한 다른 쿼리의 열 스냅샷에도 반영할 행 (커밋 전에 만들어 둠)
+            changed_columnar_rows = []
+            if any(columnar_store.has(affected_id) for affected_id in affected_queries):
+                changed_id_set = set(changed_ids)
+                changed_columnar_rows = [
+                    _columnar_row(result) for result in existing_by_link.values() if result.id in changed_id_set
+                ]
+            
+            if price_status_changed_ids:
+                session.query(QueryItem).filter(
+                    QueryItem.item_id.in_(price_status_changed_ids)
+                ).update({QueryItem.changed_at: current_time}, synchronize_session=False)
+            
+            # 검색어-상품 관계 기록 (이미 있으면 last_seen_at만 일정 간격으로 갱신)
+            member_results = [existing_by_link[link] for link in links if link in existing_by_link]
+            membership_changed = 0
+            columnar_rows = []
+            if member_results:
+                query_id = self._get_query_id(session, query, create=True)
+                # 메모리에 열 스냅샷이 있는 쿼리면 커밋 후 반영할 행을 미리 만들어 둠 (커밋 후에는 객체가 만료됨)
+                if columnar_store.has(query_id):
+                    columnar_rows = [_columnar_row(result) for result in member_results]
+                membership = pg_insert(QueryItem).values([
+                    {
+                        "query_id": query_id,
+                        "item_id": result.id,
+                        "first_seen_at": current_time,
+                        "last_seen_at": current_time,
+                        "sido": result.sido,
+                        "sigungu1": result.sigungu1,
+                        "price": result.price,
+                        "created_at_origin": result.created_at_origin,
+                        "boosted_at": result.boosted_at,
+                        "changed_at": current_time
+                    }
+                    for result in member_results
+                ])
+                membership_changed = session.execute(membership.on_conflict_do_update(
+                    index_elements=["query_id", "item_id"],
+                    set_={"last_seen_at": membership.excluded.last_seen_at},
+                    where=QueryItem.last_seen_at < last_seen_cutoff
+                )).rowcount
+            
+            # 결과가 바뀐 쿼리(이 쿼리 + 변경된 상품을 공유하는 쿼리)의 /existing용 첫 페이지를 비움
+            # 첫 페이지가 이미 비어 있어도 version은 올려야 진행 중인 재계산이 이전 결과를 저장하지 못함
+            stale_query_ids = set(affected_queries)
+            if member_results and (saved_results or membership_changed):
+                stale_query_ids.add(query_id)
+            if stale_query_ids:
+                session.query(QueryLatestResult).filter(
+                    QueryLatestResult.query_id.in_(stale_query_ids)
+                ).update({
+                    QueryLatestResult.first_page: None,
+                    QueryLatestResult.version: QueryLatestResult.version + 1
+                }, synchronize_session=False)
+            
+            # 변경 없는 항목의 last_seen_at은 한 번의 UPDATE로 갱신
+            if unchanged_ids:
+                session.query(SearchResult).filter(
+                    SearchResult.id.in_(unchanged_ids)
+                ).update({SearchResult.last_seen_at: current_time}, synchronize_session=False)
+            
             # 모든 변경사항 커밋
             session.commit()
-            logger.info(f"검색 결과 {len(saved_results)}개 저장 완료")
+            # 이 쿼리와, 변경된 상품을 공유하는 다른 쿼리의 결과 페이지 캐시 무효화
+            if saved_results or membership_changed:
+                result_cache.bump(query)
+            for affected_query in affected_queries.values():
+                if affected_query != self.normalize_query(query):
+                    result_cache.bump(affected_query)
+            if columnar_rows:
+                columnar_store.upsert(query_id, columnar_rows)
+            for affected_id in affected_queries:
+                if changed_columnar_rows and not (columnar_rows and affected_id == query_id):
+                    columnar_store.upsert(affected_id, changed_columnar_rows)
+            logger.info(f"검색 결과 {len(results)}개 중 {len(saved_results)}개 저장, 변경 없음 {unchanged_count}개 (last_seen_at 갱신 {len(unchanged_ids)}개)")
             return saved_results
             
         except Exception as e:
@@ -387,8 +789,14 @@ class DBService:
                                sido: Optional[str] = None,
                                sigungu1: Optional[str] = None,
                                sigungu2: Optional[str] = None,
-                               dong: Optional[str] = None) -> Dict:
-        """특정 검색 요청에 대한 검색 결과를 가져옵니다 (페이징, 정렬, 필터 지원)"""
+                               dong: Optional[str] = None,
+                               include_content: bool = True,
+                               min_price: Optional[float] = None,
+                               max_price: Optional[float] = None) -> Dict:
+        """특정 검색 요청에 대한 검색 결과를 가져옵니다 (페이징, 정렬, 필터 지원)
+
+        include_content=False면 전체 내용(search_result_contents)을 읽지 않고 snippet만 반환합니다.
+        """
         try:
             session = self.get_session()
             
@@ -409,6 +817,10 @@ class DBService:
                 return {"items": [], "total": 0}
             
             query = search_request.query
+            query_id = self._get_query_id(session, query)
+            if query_id is None:
+                logger.info(f"검색 쿼리 '{query}'로 저장된 결과가 없습니다")
+                return {"items": [], "total": 0}
             
             # 검색 요청이 2개 이상인지 확인
             has_previous_search = False
@@ -423,120 +835,95 @@ class DBService:
                 latest_search_time = pytz.UTC.localize(latest_search_time).astimezone(KST)
             
             # 카테고리 필터링 처리
-            category_url_to_id = {
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/2c0811ac0c0f491039082d246cd41de636d58cd6e54368a0b012c386645d7c66.png": 1,  # 디지털기기
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/ff36d0fb3a3214a9cc86c79a84262e0d9e11b6d7289ed9aa75e40d0129764fac.png": 172,  # 생활가전
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/088e41c5973184228a2e4a50961ceb6fc366bb3eb11b1ee7c7cd66bcdf9c5529.png": 8,  # 가구/인테리어
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/22a78937b8a8ccd0003ff7bb7c247b3863a5046f93a36b5341913ff2935efa43.png": 7,  # 생활/주방
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/1975d6ba1725dfbe053daa450cec51757a39943104d57fbdd3fc5c7d8ae07605.png": 4,  # 유아동
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/987b21e9e02255cb310e4736b16e056d0bfc90c397e423e599b544bad203601e.png": 173,  # 유아도서
-                "https://dnvefa72aowie.cloudfront.net/origin/brand/202402/b99fb12bcc754a08e5a6f359861bafd80d38678a0c58521abdf314949f9c5e58.png": 5,  # 여성의류
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/23f6b89ba63da7cf8135e1063bde3811fb6499dc073585eea161b3727a42535e.png": 31,  # 여성잡화
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/38dd757c99863d1748f16292142cabfae9621622cc751faff49a79ed60c1c5e7.png": 14,  # 남성패션/잡화
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/1efa73a4e3b45610292223f44c42cbe3c7d93395a23f1134426a58d5639c179b.png": 6,  # 뷰티/미용
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/6379c3ba41f03dc6e27796c5f106c8b20b57d79ddb3ba52440084fcd4d10d8dd.png": 3,  # 스포츠/레저
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/074da39b1114588ebc61447883f5f0059dd4abc16127f4250f559360f40eb0e2.png": 2,  # 취미/게임/음반
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/0ce93f6b19d61169b955dae5422aa9f842933d8ccf35dc4c53cea8656a293e40.png": 9,  # 도서
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/631cb98e2c7cf46f1f2520f97b0ec2d30ce426c4c158ea3673f84e0aca088181.png": 304,  # 티켓/교환권
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/243b21522a5ff57863942f0ed84a04b3cc72f30ca9edda818f31238fc94066ee.png": 305,  # 가공식품
-                "https://dnvefa72aowie.cloudfront.net/origin/brand/202407/c22153f3cca52c69efb2b4c15e8e644ea7118b2f8c07d378ec8b75489c31cf46.png": 483,  # 건강기능식품
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/763d2fb8809deb0a5ebd4ef2694ecb2d8b08f501ab185f7167d87a74a33aee10.png": 16,  # 반려동물용품
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/248610f466d99a9a7cafa1c75a818a73bf850e05c7f7c205cbc60c7b7b16f876.png": 139,  # 식물
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/407b005b01de954b59aff9e21f729b3c30e3ae249acfb643401f235598dea8e3.png": 13,  # 기타 중고물품
-                "https://dnvefa72aowie.cloudfront.net/origin/category/202306/6a729d83f311aa3e8ffa12c9757cfda323591a0018ce2d25da6bf604615e33c2.png": 32,  # 삽니다
-            }
+            category_url_to_id = CATEGORY_URL_TO_ID
             
             # ID를 URL로 변환하는 역매핑
             category_id_to_url = {v: k for k, v in category_url_to_id.items()}
             
-            # 초기 쿼리 설정
-            base_query = session.query(SearchResult).filter(
-                SearchResult.query == query
+            # 초기 쿼리 설정 (검색어-상품 관계 테이블을 통해 조회)
+            base_query = session.query(SearchResult, QueryItem.first_seen_at).join(
+                QueryItem, QueryItem.item_id == SearchResult.id
+            ).filter(
+                QueryItem.query_id == query_id
             )
             
-            # 상태 필터링 (거래 중인 상품만)
-            if only_available:
-                base_query = base_query.filter(
-                    SearchResult.status == 'Ongoing'
-                )
-            
-            # 카테고리 필터링
-            if category_id and len(category_id) > 0:
-                # ID를 URL로 변환하여 필터링
-                category_urls = [category_id_to_url.get(cat_id) for cat_id in category_id if cat_id in category_id_to_url]
-                if category_urls:
-                    base_query = base_query.filter(
-                        SearchResult.category.in_(category_urls)
-                    )
-            
-            # 지역 필터링 추가
-            # 동/읍/면/동네 ID를 찾아서 필터링
-            if sido or sigungu1 or sigungu2 or dong:
-                # 해당 지역 정보에 맞는 동 ID 조회
-                location_query = session.query(PlaceList)
-                
-                if sido:
-                    location_query = location_query.filter(PlaceList.place_title_original.like(f"{sido}%"))
-                
-                if sigungu1:
-                    location_query = location_query.filter(PlaceList.place_title_original.like(f"%{sigungu1}%"))
-                
-                if sigungu2:
-                    location_query = location_query.filter(PlaceList.place_title_original.like(f"%{sigungu2}%"))
-                
-                if dong:
-                    location_query = location_query.filter(PlaceList.place_title_original.like(f"%{dong}"))
-                
-                # 조회된 dong_id 목록으로 검색 결과 필터링
-                matching_places = location_query.all()
-                if matching_places:
-                    dong_ids = [place.dong_id for place in matching_places]
-                    base_query = base_query.filter(SearchResult.dong_id.in_(dong_ids))
-                else:
-                    # 일치하는 지역이 없으면 빈 결과 반환
-                    return {
-                        "items": [],
-                        "total": 0,
-                        "page": page,
-                        "page_size": page_size,
-                        "pages": 0,
-                        "has_next": False,
-                        "has_prev": False
-                    }
+            # 상태/카테고리/지역/가격 범위 필터링
+            base_query = self._filter_results(
+                base_query, only_available, category_id, sido, sigungu1, sigungu2, dong, min_price, max_price
+            )
             
-            # 정렬 적용
+            # 정렬 적용 (query_items에 복사한 정렬 컬럼 사용 - 검색어별 정렬 인덱스)
             if sort_by == "price_asc":
-                base_query = base_query.order_by(SearchResult.price.asc(), SearchResult.created_at_origin.desc())
+                base_query = base_query.order_by(QueryItem.price.asc(), QueryItem.created_at_origin.desc())
+            elif sort_by == "price_desc":
+                base_query = base_query.order_by(QueryItem.price.desc().nullslast(), QueryItem.created_at_origin.desc())
+            elif sort_by == "boosted_at_desc":
+                base_query = base_query.order_by(QueryItem.boosted_at.desc().nullslast(), QueryItem.created_at_origin.desc())
             else:  # 기본값: created_at_desc
-                base_query = base_query.order_by(SearchResult.created_at_origin.desc())
-            
-            # 전체 카운트 계산 (페이징 정보용)
-            total_count = base_query.count()
-            
-            # 카테고리별 개수 계산
-            category_counts = {cat_id: 0 for cat_id in [1, 2, 3, 4, 5, 6, 7, 8, 9, 13, 14, 16, 31, 32, 139, 172, 173, 304, 305, 483]}
+                base_query = base_query.order_by(QueryItem.created_at_origin.desc())
             
             # category_id 목록
             category_ids = [1, 2, 3, 4, 5, 6, 7, 8, 9, 13, 14, 16, 31, 32, 139, 172, 173, 304, 305, 483]
             
-            # 쿼리 복제 (필터링 적용하지 않은 쿼리)
-            unfiltered_query = session.query(SearchResult).filter(
-                SearchResult.query == query
-            )
+            # 열 스냅샷이 있으면 필터/정렬/개수는 메모리에서 계산하고, 반환할 페이지의 행만 DB에서 읽음
+            snapshot = self._get_columnar_snapshot(session, query_id) if columnar_store.enabled else None
+            
+            if snapshot is not None:
+                total_count, page_ids = snapshot.select(
+                    sort_by=sort_by,
+                    offset=(page - 1) * page_size,
+                    limit=page_size,
+                    only_available=only_available,
+                    category_ids=[cat_id for cat_id in (category_id or []) if cat_id in category_id_to_url],
+                    min_price=min_price,
+                    max_price=max_price,
+                    sido=sido,
+                    sigungu1=sigungu1,
+                    sigungu2=sigungu2,
+                    dong=dong
+                )
+                category_counts = {cat_id: 0 for cat_id in category_ids}
+                category_counts.update(snapshot.category_counts())
+                
+                rows_by_id = {}
+                if page_ids:
+                    rows_by_id = {
+                        item.id: (item, first_seen_at)
+                        for item, first_seen_at in session.query(SearchResult, QueryItem.first_seen_at).join(
+                            QueryItem, QueryItem.item_id == SearchResult.id
+                        ).filter(
+                            QueryItem.query_id == query_id,
+                            SearchResult.id.in_(page_ids)
+                        ).all()
+                    }
+                results = [rows_by_id[row_id] for row_id in page_ids if row_id in rows_by_id]
+            else:
+                # 전체 카운트 계산 (페이징 정보용)
+                total_count = base_query.count()
+            
+                # 카테고리별 개수 계산
+                category_counts = {cat_id: 0 for cat_id in category_ids}
             
-            # 각 카테고리 URL별 개수 계산
-            for cat_url, cat_id in category_url_to_id.items():
-                cat_count = unfiltered_query.filter(
-                    SearchResult.category == cat_url
-                ).count()
-                category_counts[cat_id] = cat_count
+                # 쿼리 복제 (필터링 적용하지 않은 쿼리)
+                unfiltered_query = session.query(SearchResult).join(
+                    QueryItem, QueryItem.item_id == SearchResult.id
+                ).filter(
+                    QueryItem.query_id == query_id
+                )
+            
+                # 각 카테고리 URL별 개수 계산
+                for cat_url, cat_id in category_url_to_id.items():
+                    cat_count = unfiltered_query.filter(
+                        SearchResult.category == cat_url
+                    ).count()
+                    category_counts[cat_id] = cat_count
             
-            # 페이징 적용
-            results = base_query.offset((page - 1) * page_size).limit(page_size).all()
+                # 페이징 적용
+                results = base_query.offset((page - 1) * page_size).limit(page_size).all()
             
             # 결과 변환
             search_results = []
-            for item in results:
+            for item, first_seen_at in results:
                 result_dict = self._search_result_to_dict(item)
                 # 카테고리 URL을 ID로 변환
                 category_url = item.category
@@ -545,15 +932,20 @@ class DBService:
                 else:
                     result_dict["category_id"] = None
                 
-                # 가장 최근 검색 시간보다 나중에 생성된 아이템은 새 상품으로 표시
+                # 이 검색어로 처음 검색된 시각이 가장 최근 검색 시간보다 나중이면 새 상품으로 표시
                 # 이전 검색이 있는 경우에만 새 상품 표시
-                if has_previous_search and latest_search_time and item.created_at:
-                    result_dict["is_new"] = item.created_at > latest_search_time
+                if has_previous_search and latest_search_time and first_seen_at:
+                    if first_seen_at.tzinfo is None:
+                        first_seen_at = pytz.UTC.localize(first_seen_at).astimezone(KST)
+                    result_dict["is_new"] = first_seen_at > latest_search_time
                 else:
                     result_dict["is_new"] = False
                 
                 search_results.append(result_dict)
             
+            if include_content:
+                self._fill_contents(session, search_results)
+            
             logger.info(f"검색 쿼리 '{query}'에 대한 검색 결과 {len(search_results)}개를 조회했습니다. (페이지 {page}/{(total_count + page_size - 1) // page_size})")
             
             # 페이징 정보와 함께 결과 반환
@@ -579,11 +971,312 @@ class DBService:
         finally:
             self.close_session()
     
-    def _get_location_info(self, dong_id: int) -> Dict[str, Optional[str]]:
-        """dong_id로 place_list 테이블에서 지역 정보를 조회하고, place_title_original을 분리하여 반환합니다"""
+    def _filter_results(self, base_query, only_available: bool = False,
+                        category_id: Optional[List[int]] = None,
+                        sido: Optional[str] = None,
+                        sigungu1: Optional[str] = None,
+                        sigungu2: Optional[str] = None,
+                        dong: Optional[str] = None,
+                        min_price: Optional[float] = None,
+                        max_price: Optional[float] = None):
+        """SearchResult-QueryItem 조인 쿼리에 검색 결과 필터를 적용합니다"""
+        # 상태 필터링 (거래 중인 상품만)
+        if only_available:
+            base_query = base_query.filter(
+                SearchResult.status == 'Ongoing'
+            )
+        
+        # 카테고리 필터링 (ID를 URL로 변환하여 필터링, 알 수 없는 ID는 무시)
+        if category_id:
+            category_id_to_url = {v: k for k, v in CATEGORY_URL_TO_ID.items()}
+            category_urls = [category_id_to_url[cat_id] for cat_id in category_id if cat_id in category_id_to_url]
+            if category_urls:
+                base_query = base_query.filter(
+                    SearchResult.category.in_(category_urls)
+                )
+        
+        # 지역 필터링 (저장 시 채운 지역 컬럼으로 필터링 - (query_id, sido, sigungu1) 인덱스 사용)
+        if sido:
+            base_query = base_query.filter(QueryItem.sido == sido)
+        if sigungu1:
+            base_query = base_query.filter(QueryItem.sigungu1 == sigungu1)
+        if sigungu2:
+            base_query = base_query.filter(SearchResult.sigungu2 == sigungu2)
+        if dong:
+            base_query = base_query.filter(SearchResult.dong == dong)
+        
+        # 가격 범위 필터링 ((query_id, price, created_at_origin) 인덱스 범위 조회)
+        if min_price is not None:
+            base_query = base_query.filter(QueryItem.price >= min_price)
+        if max_price is not None:
+            base_query = base_query.filter(QueryItem.price <= max_price)
+        return base_query
+    
+    def _get_request_query_id(self, session, search_request_id: str) -> Optional[int]:
+        """검색 요청 ID의 쿼리 ID (요청이나 저장된 결과가 없으면 None)"""
+        try:
+            search_request_uuid = uuid.UUID(search_request_id)
+        except ValueError:
+            logger.error(f"잘못된 검색 요청 ID 형식: {search_request_id}")
+            return None
+        
+        query = session.query(SearchRequest.query).filter(
+            SearchRequest.id == search_request_uuid
+        ).scalar()
+        return self._get_query_id(session, query) if query else None
+    
+    def _parse_changes_cursor(self, since: Optional[str]):
+        """변경 피드 커서("시각|상품ID" 또는 ISO 시각)를 (UTC 기준 시각, 상품 ID)로 변환합니다
+
+        시간대가 없는 시각은 KST로 간주합니다. 형식이 잘못되면 ValueError.
+        """
+        if not since:
+            return None, None
+        timestamp, _, item_id = since.partition("|")
+        since_time = datetime.fromisoformat(timestamp.strip().replace(" ", "T", 1).replace("Z", "+00:00"))
+        if since_time.tzinfo is None:
+            since_time = KST.localize(since_time)
+        since_time = since_time.astimezone(pytz.UTC).replace(tzinfo=None)
+        return since_time, uuid.UUID(item_id) if item_id else None
+    
+    async def get_search_result_changes(self,
+                                        search_request_id: str,
+                                        since: Optional[str] = None,
+                                        limit: int = CHANGES_PAGE_LIMIT) -> Dict:
+        """커서 이후 이 검색어 결과에 추가되었거나 가격/상태가 바뀐 항목을 반환합니다
+
+        (changed_at, item_id) 순서의 키셋 페이징이며, 반환된 next_cursor를 다음 요청의 since로 사용합니다.
+        커서가 잘못된 형식이면 ValueError를 그대로 올립니다.
+        """
+        since_time, since_item_id = self._parse_changes_cursor(since)
         try:
             session = self.get_session()
+            query_id = self._get_request_query_id(session, search_request_id)
+            if query_id is None:
+                return {}
+            
+            changes_query = session.query(SearchResult, QueryItem.first_seen_at, QueryItem.changed_at).join(
+                QueryItem, QueryItem.item_id == SearchResult.id
+            ).filter(
+                QueryItem.query_id == query_id
+            )
+            if since_time is not None and since_item_id is not None:
+                changes_query = changes_query.filter(
+                    tuple_(QueryItem.changed_at, QueryItem.item_id) > tuple_(since_time, since_item_id)
+                )
+            elif since_time is not None:
+                changes_query = changes_query.filter(QueryItem.changed_at > since_time)
+            
+            rows = changes_query.order_by(
+                QueryItem.changed_at.asc(), QueryItem.item_id.asc()
+            ).limit(limit + 1).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            
+            items = []
+            for item, first_seen_at, changed_at in rows:
+                result_dict = self._search_result_to_dict(item)
+                result_dict["category_id"] = CATEGORY_URL_TO_ID.get(item.category)
+                # 커서 이후 처음 검색된 항목은 추가, 그 외에는 가격/상태 변경
+                is_added = since_time is None or (first_seen_at is not None and first_seen_at > since_time)
+                result_dict["is_new"] = is_added
+                result_dict["change"] = "added" if is_added else "changed"
+                items.append(result_dict)
+            
+            if rows:
+                _, _, last_changed_at = rows[-1]
+                # URL에 그대로 넣을 수 있도록 UTC를 Z로 표기
+                next_cursor = f"{last_changed_at.isoformat()}Z|{rows[-1][0].id}"
+            else:
+                next_cursor = since
+            
+            logger.info(f"검색 요청 {search_request_id}의 변경 항목 {len(items)}개를 조회했습니다 (since={since})")
+            return {
+                "items": items,
+                "next_cursor": next_cursor,
+                "has_more": has_more
+            }
             
+        except Exception as e:
+            logger.error(f"변경 항목 조회 중 오류 발생: {str(e)}")
+            return {}
+        finally:
+            self.close_session()
+    
+    async def get_price_stats(self,
+                              search_request_id: str,
+                              only_available: bool = False,
+                              category_id: Optional[List[int]] = None,
+                              sido: Optional[str] = None,
+                              sigungu1: Optional[str] = None,
+                              sigungu2: Optional[str] = None,
+                              dong: Optional[str] = None) -> Dict:
+        """검색 결과의 시세 통계(개수, 최소/최대, 평균, 중앙값, 백분위, 히스토그램)를 반환합니다
+
+        가격 컬럼 하나만 읽거나(열 스냅샷이 있으면 메모리에서) NumPy로 계산합니다.
+        """
+        try:
+            session = self.get_session()
+            query_id = self._get_request_query_id(session, search_request_id)
+            if query_id is None:
+                return {}
+            
+            snapshot = self._get_columnar_snapshot(session, query_id) if columnar_store.enabled else None
+            if snapshot is not None:
+                known_category_ids = [cat_id for cat_id in (category_id or []) if cat_id in CATEGORY_URL_TO_ID.values()]
+                prices = snapshot.prices(
+                    only_available=only_available,
+                    category_ids=known_category_ids,
+                    sido=sido,
+                    sigungu1=sigungu1,
+                    sigungu2=sigungu2,
+                    dong=dong
+                )
+            else:
+                price_query = session.query(SearchResult.price).join(
+                    QueryItem, QueryItem.item_id == SearchResult.id
+                ).filter(
+                    QueryItem.query_id == query_id,
+                    SearchResult.price.isnot(None)
+                )
+                price_query = self._filter_results(
+                    price_query, only_available, category_id, sido, sigungu1, sigungu2, dong
+                )
+                prices = [price for (price,) in price_query.all()]
+            
+            return summarize_prices(prices)
+            
+        except Exception as e:
+            logger.error(f"시세 통계 조회 중 오류 발생: {str(e)}")
+            return {}
+        finally:
+            self.close_session()
+    
+    async def get_region_facets(self,
+                                search_request_id: str,
+                                only_available: bool = False,
+                                category_id: Optional[List[int]] = None,
+                                sido: Optional[str] = None,
+                                sigungu1: Optional[str] = None,
+                                sigungu2: Optional[str] = None,
+                                dong: Optional[str] = None,
+                                min_price: Optional[float] = None,
+                                max_price: Optional[float] = None) -> Dict:
+        """검색 결과의 시도/시군구/동별 상품 수를 반환합니다
+
+        지역 조합별 개수를 한 번의 GROUP BY(또는 열 스냅샷)로 구한 뒤 계층별로 합산합니다.
+        각 단계는 상위 단계에서 선택한 지역 안의 개수이며(시도 목록은 지역 필터 없이),
+        하위 단계 목록은 상위 지역이 선택된 경우에만 채웁니다.
+        """
+        try:
+            session = self.get_session()
+            
+            query_id = self._get_request_query_id(session, search_request_id)
+            
+            groups = []
+            category_ids = [cat_id for cat_id in (category_id or []) if cat_id in CATEGORY_URL_TO_ID.values()]
+            
+            if query_id is not None:
+                snapshot = self._get_columnar_snapshot(session, query_id) if columnar_store.enabled else None
+                if snapshot is not None:
+                    groups = snapshot.region_counts(
+                        only_available=only_available,
+                        category_ids=category_ids,
+                        min_price=min_price,
+                        max_price=max_price
+                    )
+                else:
+                    base_query = session.query(
+                        QueryItem.sido,
+                        QueryItem.sigungu1,
+                        SearchResult.sigungu2,
+                        SearchResult.dong,
+                        func.count()
+                    ).join(
+                        SearchResult, SearchResult.id == QueryItem.item_id
+                    ).filter(
+                        QueryItem.query_id == query_id
+                    )
+                    base_query = self._filter_results(
+                        base_query, only_available, category_ids, min_price=min_price, max_price=max_price
+                    )
+                    groups = [
+                        ((row_sido, row_sigungu1, row_sigungu2, row_dong), count)
+                        for row_sido, row_sigungu1, row_sigungu2, row_dong, count in base_query.group_by(
+                            QueryItem.sido, QueryItem.sigungu1, SearchResult.sigungu2, SearchResult.dong
+                        ).all()
+                    ]
+            
+            # 계층별 합산 (각 단계는 상위 단계에서 선택한 지역과 일치하는 조합만)
+            selected = (sido, sigungu1, sigungu2, dong)
+            levels = ("sido", "sigungu1", "sigungu2", "dong")
+            facets = {level: {} for level in levels}
+            total = 0
+            for region, count in groups:
+                if all(not value or region[index] == value for index, value in enumerate(selected)):
+                    total += count
+                for depth, level in enumerate(levels):
+                    if any(value and region[index] != value for index, value in enumerate(selected[:depth])):
+                        break
+                    if region[depth]:
+                        facets[level][region[depth]] = facets[level].get(region[depth], 0) + count
+            
+            # 하위 목록은 상위 지역이 선택된 경우에만 (같은 이름의 구가 여러 시도에 있으므로)
+            if not sido:
+                facets["sigungu1"] = {}
+            if not sigungu1:
+                facets["sigungu2"] = {}
+                facets["dong"] = {}
+            
+            return {
+                "total": total,
+                **{
+                    level: [
+                        {"name": name, "count": count}
+                        for name, count in sorted(counts.items(), key=lambda entry: (-entry[1], entry[0]))
+                    ]
+                    for level, counts in facets.items()
+                }
+            }
+            
+        except Exception as e:
+            logger.error(f"지역별 개수 조회 중 오류 발생: {str(e)}")
+            return {}
+        finally:
+            self.close_session()
+    
+    def _get_columnar_snapshot(self, session, query_id: int):
+        """쿼리의 열 스냅샷을 반환합니다 (없으면 DB에서 필요한 컬럼만 읽어 생성)"""
+        snapshot = columnar_store.get(query_id)
+        if snapshot is None:
+            rows = session.query(
+                SearchResult.id,
+                SearchResult.price,
+                SearchResult.created_at_origin,
+                SearchResult.boosted_at,
+                SearchResult.category,
+                SearchResult.status,
+                SearchResult.dong_id,
+                SearchResult.sido,
+                SearchResult.sigungu1,
+                SearchResult.sigungu2,
+                SearchResult.dong
+            ).join(
+                QueryItem, QueryItem.item_id == SearchResult.id
+            ).filter(
+                QueryItem.query_id == query_id
+            ).all()
+            snapshot = columnar_store.load(query_id, (_columnar_row(row) for row in rows))
+        return snapshot
+    
+    def _get_location_info(self, dong_id: int) -> Dict[str, Optional[str]]:
+        """dong_id로 place_list 테이블에서 지역 정보를 조회하고, place_title_original을 분리하여 반환합니다"""
+        if dong_id in _location_info_cache:
+            return _location_info_cache[dong_id]
+        
+        # 저장 중인 트랜잭션을 닫지 않도록 별도 세션 사용
+        session = SessionLocal()
+        try:
             # dong_id로 place_list 조회
             place_info = session.query(PlaceList).filter(
                 PlaceList.dong_id == dong_id
@@ -619,6 +1312,7 @@ class DBService:
             elif len(parts) >= 3:  # 2개의 띄어쓰기로 구분된 경우 (예: "서울특별시 종로구 부암동")
                 result["dong"] = parts[2]
             
+            _location_info_cache[dong_id] = result
             return result
         except Exception as e:
             logger.error(f"지역 정보 조회 중 오류 발생: {str(e)}")
@@ -630,8 +1324,28 @@ class DBService:
                 "dong": None
             }
         finally:
-            if 'session' in locals():
-                self.close_session()
+            session.close()
+    
+    def _fill_contents(self, session, result_dicts: List[Dict]):
+        """결과 목록의 전체 내용을 search_result_contents에서 한 번에 읽어 채웁니다"""
+        item_ids = [uuid.UUID(result_dict["id"]) for result_dict in result_dicts]
+        if not item_ids:
+            return
+        
+        contents = dict(session.query(
+            SearchResultContent.item_id,
+            SearchResultContent.content
+        ).filter(SearchResultContent.item_id.in_(item_ids)).all())
+        
+        for result_dict in result_dicts:
+            result_dict["content"] = contents.get(uuid.UUID(result_dict["id"]), result_dict.get("snippet"))
+    
+    def _parse_dong_id(self, dong_id) -> Optional[int]:
+        """당근마켓 지역 ID를 정수로 변환합니다 (없거나 숫자가 아니면 None)"""
+        try:
+            return int(dong_id) if dong_id not in (None, "") else None
+        except (TypeError, ValueError):
+            return None
     
     def _search_result_to_dict(self, result: SearchResult) -> Dict[str, Any]:
         """SearchResult 객체를 딕셔너리로 변환하고 지역 정보를 추가합니다"""
@@ -645,7 +1359,8 @@ class DBService:
             "dong_id": result.dong_id,
             "price": result.price,
             "status": result.status,
-            "content": result.content,
+            "content": None,  # 전체 내용은 필요할 때 _fill_contents로 채움
+            "snippet": result.snippet,
             "nickname": result.nickname,
             "nickname_id": result.nickname_id,
             "category": result.category,
@@ -656,8 +1371,16 @@ class DBService:
             "is_new": False  # 기본값으로 False 설정, 새 상품 여부는 나중에 업데이트
         }
         
-        # dong_id가 있는 경우 지역 정보 추가
-        if result.dong_id:
+        # 저장 시 채운 지역 컬럼이 있으면 그대로 사용하고, 없으면 dong_id로 조회
+        if result.sido:
+            result_dict.update({
+                "place_title_original": " ".join(part for part in [result.sido, result.sigungu1, result.sigungu2, result.dong] if part),
+                "sido": result.sido,
+                "sigungu1": result.sigungu1,
+                "sigungu2": result.sigungu2,
+                "dong": result.dong
+            })
+        elif result.dong_id:
             location_info = self._get_location_info(result.dong_id)
             result_dict.update({
                 "place_title_original": location_info["place_title_original"],
@@ -738,111 +1461,131 @@ class DBService:
         finally:
             self.close_session()
     
-    async def get_latest_search_request_by_query(self, query: str) -> Optional[Dict]:
-        """모든 사용자의 검색 이력에서 특정 쿼리에 대한 가장 최근 검색 요청을 반환합니다 (실제 크롤링된 검색만 고려)"""
+    async def get_search_request_query(self, search_request_id: str) -> Optional[str]:
+        """검색 요청 ID의 쿼리를 조회합니다"""
+        try:
+            session = self.get_session()
+            return session.query(SearchRequest.query).filter(
+                SearchRequest.id == uuid.UUID(search_request_id)
+            ).scalar()
+        except Exception as e:
+            logger.error(f"검색 요청 쿼리 조회 중 오류 발생: {str(e)}")
+            return None
+        finally:
+            self.close_session()
+    
+    async def get_popular_queries(self, days: int = 7, limit: int = 20, exclude_location: Optional[str] = None) -> List[str]:
+        """최근 days일 동안 가장 많이 검색된 쿼리 목록을 조회합니다"""
         try:
             session = self.get_session()
             
-            # 쿼리로 가장 최근 검색 요청 조회 (모든 사용자, is_crawled=True인 경우만)
-            latest_search = session.query(SearchRequest).filter(
-                SearchRequest.query == query,
-                SearchRequest.is_crawled == True
-            ).order_by(
-                SearchRequest.created_at.desc()
-            ).first()
+            since = datetime.now(KST) - timedelta(days=days)
+            popular_query = session.query(
+                SearchRequest.query,
+                func.count(SearchRequest.id).label("search_count")
+            ).filter(
+                SearchRequest.created_at >= since
+            )
             
-            if latest_search:
-                # 시간을 KST로 변환
-                created_at = latest_search.created_at
-                if created_at.tzinfo is None:
-                    created_at = pytz.UTC.localize(created_at).astimezone(KST)
-                else:
-                    created_at = created_at.astimezone(KST)
-                
-                result = {
-                    "id": str(latest_search.id),
-                    "user_id": str(latest_search.user_id) if latest_search.user_id else None,
-                    "query": latest_search.query,
-                    "location": latest_search.location,
-                    "created_at": created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                    "is_crawled": latest_search.is_crawled
-                }
-                
-                logger.info(f"쿼리 '{query}'에 대한 가장 최근 크롤링 요청을 찾았습니다. ID: {result['id']}")
-                return result
+            if exclude_location:
+                popular_query = popular_query.filter(SearchRequest.location != exclude_location)
             
-            logger.info(f"쿼리 '{query}'에 대한 크롤링 요청이 없습니다.")
-            return None
+            rows = popular_query.group_by(SearchRequest.query).order_by(
+                func.count(SearchRequest.id).desc()
+            ).limit(limit).all()
+            
+            logger.info(f"최근 {days}일 인기 검색어 {len(rows)}개 조회")
+            return [row.query for row in rows]
             
         except Exception as e:
-            logger.error(f"최근 검색 요청 조회 중 오류 발생: {str(e)}")
-            return None
+            logger.error(f"인기 검색어 조회 중 오류 발생: {str(e)}")
+            return []
         finally:
             self.close_session()
     
-    async def get_search_results_by_query(self, query: str) -> List[Dict]:
-        """검색어로 직접 검색 결과를 조회합니다. (search_request_id 없이)"""
+    async def get_trend_keywords(self, limit: int = 20) -> List[str]:
+        """오늘 수집된 중고나라 인기 키워드를 순위 순으로 조회합니다 (joongna_rank 테이블)"""
         try:
             session = self.get_session()
             
-            # 로깅을 통한 디버깅 추가
-            logger.info(f"query='{query}'로 직접 검색 결과 조회 시작")
+            today = datetime.now(KST).strftime("%Y-%m-%d")
+            rows = session.execute(text("""
+                SELECT keyword, MIN(rank) AS best_rank
+                FROM joongna_rank
+                WHERE DATE(created_at) = :today
+                GROUP BY keyword
+                ORDER BY best_rank ASC
+                LIMIT :limit
+            """), {"today": today, "limit": limit}).fetchall()
             
-            # search_results 테이블에서 해당 query와 일치하는 모든 결과 조회
-            results = session.query(SearchResult).filter(
-                SearchResult.query == query
-            ).order_by(
-                SearchResult.created_at_origin.desc()
-            ).limit(100).all()
-            
-            # 결과 변환
-            search_results = []
-            for item in results:
-                result_dict = self._search_result_to_dict(item)
-                
-                # 카테고리 URL과 ID 매핑 (카테고리 URL이 있는 경우)
-                category_url_to_id = {
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/2c0811ac0c0f491039082d246cd41de636d58cd6e54368a0b012c386645d7c66.png": 1,  # 디지털기기
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/ff36d0fb3a3214a9cc86c79a84262e0d9e11b6d7289ed9aa75e40d0129764fac.png": 172,  # 생활가전
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/088e41c5973184228a2e4a50961ceb6fc366bb3eb11b1ee7c7cd66bcdf9c5529.png": 8,  # 가구/인테리어
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/22a78937b8a8ccd0003ff7bb7c247b3863a5046f93a36b5341913ff2935efa43.png": 7,  # 생활/주방
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/1975d6ba1725dfbe053daa450cec51757a39943104d57fbdd3fc5c7d8ae07605.png": 4,  # 유아동
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/987b21e9e02255cb310e4736b16e056d0bfc90c397e423e599b544bad203601e.png": 173,  # 유아도서
-                    "https://dnvefa72aowie.cloudfront.net/origin/brand/202402/b99fb12bcc754a08e5a6f359861bafd80d38678a0c58521abdf314949f9c5e58.png": 5,  # 여성의류
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/23f6b89ba63da7cf8135e1063bde3811fb6499dc073585eea161b3727a42535e.png": 31,  # 여성잡화
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/38dd757c99863d1748f16292142cabfae9621622cc751faff49a79ed60c1c5e7.png": 14,  # 남성패션/잡화
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/1efa73a4e3b45610292223f44c42cbe3c7d93395a23f1134426a58d5639c179b.png": 6,  # 뷰티/미용
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/6379c3ba41f03dc6e27796c5f106c8b20b57d79ddb3ba52440084fcd4d10d8dd.png": 3,  # 스포츠/레저
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/074da39b1114588ebc61447883f5f0059dd4abc16127f4250f559360f40eb0e2.png": 2,  # 취미/게임/음반
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/0ce93f6b19d61169b955dae5422aa9f842933d8ccf35dc4c53cea8656a293e40.png": 9,  # 도서
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/631cb98e2c7cf46f1f2520f97b0ec2d30ce426c4c158ea3673f84e0aca088181.png": 304,  # 티켓/교환권
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/243b21522a5ff57863942f0ed84a04b3cc72f30ca9edda818f31238fc94066ee.png": 305,  # 가공식품
-                    "https://dnvefa72aowie.cloudfront.net/origin/brand/202407/c22153f3cca52c69efb2b4c15e8e644ea7118b2f8c07d378ec8b75489c31cf46.png": 483,  # 건강기능식품
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/763d2fb8809deb0a5ebd4ef2694ecb2d8b08f501ab185f7167d87a74a33aee10.png": 16,  # 반려동물용품
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/248610f466d99a9a7cafa1c75a818a73bf850e05c7f7c205cbc60c7b7b16f876.png": 139,  # 식물
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/407b005b01de954b59aff9e21f729b3c30e3ae249acfb643401f235598dea8e3.png": 13,  # 기타 중고물품
-                    "https://dnvefa72aowie.cloudfront.net/origin/category/202306/6a729d83f311aa3e8ffa12c9757cfda323591a0018ce2d25da6bf604615e33c2.png": 32,  # 삽니다
-                }
-                
-                # 카테고리 URL을 ID로 변환
-                category_url = item.category
-                if category_url in category_url_to_id:
-                    result_dict["category_id"] = category_url_to_id[category_url]
-                else:
-                    result_dict["category_id"] = None
-                    
-                search_results.append(result_dict)
-            
-            logger.info(f"쿼리 '{query}'에 대해 {len(search_results)}개의 결과를 직접 조회했습니다.")
-            return search_results
+            logger.info(f"오늘의 중고나라 인기 키워드 {len(rows)}개 조회")
+            return [row.keyword for row in rows]
             
         except Exception as e:
-            logger.error(f"직접 검색 결과 조회 중 오류 발생: {str(e)}")
-            import traceback
-            logger.error(f"상세 오류 정보: {traceback.format_exc()}")
+            logger.error(f"중고나라 인기 키워드 조회 중 오류 발생: {str(e)}")
+            return []
+        finally:
+            self.close_session()
+    
+    async def get_latest_first_page(self, query: str) -> List[Dict]:
+        """검색어의 가장 최근 크롤링 결과 첫 페이지를 반환합니다 (검색한 사용자와 무관)
+
+        query_latest_results에서 한 번의 조회로 읽으며, 결과가 바뀌어 비워진 경우에만
+        get_search_results로 다시 계산해 저장합니다 (그 사이 다시 바뀌었으면 저장하지 않음).
+        """
+        try:
+            session = self.get_session()
+            pointer = session.query(
+                QueryLatestResult.query_id,
+                QueryLatestResult.search_request_id,
+                QueryLatestResult.first_page,
+                QueryLatestResult.version
+            ).join(
+                SearchQuery, SearchQuery.id == QueryLatestResult.query_id
+            ).filter(
+                SearchQuery.query == self.normalize_query(query)
+            ).first()
+        finally:
+            self.close_session()
+        
+        if pointer is None:
+            logger.info(f"쿼리 '{query}'에 대한 크롤링 검색이 없습니다.")
             return []
+        if pointer.first_page is not None:
+            return pointer.first_page
+        
+        # 첫 페이지 다시 계산 (get_search_results는 자체 세션 사용)
+        results = await self.get_search_results(
+            search_request_id=str(pointer.search_request_id),
+            page=1,
+            page_size=EXISTING_PAGE_SIZE,
+            sort_by="created_at_desc",
+            only_available=False,
+            include_content=True
+        )
+        items = results.get("items", [])
+        if "page" not in results:
+            return items
+        
+        try:
+            session = self.get_session()
+            session.query(QueryLatestResult).filter(
+                QueryLatestResult.query_id == pointer.query_id,
+                QueryLatestResult.version == pointer.version
+            ).update({
+                QueryLatestResult.first_page: items,
+                QueryLatestResult.updated_at: datetime.now(KST)
+            }, synchronize_session=False)
+            session.commit()
+            logger.info(f"쿼리 '{query}'의 첫 페이지 {len(items)}개를 다시 계산해 저장했습니다.")
+        except Exception as e:
+            if session:
+                session.rollback()
+            logger.error(f"첫 페이지 저장 중 오류 발생: {str(e)}")
         finally:
             self.close_session()
+        
+        return items
     
     async def get_place_params(self, id_min: int = 1, id_max: int = 10000) -> List[Dict]:
         """place_list 테이블에서 from_area가 null이 아니고 ID가 지정된 범위 내인 레코드의 param 값을 가져옵니다"""
@@ -876,6 +1619,158 @@ class DBService:
         finally:
             self.close_session()
     
+    async def get_region_yields(self, query: Optional[str] = None) -> Dict[int, Dict[str, float]]:
+        """완료된 검색 프로세스의 지역(place_id)별 평균 결과 수를 조회합니다 (query 지정 시 해당 쿼리만)"""
+        try:
+            session = self.get_session()
+            
+            yields_query = session.query(
+                SearchProcess.place_id,
+                func.avg(SearchProcess.items_count).label("avg_items"),
+                func.count(SearchProcess.id).label("runs")
+            ).filter(
+                SearchProcess.is_completed == True,
+                SearchProcess.place_id.isnot(None)
+            )
+            
+            # 쿼리별 이력은 정규화된 쿼리가 저장된 search_requests를 통해 필터링
+            if query:
+                yields_query = yields_query.join(
+                    SearchRequest, SearchProcess.search_request_id == SearchRequest.id
+                ).filter(SearchRequest.query == query)
+            
+            rows = yields_query.group_by(SearchProcess.place_id).all()
+            
+            region_yields = {
+                row.place_id: {"avg_items": float(row.avg_items or 0), "runs": row.runs}
+                for row in rows
+            }
+            
+            logger.info(f"지역별 평균 결과 수 조회: {len(region_yields)}개 지역 (쿼리: {query or '전체'})")
+            return region_yields
+            
+        except Exception as e:
+            logger.error(f"지역별 결과 수 조회 중 오류 발생: {str(e)}")
+            return {}
+        finally:
+            self.close_session()
+    
+    async def get_fresh_regions(self, query: str, ttl_seconds: float) -> Dict[int, Dict[str, Any]]:
+        """ttl_seconds 이내에 해당 쿼리로 검색에 성공한 지역(place_id)별 마지막 결과 수와 시각을 조회합니다"""
+        try:
+            session = self.get_session()
+            
+            since = datetime.now(KST) - timedelta(seconds=ttl_seconds)
+            rows = session.query(
+                SearchProcess.place_id,
+                SearchProcess.items_count,
+                SearchProcess.end_time
+            ).join(
+                SearchRequest, SearchProcess.search_request_id == SearchRequest.id
+            ).filter(
+                SearchRequest.query == query,
+                SearchProcess.is_completed == True,
+                SearchProcess.place_id.isnot(None),
+                SearchProcess.end_time >= since
+            ).order_by(SearchProcess.end_time.asc()).all()
+            
+            # 같은 지역이 여러 번 검색된 경우 가장 최근 결과를 사용
+            fresh_regions = {
+                row.place_id: {"items_count": row.items_count or 0, "fetched_at": row.end_time}
+                for row in rows
+            }
+            
+            logger.info(f"쿼리 '{query}'의 최근 {ttl_seconds:.0f}초 내 검색된 지역: {len(fresh_regions)}개")
+            return fresh_regions
+            
+        except Exception as e:
+            logger.error(f"최근 검색된 지역 조회 중 오류 발생: {str(e)}")
+            return {}
+        finally:
+            self.close_session()
+    
+    async def get_max_items_count(self) -> int:
+        """완료된 검색 프로세스 중 한 번에 가장 많이 수집된 항목 수를 조회합니다 (검색 페이지 최대 크기 추정용)"""
+        try:
+            session = self.get_session()
+            max_count = session.query(func.max(SearchProcess.items_count)).filter(
+                SearchProcess.is_completed == True
+            ).scalar()
+            return int(max_count or 0)
+        except Exception as e:
+            logger.error(f"최대 항목 수 조회 중 오류 발생: {str(e)}")
+            return 0
+        finally:
+            self.close_session()
+    
+    async def record_region_coverage(self, place_id: int, dong_ids: List[Any]) -> int:
+        """지역 검색 결과에 등장한 동 ID들을 region_coverage에 누적 기록합니다"""
+        # 정수로 변환 가능한 dong_id만 사용 (스크래퍼는 문자열/숫자를 섞어서 반환)
+        unique_dong_ids = set()
+        for dong_id in dong_ids:
+            try:
+                unique_dong_ids.add(int(dong_id))
+            except (ValueError, TypeError):
+                continue
+        
+        if place_id is None or not unique_dong_ids:
+            return 0
+        
+        try:
+            session = self.get_session()
+            current_time = datetime.now(KST)
+            
+            stmt = pg_insert(RegionCoverage).values([
+                {"place_id": place_id, "dong_id": dong_id, "hits": 1, "last_seen_at": current_time}
+                for dong_id in unique_dong_ids
+            ])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[RegionCoverage.place_id, RegionCoverage.dong_id],
+                set_={
+                    "hits": RegionCoverage.hits + 1,
+                    "last_seen_at": stmt.excluded.last_seen_at
+                }
+            )
+            session.execute(stmt)
+            session.commit()
+            
+            logger.debug(f"지역 커버리지 기록: place_id={place_id}, 동 {len(unique_dong_ids)}개")
+            return len(unique_dong_ids)
+            
+        except Exception as e:
+            if session:
+                session.rollback()
+            logger.error(f"지역 커버리지 기록 중 오류 발생: {str(e)}")
+            return 0
+        finally:
+            self.close_session()
+    
+    async def get_region_coverage(self, window_days: int = 30) -> Dict[int, set]:
+        """최근 window_days일 동안 관측된 지역(place_id)별 동 ID 집합을 조회합니다"""
+        try:
+            session = self.get_session()
+            
+            since = datetime.now(KST) - timedelta(days=window_days)
+            rows = session.query(
+                RegionCoverage.place_id,
+                RegionCoverage.dong_id
+            ).filter(
+                RegionCoverage.last_seen_at >= since
+            ).all()
+            
+            coverage = {}
+            for place_id, dong_id in rows:
+                coverage.setdefault(place_id, set()).add(dong_id)
+            
+            logger.info(f"지역 커버리지 조회: {len(coverage)}개 지역, 관측 {len(rows)}건")
+            return coverage
+            
+        except Exception as e:
+            logger.error(f"지역 커버리지 조회 중 오류 발생: {str(e)}")
+            return {}
+        finally:
+            self.close_session()
+    
     async def create_search_process(self, search_request_id: str, place_id: int, param: str, query: str, proxy_info: Optional[Dict] = None) -> Dict:
         """새로운 검색 프로세스를 생성합니다"""
         try:
@@ -991,7 +1886,7 @@ class DBService:
         finally:
             self.close_session()
             
-    async def update_search_process(self, process_id: int, is_completed: bool, items_count: int, error_message: Optional[str] = None, proxy_info: Optional[Dict] = None) -> bool:
+    async def update_search_process(self, process_id: int, is_completed: bool, items_count: int, error_message: Optional[str] = None, proxy_info: Optional[Dict] = None, skip_reason: Optional[str] = None) -> bool:
         """검색 프로세스 상태를 업데이트합니다"""
         try:
             session = self.get_session()
@@ -1011,6 +1906,7 @@ class DBService:
             process.items_count = items_count
             process.end_time = datetime.now(KST) if is_completed else None
             process.error_message = formatted_error  # 포맷팅된 오류 메시지 저장
+            process.skip_reason = skip_reason
             process.updated_at = datetime.now(KST)
             
             # 프록시 정보 업데이트 (제공된 경우)
@@ -1039,6 +1935,52 @@ class DBService:
         finally:
             self.close_session()
     
+    async def record_skipped_processes(self, search_request_id: str, query: str, place_params: List[Dict], skip_reason: str, items_counts: Optional[Dict[int, int]] = None) -> int:
+        """실행하지 않은 지역들을 건너뜀 상태의 검색 프로세스로 한 번에 기록합니다
+
+        items_counts(place_id: 항목 수)가 주어지면 저장된 결과로 대체한 지역의 항목 수로 기록합니다.
+        """
+        if not place_params:
+            return 0
+        
+        try:
+            session = self.get_session()
+            
+            # UUID 변환
+            try:
+                search_request_uuid = uuid.UUID(search_request_id)
+            except ValueError:
+                logger.error(f"잘못된 검색 요청 ID 형식: {search_request_id}")
+                return 0
+            
+            current_time = datetime.now(KST)
+            session.bulk_insert_mappings(SearchProcess, [
+                {
+                    "search_request_id": search_request_uuid,
+                    "query": query,
+                    "place_id": place_param["id"],
+                    "param": place_param["param"],
+                    "is_completed": False,
+                    "items_count": (items_counts or {}).get(place_param["id"], 0),
+                    "skip_reason": skip_reason,
+                    "created_at": current_time,
+                    "updated_at": current_time
+                }
+                for place_param in place_params
+            ])
+            session.commit()
+            
+            logger.info(f"검색 요청 ID {search_request_id}: {len(place_params)}개 지역을 건너뜀으로 기록 (사유: {skip_reason})")
+            return len(place_params)
+            
+        except Exception as e:
+            if session:
+                session.rollback()
+            logger.error(f"건너뛴 검색 프로세스 기록 중 오류 발생: {str(e)}")
+            return 0
+        finally:
+            self.close_session()
+    
     async def get_search_process_status(self, search_request_id: str) -> Dict:
         """특정 검색 요청에 대한 전체 검색 프로세스 진행 상태를 계산합니다"""
         try:
@@ -1049,7 +1991,7 @@ class DBService:
                 search_request_uuid = uuid.UUID(search_request_id)
             except ValueError:
                 logger.error(f"잘못된 검색 요청 ID 형식: {search_request_id}")
-                return {"total": 0, "completed": 0, "percentage": 0, "total_items": 0}
+                return {"total": 0, "completed": 0, "skipped": 0, "percentage": 0, "total_items": 0}
             
             # 전체 프로세스 수와 완료된 프로세스 수 조회
             total_processes = session.query(SearchProcess).filter(
@@ -1061,6 +2003,12 @@ class DBService:
                 SearchProcess.is_completed == True
             ).count()
             
+            # 건너뛴(취소, 예산 초과 등) 프로세스 수
+            skipped_processes = session.query(SearchProcess).filter(
+                SearchProcess.search_request_id == search_request_uuid,
+                SearchProcess.skip_reason.isnot(None)
+            ).count()
+            
             # 모든 항목 수 계산
             total_items = session.query(SearchProcess).filter(
                 SearchProcess.search_request_id == search_request_uuid
@@ -1070,12 +2018,13 @@ class DBService:
             
             total_items_count = sum(item[0] for item in total_items) if total_items else 0
             
-            # 백분율 계산
-            percentage = (completed_processes / total_processes * 100) if total_processes > 0 else 0
+            # 백분율 계산 (건너뛴 프로세스도 처리가 끝난 것으로 간주)
+            percentage = ((completed_processes + skipped_processes) / total_processes * 100) if total_processes > 0 else 0
             
             result = {
                 "total": total_processes,
                 "completed": completed_processes,
+                "skipped": skipped_processes,
                 "percentage": round(percentage, 2),
                 "total_items": total_items_count
             }
@@ -1085,7 +2034,7 @@ class DBService:
             
         except Exception as e:
             logger.error(f"검색 프로세스 상태 조회 중 오류 발생: {str(e)}")
-            return {"total": 0, "completed": 0, "percentage": 0, "total_items": 0}
+            return {"total": 0, "completed": 0, "skipped": 0, "percentage": 0, "total_items": 0}
         finally:
             self.close_session()
     
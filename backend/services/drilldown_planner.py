@@ -0,0 +1,88 @@
+import os
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from services.db_service import DBService
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 검색 결과 페이지의 최대 항목 수 (설정하지 않으면 과거 검색에서 관측된 최대값 사용)
+DAANGN_PAGE_SIZE = int(os.getenv("DAANGN_PAGE_SIZE", "0"))
+# 관측값이 없을 때 사용할 기본 페이지 크기
+DEFAULT_PAGE_SIZE = 30
+# 관측된 페이지 크기를 다시 조회하는 주기(초)
+PAGE_SIZE_REFRESH_INTERVAL = 3600
+
+_page_size_cache = {"value": 0, "loaded_at": 0.0}
+
+
+async def get_saturation_threshold(db_service: Optional[DBService] = None) -> int:
+    """지역 검색 응답이 '포화'되었다고 판단할 항목 수를 반환합니다
+
+    응답이 페이지 최대 크기만큼 채워졌다면 더 세밀한 지역에 결과가 더 있을 수 있습니다.
+    """
+    if DAANGN_PAGE_SIZE > 0:
+        return DAANGN_PAGE_SIZE
+
+    if not _page_size_cache["value"] or time.monotonic() - _page_size_cache["loaded_at"] >= PAGE_SIZE_REFRESH_INTERVAL:
+        observed = await (db_service or DBService()).get_max_items_count()
+        _page_size_cache["value"] = observed or DEFAULT_PAGE_SIZE
+        _page_size_cache["loaded_at"] = time.monotonic()
+    return _page_size_cache["value"]
+
+
+class DrillDownPlan:
+    """시군구 단위 대표 지역을 먼저 검색하고, 응답이 포화된 시군구만 동 단위로 내려가는 계획"""
+
+    def __init__(self, place_params: List[Dict], saturation_threshold: int):
+        self.saturation_threshold = saturation_threshold
+        self.representatives: List[Dict] = []
+        self.children: Dict[int, List[Dict]] = {}
+        self.expanded = 0
+        self.pruned = 0
+
+        # 입력 순서(우선순위)를 유지하며 시군구별로 묶고, 각 그룹의 첫 지역을 대표로 사용
+        groups: Dict[Tuple[str, str], List[Dict]] = {}
+        for place in place_params:
+            key = (place.get("sido") or "", place.get("sigungu") or "")
+            groups.setdefault(key, []).append(place)
+
+        for group in groups.values():
+            representative = group[0]
+            self.representatives.append(representative)
+            self.children[representative["id"]] = group[1:]
+
+        logger.info(
+            f"드릴다운 계획: {len(place_params)}개 지역을 시군구 대표 {len(self.representatives)}개로 시작 "
+            f"(포화 기준 {saturation_threshold}개)"
+        )
+
+    def expand(self, place_id: int, items_count: Optional[int]) -> Tuple[List[Dict], List[Dict]]:
+        """대표 지역의 검색 결과에 따라 하위 동을 검색할지 결정합니다
+
+        Args:
+            items_count: 대표 지역 검색 결과 수 (검색 실패 시 None - 결과를 알 수 없으므로 하위 동을 검색)
+
+        Returns:
+            (검색할 하위 지역 목록, 건너뛸 하위 지역 목록)
+        """
+        children = self.children.pop(place_id, [])
+        if not children:
+            return [], []
+
+        if items_count is None or items_count >= self.saturation_threshold:
+            self.expanded += len(children)
+            return children, []
+
+        self.pruned += len(children)
+        return [], children
+
+    def get_stats(self) -> Dict:
+        return {
+            "representatives": len(self.representatives),
+            "expanded": self.expanded,
+            "pruned": self.pruned,
+            "saturation_threshold": self.saturation_threshold,
+        }
@@ -0,0 +1,148 @@
+import os
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from services.db_service import DBService, KST
+from services.crawl_scheduler import crawl_scheduler
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 미리 검색을 수행할 시간대 (KST, 시작 시각 이상 ~ 종료 시각 미만)
+PREWARM_START_HOUR = int(os.getenv("PREWARM_START_HOUR", "3"))
+PREWARM_END_HOUR = int(os.getenv("PREWARM_END_HOUR", "7"))
+# 한 번의 주기에서 미리 검색할 최대 쿼리 수 (인기 검색어 + 오늘의 중고나라 인기 키워드)
+PREWARM_MAX_QUERIES = int(os.getenv("PREWARM_MAX_QUERIES", "20"))
+# 인기 검색어를 집계할 기간(일)
+PREWARM_LOOKBACK_DAYS = int(os.getenv("PREWARM_LOOKBACK_DAYS", "7"))
+# 쿼리 사이 대기 시간(초) - 한 번에 하나의 쿼리만 크롤링하여 프록시 부하 제한
+PREWARM_QUERY_INTERVAL = float(os.getenv("PREWARM_QUERY_INTERVAL", "60"))
+# 쿼리 하나에 사용할 최대 크롤링 시간(초)
+PREWARM_MAX_SECONDS = float(os.getenv("PREWARM_MAX_SECONDS", "300"))
+# 이 시간(시간) 안에 크롤링된 쿼리는 다시 미리 검색하지 않음
+PREWARM_FRESH_HOURS = float(os.getenv("PREWARM_FRESH_HOURS", "6"))
+# 시간대/대상 쿼리를 다시 확인하는 주기(초)
+PREWARM_CHECK_INTERVAL = 600
+
+# 미리 검색으로 생성된 search_requests의 location 값 (인기 검색어 집계에서 제외)
+PREWARM_LOCATION = "prewarm"
+
+# 검색 시작 함수: (쿼리, 크롤링 최대 시간) -> 검색 ID
+StartSearch = Callable[[str, float], Awaitable[Optional[str]]]
+
+
+class PrewarmScheduler:
+    """비사용 시간대에 인기 검색어를 미리 크롤링하여 /existing 조회가 저장된 결과로 응답되도록 합니다"""
+
+    def __init__(self, db_service: Optional[DBService] = None):
+        self.db_service = db_service or DBService()
+        self.start_search: Optional[StartSearch] = None
+        self.task: Optional[asyncio.Task] = None
+        self.current_query: Optional[str] = None
+        self.last_run: Dict[str, datetime] = {}  # 쿼리 -> 마지막 미리 검색 시각
+        self.warmed = 0
+        self.skipped_fresh = 0
+
+    def start(self, start_search: StartSearch):
+        """백그라운드 루프를 시작합니다 (앱 시작 시 한 번 호출)"""
+        if self.task and not self.task.done():
+            return
+        self.start_search = start_search
+        self.task = asyncio.create_task(self._run())
+        logger.info(f"인기 검색어 미리 검색 스케줄러 시작 (시간대 {PREWARM_START_HOUR}시~{PREWARM_END_HOUR}시, 최대 {PREWARM_MAX_QUERIES}개)")
+
+    def stop(self):
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+    @staticmethod
+    def is_off_peak(now: Optional[datetime] = None) -> bool:
+        hour = (now or datetime.now(KST)).hour
+        if PREWARM_START_HOUR <= PREWARM_END_HOUR:
+            return PREWARM_START_HOUR <= hour < PREWARM_END_HOUR
+        # 자정을 넘기는 시간대 (예: 23시~5시)
+        return hour >= PREWARM_START_HOUR or hour < PREWARM_END_HOUR
+
+    async def collect_queries(self) -> List[str]:
+        """오늘의 중고나라 인기 키워드와 최근 인기 검색어를 합쳐 미리 검색할 쿼리 목록을 만듭니다"""
+        trend_keywords = await self.db_service.get_trend_keywords(limit=PREWARM_MAX_QUERIES)
+        popular_queries = await self.db_service.get_popular_queries(
+            days=PREWARM_LOOKBACK_DAYS,
+            limit=PREWARM_MAX_QUERIES,
+            exclude_location=PREWARM_LOCATION
+        )
+
+        # 두 목록을 번갈아 합쳐 어느 한쪽이 전부 차지하지 않도록 함
+        queries = []
+        for index in range(max(len(trend_keywords), len(popular_queries))):
+            for source in (popular_queries, trend_keywords):
+                if index < len(source):
+                    query = source[index].strip().lower()
+                    if query and query not in queries:
+                        queries.append(query)
+        return queries[:PREWARM_MAX_QUERIES]
+
+    async def _is_fresh(self, query: str) -> bool:
+        latest_time = await self.db_service.get_latest_search_time(query)
+        return latest_time is not None and datetime.now(KST) - latest_time < timedelta(hours=PREWARM_FRESH_HOURS)
+
+    async def _warm(self, query: str):
+        """쿼리 하나를 크롤링하고 해당 검색이 끝날 때까지 기다립니다"""
+        self.current_query = query
+        try:
+            search_id = await self.start_search(query, PREWARM_MAX_SECONDS)
+            self.last_run[query] = datetime.now(KST)
+            self.warmed += 1
+            logger.info(f"미리 검색 시작: '{query}' (검색 ID: {search_id})")
+
+            # 동시에 여러 쿼리를 크롤링하지 않도록 스케줄러에서 검색이 해제될 때까지 대기
+            while search_id and crawl_scheduler.get_stats(search_id):
+                await asyncio.sleep(5)
+        finally:
+            self.current_query = None
+
+    async def run_cycle(self):
+        """대상 쿼리를 하나씩 미리 검색합니다 (시간대를 벗어나면 중단)"""
+        queries = await self.collect_queries()
+        logger.info(f"미리 검색 대상 쿼리 {len(queries)}개: {queries}")
+
+        for query in queries:
+            if not self.is_off_peak():
+                logger.info("미리 검색 시간대를 벗어나 이번 주기를 중단합니다.")
+                return
+            if await self._is_fresh(query):
+                self.skipped_fresh += 1
+                continue
+            try:
+                await self._warm(query)
+            except Exception as e:
+                logger.error(f"쿼리 '{query}' 미리 검색 중 오류 발생: {str(e)}")
+            await asyncio.sleep(PREWARM_QUERY_INTERVAL)
+
+    async def _run(self):
+        while True:
+            try:
+                if self.is_off_peak():
+                    await self.run_cycle()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"미리 검색 주기 실행 중 오류 발생: {str(e)}")
+            await asyncio.sleep(PREWARM_CHECK_INTERVAL)
+
+    def get_stats(self) -> Dict:
+        return {
+            "running": self.task is not None and not self.task.done(),
+            "off_peak": self.is_off_peak(),
+            "window": f"{PREWARM_START_HOUR:02d}:00-{PREWARM_END_HOUR:02d}:00",
+            "current_query": self.current_query,
+            "warmed": self.warmed,
+            "skipped_fresh": self.skipped_fresh,
+            "last_run": {query: run_at.isoformat() for query, run_at in self.last_run.items()},
+        }
+
+
+# 전역 미리 검색 스케줄러
+prewarm_scheduler = PrewarmScheduler()
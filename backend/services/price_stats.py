@@ -0,0 +1,77 @@
+import os
+import logging
+from typing import Dict, Iterable, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 시세 히스토그램 구간 수
+PRICE_HISTOGRAM_BINS = int(os.getenv("PRICE_HISTOGRAM_BINS", "20"))
+# 이상치 판정 범위 (사분위 범위 IQR의 배수, Tukey fence)
+PRICE_OUTLIER_IQR = float(os.getenv("PRICE_OUTLIER_IQR", "1.5"))
+# 반환할 백분위
+PRICE_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def is_available() -> bool:
+    return np is not None
+
+
+def summarize_prices(prices: Iterable[float], bins: int = PRICE_HISTOGRAM_BINS) -> Dict:
+    """가격 목록의 시세 통계를 계산합니다
+
+    가격이 없거나 0원(나눔)인 항목은 제외하고, IQR 기준 이상치(1원, 9,999,999원 같은 자리표시 가격)를
+    걸러낸 뒤 개수/최소/최대/평균/중앙값/백분위/히스토그램을 반환합니다.
+    """
+    values = np.asarray(prices if isinstance(prices, np.ndarray) else list(prices), dtype=np.float64)
+    values = values[~np.isnan(values)]
+    free_count = int(np.count_nonzero(values == 0))
+    values = values[values > 0]
+
+    outlier_count = 0
+    if len(values) >= 4:
+        q1, q3 = np.percentile(values, [25, 75])
+        spread = (q3 - q1) * PRICE_OUTLIER_IQR
+        inlier = (values >= q1 - spread) & (values <= q3 + spread)
+        outlier_count = int(len(values) - np.count_nonzero(inlier))
+        values = values[inlier]
+
+    stats = {
+        "count": int(len(values)),
+        "free_count": free_count,
+        "outlier_count": outlier_count,
+        "min": None,
+        "max": None,
+        "mean": None,
+        "median": None,
+        "percentiles": {},
+        "histogram": [],
+    }
+    if not len(values):
+        return stats
+
+    counts, edges = np.histogram(values, bins=bins if values.min() < values.max() else 1)
+    stats.update({
+        "min": int(values.min()),
+        "max": int(values.max()),
+        "mean": int(round(values.mean())),
+        "median": int(round(np.median(values))),
+        "percentiles": {
+            f"p{percentile}": int(round(value))
+            for percentile, value in zip(PRICE_PERCENTILES, np.percentile(values, PRICE_PERCENTILES))
+        },
+        "histogram": _histogram_buckets(counts, edges),
+    })
+    return stats
+
+
+def _histogram_buckets(counts, edges) -> List[Dict]:
+    return [
+        {"min": int(round(edges[index])), "max": int(round(edges[index + 1])), "count": int(count)}
+        for index, count in enumerate(counts)
+    ]
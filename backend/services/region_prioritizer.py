@@ -0,0 +1,113 @@
+import os
+import random
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from services.db_service import DBService
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 결과가 없었던 (쿼리, 지역)을 다시 검색하지 않는 시간(초)
+NEGATIVE_CACHE_TTL = int(os.getenv("REGION_NEGATIVE_CACHE_TTL", "1800"))
+# 전체 지역 밀도(모든 쿼리 기준 평균 결과 수)를 다시 계산하는 주기(초)
+DENSITY_REFRESH_INTERVAL = int(os.getenv("REGION_DENSITY_REFRESH_INTERVAL", "3600"))
+
+
+class RegionPrioritizer:
+    """과거 검색 결과 수를 기준으로 지역 검색 순서를 정하고, 최근 결과가 없던 지역을 건너뜁니다"""
+
+    def __init__(self, db_service: Optional[DBService] = None):
+        self.db_service = db_service or DBService()
+        # (정규화된 쿼리, place_id) -> 만료 시각
+        self.negative_cache: Dict[Tuple[str, int], float] = {}
+        self.overall_density: Dict[int, Dict[str, float]] = {}
+        self.density_loaded_at = 0.0
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return query.strip().lower()
+
+    def mark_empty(self, query: str, place_id: int):
+        """지역 검색 결과가 0개였음을 기록합니다 (TTL 동안 같은 쿼리로 건너뜀)"""
+        if NEGATIVE_CACHE_TTL <= 0 or place_id is None:
+            return
+        self.negative_cache[(self.normalize_query(query), place_id)] = time.monotonic() + NEGATIVE_CACHE_TTL
+
+    def mark_found(self, query: str, place_id: int):
+        """지역 검색에서 결과가 나왔으면 네거티브 캐시에서 제거합니다"""
+        self.negative_cache.pop((self.normalize_query(query), place_id), None)
+
+    def record_result(self, query: str, place_id: int, items_count: int):
+        """지역 검색 결과 수에 따라 네거티브 캐시를 갱신합니다"""
+        if items_count > 0:
+            self.mark_found(query, place_id)
+        else:
+            self.mark_empty(query, place_id)
+
+    def is_negative(self, query: str, place_id: int) -> bool:
+        key = (self.normalize_query(query), place_id)
+        expires_at = self.negative_cache.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self.negative_cache[key]
+            return False
+        return True
+
+    async def _get_overall_density(self) -> Dict[int, Dict[str, float]]:
+        """모든 쿼리 기준 지역별 평균 결과 수 (주기적으로만 다시 계산)"""
+        if not self.overall_density or time.monotonic() - self.density_loaded_at >= DENSITY_REFRESH_INTERVAL:
+            density = await self.db_service.get_region_yields()
+            if density:
+                self.overall_density = density
+            self.density_loaded_at = time.monotonic()
+        return self.overall_density
+
+    async def prioritize(self, query: str, place_params: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """검색할 지역을 예상 결과 수가 많은 순서로 정렬하고, 네거티브 캐시에 걸린 지역을 분리합니다
+
+        Returns:
+            (검색할 지역 목록, 네거티브 캐시로 건너뛸 지역 목록)
+        """
+        normalized_query = self.normalize_query(query)
+
+        skipped = [p for p in place_params if self.is_negative(normalized_query, p["id"])]
+        candidates = [p for p in place_params if not self.is_negative(normalized_query, p["id"])]
+
+        query_yields = await self.db_service.get_region_yields(normalized_query)
+        overall = await self._get_overall_density()
+
+        # 쿼리 이력이 없는 지역은 전체 밀도를 이 쿼리의 규모에 맞게 보정해서 사용
+        scale = 1.0
+        shared_ids = [pid for pid in query_yields if pid in overall and overall[pid]["avg_items"] > 0]
+        if shared_ids:
+            query_mean = sum(query_yields[pid]["avg_items"] for pid in shared_ids) / len(shared_ids)
+            overall_mean = sum(overall[pid]["avg_items"] for pid in shared_ids) / len(shared_ids)
+            scale = query_mean / overall_mean if overall_mean > 0 else 1.0
+
+        # 이력이 전혀 없는 지역은 전체 평균 밀도로 취급 (새 지역이 항상 뒤로 밀리지 않도록)
+        default_density = (
+            sum(v["avg_items"] for v in overall.values()) / len(overall) if overall else 0.0
+        )
+
+        def score(place: Dict) -> float:
+            place_id = place["id"]
+            if place_id in query_yields:
+                return query_yields[place_id]["avg_items"]
+            return overall.get(place_id, {}).get("avg_items", default_density) * scale
+
+        # 같은 점수끼리는 무작위 순서 유지 (특정 지역에 부하가 몰리지 않도록)
+        random.shuffle(candidates)
+        candidates.sort(key=score, reverse=True)
+
+        logger.info(
+            f"지역 우선순위 계산: 쿼리 '{normalized_query}', 이력 있는 지역 {len(query_yields)}개, "
+            f"검색 대상 {len(candidates)}개, 네거티브 캐시로 건너뜀 {len(skipped)}개"
+        )
+        return candidates, skipped
+
+
+# 전역 지역 우선순위 계산기 (네거티브 캐시를 모든 검색이 공유)
+region_prioritizer = RegionPrioritizer()
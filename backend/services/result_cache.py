@@ -0,0 +1,80 @@
+import os
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 캐시할 최대 결과 페이지 수
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "512"))
+
+
+class ResultPageCache:
+    """검색 결과 페이지 LRU 캐시 (프로세스 내)
+
+    쿼리별 버전 번호를 두고, 결과 저장(ingest) 시 버전을 올려 해당 쿼리의 페이지를 무효화합니다.
+    캐시 항목은 저장 당시의 버전을 기억하므로 버전이 바뀐 페이지만 다시 계산됩니다.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.versions: Dict[str, int] = {}
+        self.request_queries: "OrderedDict[str, str]" = OrderedDict()  # search_request_id -> 정규화된 쿼리
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return (query or "").strip().lower()
+
+    def version(self, query: str) -> int:
+        return self.versions.get(self.normalize_query(query), 0)
+
+    def bump(self, query: str):
+        """쿼리의 결과가 바뀌었음을 기록합니다 (이전 버전의 캐시 페이지는 더 이상 사용되지 않음)"""
+        normalized = self.normalize_query(query)
+        self.versions[normalized] = self.versions.get(normalized, 0) + 1
+
+    def query_for(self, search_request_id: str) -> Optional[str]:
+        return self.request_queries.get(search_request_id)
+
+    def remember_query(self, search_request_id: str, query: str):
+        """검색 요청 ID의 쿼리를 기억합니다 (요청 ID의 쿼리는 바뀌지 않음)"""
+        self.request_queries[search_request_id] = self.normalize_query(query)
+        self.request_queries.move_to_end(search_request_id)
+        while len(self.request_queries) > self.max_entries:
+            self.request_queries.popitem(last=False)
+
+    def get(self, query: str, key: Hashable) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != self.version(query):
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, query: str, key: Hashable, value: Any):
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = (self.version(query), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+            "tracked_queries": len(self.versions),
+        }
+
+
+# 전역 결과 페이지 캐시
+result_cache = ResultPageCache()
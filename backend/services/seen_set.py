@@ -0,0 +1,88 @@
+import math
+import hashlib
+import logging
+from typing import Optional
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """고정 크기 비트 배열 기반 블룸 필터 (오탐 가능, 미탐 없음)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.0001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # 비트 수 m = -n ln p / (ln 2)^2, 해시 수 k = m/n ln 2
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        # 128비트 해시 하나를 두 개로 나눠 이중 해싱으로 k개 위치 계산
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> bool:
+        """키를 추가하고, 새 키였으면 True를 반환합니다"""
+        added = False
+        for position in self._positions(key):
+            byte_index, bit = divmod(position, 8)
+            if not self.bits[byte_index] & (1 << bit):
+                self.bits[byte_index] |= 1 << bit
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position // 8] & (1 << (position % 8)) for position in self._positions(key))
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class SeenSet:
+    """검색 하나에서 이미 처리한 항목 키 집합
+
+    기본은 정확한 set이며, bloom_after가 지정되면 키 수가 그 값을 넘을 때 블룸 필터로 전환해
+    메모리 사용량을 고정합니다 (이후에는 error_rate 확률로 새 항목을 중복으로 오판할 수 있음).
+    """
+
+    def __init__(self, bloom_after: int = 0, bloom_capacity: int = 1_000_000, error_rate: float = 0.0001):
+        self.bloom_after = bloom_after
+        self.bloom_capacity = bloom_capacity
+        self.error_rate = error_rate
+        self.keys: Optional[set] = set()
+        self.bloom: Optional[BloomFilter] = None
+
+    def add(self, key: str) -> bool:
+        """키를 추가하고, 처음 본 키였으면 True를 반환합니다"""
+        if self.bloom is not None:
+            return self.bloom.add(key)
+
+        if key in self.keys:
+            return False
+        self.keys.add(key)
+
+        if self.bloom_after and len(self.keys) > self.bloom_after:
+            self._switch_to_bloom()
+        return True
+
+    def _switch_to_bloom(self):
+        self.bloom = BloomFilter(max(self.bloom_capacity, len(self.keys) * 2), self.error_rate)
+        for key in self.keys:
+            self.bloom.add(key)
+        logger.info(f"중복 확인 집합을 블룸 필터로 전환 (키 {len(self.keys)}개, {len(self.bloom.bits) // 1024}KB)")
+        self.keys = None
+
+    @property
+    def is_bloom(self) -> bool:
+        return self.bloom is not None
+
+    def __len__(self) -> int:
+        return len(self.bloom) if self.bloom is not None else len(self.keys)